@@ -8,16 +8,35 @@ This is a module for the AI course project of the University of Geneva.
 """
 
 from collections import deque
-import matplotlib.pyplot as plt
-import networkx as nx
+
+from src.trees.rendering import cached_layout, neighbourhood
 
 class BFSTree:
     def __init__(self, root):
         self.root = root
-        self.G = nx.DiGraph()
-        self.G.add_node(str(self.root))
+        self.edges = [] # networkx is only imported when the graph is drawn
+        self._G = None
         self.visited = set()
 
+    @property
+    def G(self):
+        """Search tree as a networkx graph, built once from the recorded edges on first use
+
+        The graph is only rebuilt after `bfs` records new edges, so changes made to it directly are
+        kept until the next search.
+
+        Returns
+        -------
+        nx.DiGraph
+            The search tree
+        """
+        if self._G is None:
+            import networkx as nx
+            self._G = nx.DiGraph()
+            self._G.add_node(str(self.root))
+            self._G.add_edges_from(self.edges)
+        return self._G
+
     def bfs(self, goal_state):
         """Breadth First Search Algorithm
 
@@ -43,14 +62,79 @@ class BFSTree:
                     self.visited.add(str(child.state)) # Add the child to the visited states
                     current_node.extend(child) # Add the child to the current node's children
                     
-                    self.G.add_edge(str(current_node), str(child))
-        
+                    self.edges.append((str(current_node), str(child)))
+
+        self._G = None # edges were recorded, the graph is rebuilt on next use
         return path_to_goal
 
-    def visualize(self, path_to_goal=None):
-        pos = nx.spring_layout(self.G, k=0.5, iterations=30) # positions for all nodes
-        nx.draw(self.G, pos, with_labels=True, font_weight='bold', node_color='skyblue', node_size=800, font_size=8)
+    def layout(self, G, layout_cache=None):
+        """Spring layout of a graph, cached on disk by graph hash
+
+        Parameters
+        ----------
+        G : nx.Graph
+            The graph to lay out
+        layout_cache : str, optional
+            Directory where layouts are stored, by default no cache
+
+        Returns
+        -------
+        dict
+            Position of every node
+        """
+        return cached_layout(G, layout_cache, k=0.5, iterations=30)
+
+    def neighbourhood(self, path_to_goal, hops=1, max_nodes=None, seed=0):
+        """Subgraph made of the path to the goal and the nodes within `hops` edges of it
+
+        Parameters
+        ----------
+        path_to_goal : list
+            The nodes of the path to the goal
+        hops : int, optional
+            Radius of the neighbourhood, by default 1
+        max_nodes : int, optional
+            If given, the nodes outside the path are randomly sampled down to this total
+        seed : int, optional
+            Seed of the sampling, by default 0
+
+        Returns
+        -------
+        nx.DiGraph
+            The subgraph to draw
+        """
+        keep = [str(node) for node in path_to_goal or [self.root]]
+        return neighbourhood(self.G, keep, hops, max_nodes, seed)
+
+    def visualize(self, path_to_goal=None, hops=None, max_nodes=None, layout_cache=None, output=None):
+        """Draw the search tree, optionally restricted to the neighbourhood of the path to the goal
+
+        Parameters
+        ----------
+        path_to_goal : list, optional
+            The nodes of the path to highlight
+        hops : int, optional
+            If given, only the path (or the root) and its `hops`-neighbourhood are drawn
+        max_nodes : int, optional
+            If given, the drawn nodes outside the path are sampled down to this total
+        layout_cache : str, optional
+            Directory where layouts are cached, keyed by graph hash
+        output : str, optional
+            If given, the figure is written to this file (.svg, .pdf, .png...) and closed
+        """
+        import matplotlib.pyplot as plt
+        import networkx as nx
+
+        G = self.G
+        if hops is not None or max_nodes is not None:
+            G = self.neighbourhood(path_to_goal, hops or 0, max_nodes)
+        pos = self.layout(G, layout_cache) # positions for all nodes
+        nx.draw(G, pos, with_labels=True, font_weight='bold', node_color='skyblue', node_size=800, font_size=8)
 
         if path_to_goal:
             edges_in_path = [(str(path_to_goal[i]), str(path_to_goal[i + 1])) for i in range(len(path_to_goal) - 1)]
-            nx.draw_networkx_edges(self.G, pos, edgelist=edges_in_path, edge_color='r', width=2, alpha=0.6)
\ No newline at end of file
+            nx.draw_networkx_edges(G, pos, edgelist=edges_in_path, edge_color='r', width=2, alpha=0.6)
+
+        if output is not None:
+            plt.savefig(output)
+            plt.close()
\ No newline at end of file
@@ -0,0 +1,65 @@
+import os
+import subprocess
+import sys
+
+import networkx as nx
+import pytest
+
+from src.nodes.hanoi_node import HanoiNode
+from src.nodes.hospital_node import HospitalNode
+from src.trees.bfs import BFSTree
+
+
+def gamma(d, p):
+    return lambda s: (s[0] - d, s[1] - p, 1 - s[2]) if s[2] == 1 else (s[0] + d, s[1] + p, 1 - s[2])
+
+
+def gamma_hanoi(i, j):
+    def transition(state):
+        new_state = [list(peg) for peg in state]
+        if new_state[i]:
+            new_state[j].insert(0, new_state[i].pop(0))
+        return tuple(new_state)
+    return transition
+
+
+@pytest.mark.parametrize("n_disks", [2, 3, 4])
+def test_hanoi_path_is_shortest(n_disks):
+    disks = list(range(1, n_disks + 1))
+    tree = BFSTree(HanoiNode((disks, [], []), 3, gamma_hanoi))
+    path = tree.bfs(([], [], disks))
+    assert len(path) - 1 == 2 ** n_disks - 1
+    assert [str(node) for node in path] == nx.shortest_path(tree.G, str(path[0]), str(path[-1]))
+
+
+def test_hospital_graph_is_the_search_tree():
+    tree = BFSTree(HospitalNode((3, 3, 1), gamma))
+    path = tree.bfs((0, 0, 0))
+    assert len(path) - 1 == 11
+    assert nx.is_tree(tree.G) and set(tree.G.edges) == set(tree.edges)
+    assert nx.shortest_path_length(tree.G, str(tree.root), str(path[-1])) == 11
+
+
+def test_graph_is_built_lazily_and_kept_until_the_next_search():
+    tree = BFSTree(HospitalNode((3, 3, 1), gamma))
+    assert list(tree.G.nodes) == [str(tree.root)] # before any search, only the root
+    tree.bfs((0, 0, 0))
+    G = tree.G
+    assert tree.G is G and G.number_of_edges() == len(tree.edges)
+    G.add_edge("extra", "node") # edits are kept until the next search
+    assert tree.G.has_edge("extra", "node")
+    tree.bfs((0, 0, 0))
+    assert tree.G is not G and not tree.G.has_edge("extra", "node")
+
+
+def test_search_does_not_import_networkx():
+    code = (
+        "import sys\n"
+        "from src.nodes.hospital_node import HospitalNode\n"
+        "from src.trees.bfs import BFSTree\n"
+        "gamma = lambda d, p: lambda s: (s[0] - d, s[1] - p, 1 - s[2]) if s[2] == 1 else (s[0] + d, s[1] + p, 1 - s[2])\n"
+        "assert len(BFSTree(HospitalNode((3, 3, 1), gamma)).bfs((0, 0, 0))) == 12\n"
+        "print(sorted(m for m in ('networkx', 'matplotlib') if m in sys.modules))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=os.path.dirname(os.path.dirname(__file__)), capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
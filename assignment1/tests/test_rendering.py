@@ -0,0 +1,59 @@
+import json
+import os
+
+import matplotlib
+matplotlib.use('Agg')
+import networkx as nx
+import pytest
+
+from src.nodes.hospital_node import HospitalNode
+from src.trees.bfs import BFSTree
+from src.trees.rendering import graph_hash, neighbourhood
+
+
+def gamma(d, p):
+    return lambda s: (s[0] - d, s[1] - p, 1 - s[2]) if s[2] == 1 else (s[0] + d, s[1] + p, 1 - s[2])
+
+
+@pytest.fixture
+def tree():
+    tree = BFSTree(HospitalNode((3, 3, 1), gamma))
+    return tree, tree.bfs((0, 0, 0))
+
+
+def test_graph_hash_depends_on_graph_and_options():
+    edges = [("a", "b"), ("b", "c"), ("a", "c")]
+    assert graph_hash(nx.DiGraph(edges)) == graph_hash(nx.DiGraph(edges[::-1]))
+    assert graph_hash(nx.DiGraph(edges)) != graph_hash(nx.DiGraph(edges[:2]))
+    assert graph_hash(nx.DiGraph(edges), k=0.5) != graph_hash(nx.DiGraph(edges), k=0.6)
+
+
+def test_layout_is_read_back_from_cache(tree, tmp_path, monkeypatch):
+    tree, _ = tree
+    pos = tree.layout(tree.G, str(tmp_path))
+    [name] = os.listdir(tmp_path)
+    assert {key for key, _, _ in json.load(open(tmp_path / name))} == {repr(node) for node in tree.G}
+
+    def fail(*args, **kwargs):
+        raise AssertionError("the layout should come from the cache")
+    monkeypatch.setattr(nx, "spring_layout", fail)
+    assert tree.layout(tree.G, str(tmp_path)) == pos
+
+
+def test_neighbourhood_of_path(tree):
+    tree, path = tree
+    G = tree.neighbourhood(path, hops=1)
+    on_path = {str(node) for node in path}
+    assert on_path <= set(G)
+    assert set(G) == on_path | {n for node in on_path for n in nx.all_neighbors(tree.G, node)}
+
+    sampled = tree.neighbourhood(path, hops=2, max_nodes=len(path) + 1)
+    assert len(sampled) == len(path) + 1 and on_path <= set(sampled)
+    assert set(neighbourhood(tree.G, ["unknown"], hops=1)) == set()
+
+
+def test_visualize_neighbourhood(tree, tmp_path):
+    tree, path = tree
+    tree.visualize(path, hops=1, layout_cache=str(tmp_path / "layouts"), output=str(tmp_path / "tree.png"))
+    assert (tmp_path / "tree.png").stat().st_size > 0
+    assert len(os.listdir(tmp_path / "layouts")) == 1
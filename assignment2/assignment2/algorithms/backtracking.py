@@ -1,20 +1,26 @@
 from assignment2.datastructures.variable import Variable
 from assignment2.datastructures.csp import CSP
+from assignment2.datastructures.nogood_store import NogoodStore
 
-from typing import Callable, List, Tuple, Any, Dict, Optional
+from typing import Callable, List, Tuple, Any, Dict, Optional, Set
 
 class BacktrackingSolver:
     """
     Solves a CSP problem using backtracking with forward checking.
     """
-    def __init__(self, csp: CSP):
+    def __init__(self, csp: CSP, backjumping: bool = False, nogood_capacity: int = 0, max_nogood_size: Optional[int] = None):
         """
         Initializes a new BacktrackingSolver.
         
         :param csp: CSP problem to solve.
+        :param backjumping: If True, uses conflict-directed backjumping instead of chronological backtracking.
+        :param nogood_capacity: Maximum number of learned nogoods kept. 0 disables nogood learning.
+        :param max_nogood_size: Maximum number of variables in a learned nogood.
         """
         self.csp = csp
         self.solutions: List[Dict[str, Any]] = []
+        self.backjumping = backjumping
+        self.nogoods = NogoodStore(nogood_capacity, max_nogood_size) if nogood_capacity > 0 else None
     
     def forward_checking(self, var: Variable) -> bool:
         """
@@ -40,6 +46,9 @@ class BacktrackingSolver:
         :param collect_all: If True, collects all solutions. If False, stops after finding the first solution.
         :return: List of dictionaries containing variable assignments for all solutions.
         """
+        if self.backjumping or self.nogoods is not None:
+            return self.solve_conflict_directed(collect_all)
+
         if self.csp.is_complete(): # if the assignment is complete, add it to the list of solutions
             solution = {var.name: var.assigned_value for var in self.csp.variables} # convert the list of variables to a dictionary
             self.solutions.append(solution)
@@ -60,4 +69,88 @@ class BacktrackingSolver:
                         return result
             var.assigned_value = None
             
-        return self.solutions
\ No newline at end of file
+        return self.solutions
+
+    def solve_conflict_directed(self, collect_all: bool = True) -> List[Dict[str, Any]]:
+        """
+        Solves the CSP problem using conflict sets, backjumping and nogood learning.
+        
+        Variables are assigned in their CSP order. When every value of a variable fails, the
+        search jumps back to the deepest variable of its conflict set and, if enabled, the
+        assignment of the conflict set is stored as a nogood.
+        
+        :param collect_all: If True, collects all solutions. If False, stops after finding the first solution.
+        :return: List of dictionaries containing variable assignments for all solutions.
+        """
+        self._order = [var for var in self.csp.variables if not var.is_assigned()] # pre-assigned variables stay fixed
+        self._depth = {var: depth for depth, var in enumerate(self._order)}
+        self._constraints_of = {var: [c for c in self.csp.constraints if var in c.variables] for var in self._order}
+        self._assignment = {var.name: var.assigned_value for var in self.csp.variables if var.is_assigned()}
+        self._stop = False
+        found = len(self.solutions)
+        if self.nogoods is not None: # nogoods leave out the fixed variables, so they only hold for this search
+            self.nogoods.clear()
+
+        self._backjump(0, collect_all)
+        return self.solutions if collect_all else self.solutions[found:found + 1]
+
+    def _conflicts(self, var: Variable) -> Optional[Set[Variable]]:
+        """
+        Checks the constraints of a newly assigned variable against the earlier assignments.
+        
+        :param var: Recently assigned variable.
+        :return: Earlier variables involved in the conflict, or None if the assignment is consistent.
+        """
+        for constraint in self._constraints_of[var]:
+            if not constraint.is_satisfied():
+                return {other for other in constraint.variables if other is not var and other in self._depth and other.is_assigned()}
+
+        if self.nogoods is not None:
+            nogood = self.nogoods.violated(var.name, self._assignment)
+            if nogood is not None:
+                names = {name for name, _ in nogood}
+                return {other for other in self._order if other.name in names and other is not var}
+        return None
+
+    def _backjump(self, depth: int, collect_all: bool) -> Optional[Set[Variable]]:
+        """
+        Recursively assigns the variable at a given depth.
+        
+        :param depth: Index of the variable to assign in the search order.
+        :param collect_all: If False, the search stops at the first solution.
+        :return: Conflict set explaining the failure of this subtree, or None if it contains a solution.
+        """
+        if depth == len(self._order): # the assignment is complete
+            self.solutions.append({var.name: var.assigned_value for var in self.csp.variables})
+            self._stop = not collect_all
+            return None
+
+        var = self._order[depth]
+        conflict_set: Set[Variable] = set()
+        solved = False
+        for value in var.domain:
+            var.assigned_value = value
+            self._assignment[var.name] = value
+            conflicts = self._conflicts(var)
+            if conflicts is not None:
+                conflict_set |= conflicts
+                continue
+
+            child_conflicts = self._backjump(depth + 1, collect_all)
+            if self._stop:
+                break
+            if child_conflicts is None: # a solution below, every earlier variable is relevant again
+                solved = True
+            elif var not in child_conflicts and self.backjumping and not solved: # jump over this variable
+                conflict_set = child_conflicts
+                break
+            else:
+                conflict_set |= child_conflicts - {var}
+        else:
+            if self.nogoods is not None and not solved and conflict_set:
+                watch = max(conflict_set, key=self._depth.get)
+                self.nogoods.add({other.name: other.assigned_value for other in conflict_set}, watch.name)
+
+        var.assigned_value = None
+        del self._assignment[var.name]
+        return None if solved or self._stop else conflict_set
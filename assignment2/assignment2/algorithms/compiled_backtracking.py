@@ -0,0 +1,118 @@
+from assignment2.datastructures.csp import CSP
+from assignment2.datastructures.compiled_csp import CompiledCSP, iter_bits
+
+import random
+from typing import List, Any, Dict, Optional, Union
+
+class CompiledBacktrackingSolver:
+    """
+    Solves a CSP problem using backtracking over its compiled representation.
+
+    Domains are integer bitsets and every assignment is followed by generalised arc
+    consistency on the compiled constraint tables, so the search loop never touches
+    `Variable` or `Constraint` objects.
+    """
+    def __init__(self, csp: Union[CSP, CompiledCSP], variable_ordering: str = 'static',
+                 value_ordering: str = 'ascending', seed: Optional[int] = None):
+        """
+        Initializes a new CompiledBacktrackingSolver.
+
+        :param csp: CSP problem to solve, either as objects or already compiled.
+        :param variable_ordering: 'static' picks the first unassigned variable, 'mrv' the one with the smallest domain.
+        :param value_ordering: 'ascending' tries values in domain order, 'random' shuffles them.
+        :param seed: Seed of the random value ordering.
+        """
+        if variable_ordering not in ('static', 'mrv'):
+            raise ValueError(f"Unknown variable ordering: {variable_ordering}")
+        if value_ordering not in ('ascending', 'random'):
+            raise ValueError(f"Unknown value ordering: {value_ordering}")
+
+        self.compiled = csp if isinstance(csp, CompiledCSP) else CompiledCSP(csp)
+        self.variable_ordering = variable_ordering
+        self.value_ordering = value_ordering
+        self.rng = random.Random(seed)
+        self.solutions: List[Dict[str, Any]] = []
+
+    def solve(self, collect_all: bool = True, domains: Optional[List[int]] = None) -> List[Dict[str, Any]]:
+        """
+        Solves the CSP problem and collects all solutions.
+
+        :param collect_all: If True, collects all solutions. If False, stops after finding the first solution.
+        :param domains: Domain bitsets to start from (e.g. a subproblem). Defaults to the full domains.
+        :return: List of dictionaries containing variable assignments for all solutions.
+        """
+        domains = self.compiled.propagate(self.compiled.domains if domains is None else domains) # initial consistency
+        if domains is not None:
+            self._search(domains, collect_all)
+        return self.solutions if collect_all else self.solutions[-1:]
+
+    def count(self, domains: Optional[List[int]] = None) -> int:
+        """
+        Counts the solutions of the CSP problem without storing them.
+
+        :param domains: Domain bitsets to start from (e.g. a subproblem). Defaults to the full domains.
+        :return: Number of solutions.
+        """
+        domains = self.compiled.propagate(self.compiled.domains if domains is None else domains)
+        return 0 if domains is None else self._count(domains)
+
+    def select_variable(self, domains: List[int]) -> Optional[int]:
+        """
+        Selects the next variable to branch on.
+
+        :param domains: Current domain bitsets.
+        :return: Id of a variable whose domain is not a singleton, or None if the assignment is complete.
+        """
+        unassigned = (i for i, bits in enumerate(domains) if not self.compiled.is_singleton(bits))
+        if self.variable_ordering == 'mrv':
+            return min(unassigned, key=lambda i: domains[i].bit_count(), default=None)
+        return next(unassigned, None)
+
+    def branches(self, domains: List[int], var: int) -> List[List[int]]:
+        """
+        Assigns each remaining value of a variable and propagates the consequences.
+
+        :param domains: Current domain bitsets.
+        :param var: Id of the variable to branch on.
+        :return: Consistent child domains, in value ordering.
+        """
+        values = list(iter_bits(domains[var]))
+        if self.value_ordering == 'random':
+            self.rng.shuffle(values)
+
+        children = []
+        for k in values:
+            child = self.compiled.propagate(domains[:var] + [1 << k] + domains[var + 1:], [var])
+            if child is not None:
+                children.append(child)
+        return children
+
+    def _search(self, domains: List[int], collect_all: bool) -> bool:
+        """
+        Recursively assigns variables until every domain is a singleton.
+
+        :param domains: Current domain bitsets.
+        :param collect_all: If False, the search stops at the first solution.
+        :return: True if the search should stop, False otherwise.
+        """
+        var = self.select_variable(domains)
+        if var is None: # every domain is a singleton, the assignment is complete
+            self.solutions.append(self.compiled.decode(domains))
+            return not collect_all
+
+        for child in self.branches(domains, var):
+            if self._search(child, collect_all):
+                return True
+        return False
+
+    def _count(self, domains: List[int]) -> int:
+        """
+        Recursively counts the complete assignments below some domains.
+
+        :param domains: Current domain bitsets.
+        :return: Number of solutions.
+        """
+        var = self.select_variable(domains)
+        if var is None:
+            return 1
+        return sum(self._count(child) for child in self.branches(domains, var))
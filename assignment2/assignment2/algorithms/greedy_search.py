@@ -1,11 +1,17 @@
 from assignment2.datastructures.node import Node
+from assignment2.datastructures.heuristic_cache import HeuristicCache
 
-from typing import List, Tuple, Any, Callable
+from typing import List, Tuple, Any, Callable, Optional, Sequence
 import heapq # Priority queue
 
 class GreedyBestFirstSearch:
-    def __init__(self, successors: Callable[[Any], List[Tuple[Any, float]]], heuristic: Callable[[Any], float]):
+    def __init__(self, successors: Callable[[Any], List[Tuple[Any, float]]], heuristic: Callable[[Any], float],
+                 cache_size: int = 0, cache_policy: str = 'lru',
+                 batch_heuristic: Optional[Callable[[Sequence[Any]], Sequence[float]]] = None):
         self.successors = successors
+        # Memoize the heuristic (and evaluate successors in batches) when asked to
+        if (cache_size > 0 or batch_heuristic is not None) and not isinstance(heuristic, HeuristicCache):
+            heuristic = HeuristicCache(heuristic, maxsize=cache_size or 100_000, policy=cache_policy, batch_heuristic=batch_heuristic)
         self.heuristic = heuristic
         self.search_steps = []  # List to store each search step
     
@@ -22,13 +28,19 @@ class GreedyBestFirstSearch:
 
             explored.add(current.state)
 
-            for state in self.successors(current.state):
-                if state not in explored:
-                    child = Node(state, parent=current)
-                    heapq.heappush(frontier, (self.heuristic(state), child))
+            states = [state for state in self.successors(current.state) if state not in explored]
+            for state, h in zip(states, self._evaluate(states)):
+                child = Node(state, parent=current)
+                heapq.heappush(frontier, (h, child))
 
         return None  # No path found
 
+    def _evaluate(self, states: List[Any]) -> List[float]:
+        """Private method to compute the heuristic of all successors, in one batch when the heuristic is cached."""
+        if isinstance(self.heuristic, HeuristicCache):
+            return self.heuristic.batch(states)
+        return [self.heuristic(state) for state in states]
+
     def _reconstruct_path(self, node: Node) -> List[Node]:
         """Private method to backtrack and reconstruct the path from the goal to the start."""
         path = []
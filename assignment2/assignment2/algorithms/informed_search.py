@@ -0,0 +1,154 @@
+from assignment2.datastructures.node import Node
+from assignment2.datastructures.priority_queue import IndexedPriorityQueue
+
+import heapq
+from typing import List, Tuple, Any, Callable, Dict, Optional
+
+class AStarSearch:
+    """
+    A* search over the same `successors`/`heuristic` callables as GreedyBestFirstSearch.
+
+    Every state has a single record (its best node so far) and a single entry in an indexed
+    priority queue, so a cheaper path to a queued state is a decrease-key instead of a
+    duplicate entry, and the heuristic is evaluated once per state.
+    """
+    def __init__(self, successors: Callable[[Any], List[Any]], heuristic: Callable[[Any], float],
+                 cost: Optional[Callable[[Any, Any], float]] = None, weight: float = 1.0):
+        """
+        Initializes a new AStarSearch.
+
+        :param successors: Function returning the successor states of a state.
+        :param heuristic: Function estimating the remaining cost from a state to the goal.
+        :param cost: Function returning the cost of a move between two states. Defaults to 1 per move.
+        :param weight: Weight applied to the heuristic (f = g + weight * h). 1 is plain A*.
+        """
+        self.successors = successors
+        self.heuristic = heuristic
+        self.cost = cost or (lambda state, next_state: 1)
+        self.weight = weight
+        self.expanded = 0 # number of expanded nodes of the last execution
+        self.evaluations = 0 # number of heuristic calls of the last execution
+
+    def _h(self, state: Any) -> float:
+        self.evaluations += 1
+        return self.heuristic(state)
+
+    def execute(self, start: Node, goal_state: Any, logging: bool = False) -> Optional[List[Node]]:
+        """
+        Searches a path from the start node to the goal state.
+
+        :param start: Start node.
+        :param goal_state: State to reach.
+        :param logging: If True, prints every expanded state.
+        :return: The path from start to goal as a list of nodes, or None if no path exists.
+        """
+        self.expanded, self.evaluations = 0, 0
+        start.cost, start.h = 0, self._h(start.state)
+        records: Dict[Any, Node] = {start.state: start} # state -> best node found so far
+        frontier = IndexedPriorityQueue()
+        frontier.push(start.state, (self.weight * start.h, start.h))
+
+        while frontier:
+            state, _ = frontier.pop()
+            current = records[state]
+            if logging:
+                print(f"Expanding {state} (g={current.cost}, h={current.h})")
+
+            if state == goal_state:
+                return self._reconstruct_path(current)
+
+            self.expanded += 1
+
+            for next_state in self.successors(state):
+                g = current.cost + self.cost(state, next_state)
+                record = records.get(next_state)
+                if record is not None and record.cost <= g: # not a better path (otherwise reopened)
+                    continue
+
+                h = record.h if record is not None else self._h(next_state) # one heuristic call per state
+                records[next_state] = Node(next_state, parent=current, h=h, cost=g)
+                frontier.push(next_state, (g + self.weight * h, h))
+
+        return None  # No path found
+
+    def _reconstruct_path(self, node: Node) -> List[Node]:
+        """Private method to backtrack and reconstruct the path from the goal to the start."""
+        path = []
+        while node:
+            path.append(node)
+            node = node.parent
+        return path[::-1]  # Reverse the path for start to goal
+
+class WeightedAStarSearch(AStarSearch):
+    """
+    Weighted A* (f = g + w * h), trading optimality (within a factor w) for fewer expansions.
+    """
+    def __init__(self, successors: Callable[[Any], List[Any]], heuristic: Callable[[Any], float],
+                 weight: float = 2.0, cost: Optional[Callable[[Any, Any], float]] = None):
+        """
+        Initializes a new WeightedAStarSearch.
+
+        :param successors: Function returning the successor states of a state.
+        :param heuristic: Function estimating the remaining cost from a state to the goal.
+        :param weight: Weight applied to the heuristic, at least 1.
+        :param cost: Function returning the cost of a move between two states. Defaults to 1 per move.
+        """
+        if weight < 1:
+            raise ValueError("The weight of weighted A* must be at least 1")
+        super().__init__(successors, heuristic, cost=cost, weight=weight)
+
+class BeamSearch(AStarSearch):
+    """
+    Beam search: a breadth-first sweep that keeps only the `beam_width` best states per layer.
+    """
+    def __init__(self, successors: Callable[[Any], List[Any]], heuristic: Callable[[Any], float],
+                 beam_width: int = 10, cost: Optional[Callable[[Any, Any], float]] = None):
+        """
+        Initializes a new BeamSearch.
+
+        :param successors: Function returning the successor states of a state.
+        :param heuristic: Function estimating the remaining cost from a state to the goal.
+        :param beam_width: Number of states kept in each layer.
+        :param cost: Function returning the cost of a move between two states. Defaults to 1 per move.
+        """
+        super().__init__(successors, heuristic, cost=cost)
+        self.beam_width = beam_width
+
+    def execute(self, start: Node, goal_state: Any, logging: bool = False) -> Optional[List[Node]]:
+        """
+        Searches a path from the start node to the goal state (incomplete: the beam may miss it).
+
+        :param start: Start node.
+        :param goal_state: State to reach.
+        :param logging: If True, prints every layer.
+        :return: The path from start to goal as a list of nodes, or None if no path was found.
+        """
+        self.expanded, self.evaluations = 0, 0
+        start.cost, start.h = 0, self._h(start.state)
+        records: Dict[Any, Node] = {start.state: start} # states kept in a beam, never generated again
+        h_values: Dict[Any, float] = {start.state: start.h} # every generated state, pruned ones included
+        beam = [start]
+
+        while beam:
+            if logging:
+                print(f"Beam: {beam}")
+            layer: Dict[Any, Node] = {}
+            for current in beam:
+                if current.state == goal_state:
+                    return self._reconstruct_path(current)
+                self.expanded += 1
+                for next_state in self.successors(current.state):
+                    if next_state in records: # kept by an earlier layer
+                        continue
+                    g = current.cost + self.cost(current.state, next_state)
+                    candidate = layer.get(next_state)
+                    if candidate is not None and candidate.cost <= g: # already in this layer by a path as cheap
+                        continue
+                    h = h_values.get(next_state)
+                    if h is None: # pruned states may come back, the heuristic is evaluated once per state
+                        h = h_values[next_state] = self._h(next_state)
+                    layer[next_state] = Node(next_state, parent=current, h=h, cost=g)
+            beam = heapq.nsmallest(self.beam_width, layer.values(), key=lambda node: node.h)
+            records.update((node.state, node) for node in beam) # only the surviving states are closed
+
+        return None  # No path found
@@ -0,0 +1,222 @@
+from assignment2.datastructures.variable import Variable
+from assignment2.datastructures.csp import CSP
+
+import random
+from typing import List, Any, Dict, Optional
+
+class MinConflictsSolver:
+    """
+    Solves a CSP problem using min-conflicts local search with a tabu list and random restarts.
+
+    The solver keeps the violation state of every constraint, the number of violated
+    constraints per variable and a conflict table: for every free variable and value, the
+    number of its constraints that value would violate. Choosing a value reads the table,
+    and a move only updates the table rows of the moved variable's neighbours.
+    """
+    def __init__(self, csp: CSP, max_steps: int = 100_000, max_restarts: int = 10, tabu_tenure: int = 10,
+                 seed: Optional[int] = None):
+        """
+        Initializes a new MinConflictsSolver.
+
+        :param csp: CSP problem to solve.
+        :param max_steps: Maximum number of moves before a restart.
+        :param max_restarts: Maximum number of random restarts.
+        :param tabu_tenure: Number of steps during which a variable may not go back to a value it left.
+        :param seed: Seed of the random number generator.
+        """
+        self.csp = csp
+        self.max_steps = max_steps
+        self.max_restarts = max_restarts
+        self.tabu_tenure = tabu_tenure
+        self.rng = random.Random(seed)
+        self.solutions: List[Dict[str, Any]] = []
+        self.steps = 0
+        self.restarts = 0
+
+        self._free = [var for var in csp.variables if not var.is_assigned()] # pre-assigned variables stay fixed
+        self._free_set = set(self._free)
+        self._constraints_of: Dict[Variable, List[int]] = {var: [] for var in csp.variables}
+        self._free_of: List[List[Variable]] = [] # distinct free variables of every constraint
+        for cid, constraint in enumerate(csp.constraints):
+            for var in constraint.variables:
+                self._constraints_of[var].append(cid)
+            self._free_of.append([var for var in dict.fromkeys(constraint.variables) if var in self._free_set])
+        self._value_index: Dict[Variable, Dict[Any, int]] = {var: {value: i for i, value in enumerate(var.domain)}
+                                                             for var in self._free}
+
+    def solve(self) -> List[Dict[str, Any]]:
+        """
+        Searches for a single solution.
+
+        :return: List containing the solution found, or an empty list if none was found within the budget.
+        """
+        self.steps, self.restarts = 0, 0
+        try:
+            for restart in range(self.max_restarts + 1):
+                self.restarts = restart
+                self._initialise(greedy=restart == 0)
+                if self._descend():
+                    solution = {var.name: var.assigned_value for var in self.csp.variables}
+                    self.solutions.append(solution)
+                    return [solution]
+            return []
+        finally:
+            for var in self._free:
+                var.assigned_value = None
+
+    def _initialise(self, greedy: bool) -> None:
+        """
+        Builds an initial assignment and the conflict bookkeeping.
+
+        Variables are assigned one by one. The table row of a variable is completed just before
+        it is assigned, so the greedy choice reads it, and the rows of the variables already
+        assigned are updated as their neighbours get a value.
+
+        :param greedy: If True, each variable takes the value with the fewest conflicts so far, otherwise a random one.
+        """
+        for var in self._free:
+            var.assigned_value = None
+        self._table: Dict[Variable, List[int]] = {var: [0] * len(var.domain) for var in self._free}
+        self._contribution: Dict[Any, List[bool]] = {} # violations of every (constraint, free variable) pair
+        for var in self._free:
+            for cid in self._constraints_of[var]:
+                self._contribute(cid, var)
+            var.assigned_value = self._greedy_value(var) if greedy else self.rng.choice(var.domain)
+            for cid in self._constraints_of[var]:
+                for other in self._free_of[cid]:
+                    if other is not var and (cid, other) in self._contribution:
+                        self._contribute(cid, other)
+
+        self._violated = [not constraint.is_satisfied() for constraint in self.csp.constraints]
+        self._total = sum(self._violated)
+        self.conflicts: Dict[Variable, int] = {var: 0 for var in self.csp.variables}
+        self._conflicted: List[Variable] = []
+        self._position: Dict[Variable, int] = {}
+        for cid, violated in enumerate(self._violated):
+            if violated:
+                for var in self.csp.constraints[cid].variables:
+                    self._add_conflict(var, 1)
+
+    def _add_conflict(self, var: Variable, delta: int) -> None:
+        """
+        Updates the conflict count of a variable and the set of conflicted free variables.
+
+        :param var: Variable whose count changes.
+        :param delta: +1 or -1.
+        """
+        self.conflicts[var] += delta
+        if var not in self._free_set:
+            return
+        if self.conflicts[var] > 0 and var not in self._position:
+            self._position[var] = len(self._conflicted)
+            self._conflicted.append(var)
+        elif self.conflicts[var] == 0 and var in self._position: # swap-remove in O(1)
+            index = self._position.pop(var)
+            last = self._conflicted.pop()
+            if last is not var:
+                self._conflicted[index] = last
+                self._position[last] = index
+
+    def _contribute(self, cid: int, var: Variable) -> None:
+        """
+        Re-evaluates a constraint for every value of one of its free variables and updates that variable's table row.
+
+        :param cid: Index of the constraint.
+        :param var: Free variable of the constraint whose values are tried, the others keeping their value.
+        """
+        constraint, current, row = self.csp.constraints[cid], var.assigned_value, self._table[var]
+        previous = self._contribution.get((cid, var))
+        violations = []
+        for i, value in enumerate(var.domain):
+            var.assigned_value = value
+            violated = not constraint.is_satisfied()
+            violations.append(violated)
+            if previous is None:
+                row[i] += violated
+            elif violated != previous[i]:
+                row[i] += 1 if violated else -1
+        var.assigned_value = current
+        self._contribution[(cid, var)] = violations
+
+    def _greedy_value(self, var: Variable) -> Any:
+        """
+        Finds the value with the fewest conflicts with the variables assigned so far (initial assignment).
+
+        :param var: Variable to assign, whose table row is complete.
+        :return: The selected value, ties are broken randomly.
+        """
+        row = self._table[var]
+        if not row:
+            return None
+        best_cost = min(row)
+        return self.rng.choice([value for value, cost in zip(var.domain, row) if cost == best_cost])
+
+    def _best_value(self, var: Variable, tabu: Dict[Any, int], step: int, aspiration: Optional[int] = None) -> Any:
+        """
+        Finds the value of a variable that minimises its number of conflicts, read from the conflict table.
+
+        :param var: Variable to move.
+        :param tabu: Step until which each (variable, value) pair is tabu.
+        :param step: Current step.
+        :param aspiration: Total number of violations a tabu move must beat to be allowed.
+        :return: The selected value, ties are broken randomly.
+        """
+        row = self._table[var]
+        current_cost = row[self._value_index[var][var.assigned_value]]
+        best, best_cost = [], None
+        for value, cost in zip(var.domain, row):
+            if tabu.get((var.name, value), -1) > step: # tabu unless it beats the best total seen
+                if aspiration is None or self._total - current_cost + cost >= aspiration:
+                    continue
+            if best_cost is None or cost < best_cost:
+                best, best_cost = [value], cost
+            elif cost == best_cost:
+                best.append(value)
+        return self.rng.choice(best) if best else var.assigned_value
+
+    def _move(self, var: Variable, value: Any) -> None:
+        """
+        Assigns a value and incrementally updates the violated constraints, conflict counts and conflict table.
+
+        The table row of a variable only depends on the other variables, so only the rows of the
+        variables sharing a constraint with the moved one change.
+
+        :param var: Variable to move.
+        :param value: New value.
+        """
+        var.assigned_value = value
+        for cid in self._constraints_of[var]:
+            violated = not self.csp.constraints[cid].is_satisfied()
+            if violated != self._violated[cid]:
+                self._violated[cid] = violated
+                delta = 1 if violated else -1
+                self._total += delta
+                for other in self.csp.constraints[cid].variables:
+                    self._add_conflict(other, delta)
+
+            for other in self._free_of[cid]:
+                if other is not var:
+                    self._contribute(cid, other)
+
+    def _descend(self) -> bool:
+        """
+        Runs min-conflicts moves until a solution is found or the step budget is exhausted.
+
+        :return: True if the current assignment is a solution, False otherwise.
+        """
+        tabu: Dict[Any, int] = {}
+        best_total = self._total
+        for step in range(self.max_steps):
+            if self._total == 0:
+                return True
+            if not self._conflicted: # only fixed variables are in conflict
+                return False
+            var = self.rng.choice(self._conflicted)
+            old = var.assigned_value
+            value = self._best_value(var, tabu, step, aspiration=best_total)
+            if value != old:
+                tabu[(var.name, old)] = step + self.tabu_tenure
+                self._move(var, value)
+                best_total = min(best_total, self._total)
+            self.steps += 1
+        return self._total == 0
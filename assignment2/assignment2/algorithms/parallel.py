@@ -0,0 +1,190 @@
+from assignment2.datastructures.csp import CSP
+from assignment2.datastructures.compiled_csp import CompiledCSP
+from assignment2.algorithms.compiled_backtracking import CompiledBacktrackingSolver
+
+import os
+import queue
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Any, Dict, Optional, Union
+
+_worker_compiled: Optional[CompiledCSP] = None # compiled problem shared by the pool workers
+_POLL_INTERVAL = 0.1 # seconds between checks that the portfolio members are still running
+
+def _init_worker(compiled: CompiledCSP) -> None:
+    """
+    Stores the compiled problem once per pool worker instead of once per task.
+
+    :param compiled: Compiled CSP problem.
+    """
+    global _worker_compiled
+    _worker_compiled = compiled
+
+def _solve_cube(cube: List[int]) -> List[Dict[str, Any]]:
+    """
+    Enumerates all solutions of a subproblem.
+
+    :param cube: Domain bitsets of the subproblem.
+    :return: List of dictionaries containing variable assignments.
+    """
+    return CompiledBacktrackingSolver(_worker_compiled).solve(domains=cube)
+
+def _count_cube(cube: List[int]) -> int:
+    """
+    Counts the solutions of a subproblem.
+
+    :param cube: Domain bitsets of the subproblem.
+    :return: Number of solutions.
+    """
+    return CompiledBacktrackingSolver(_worker_compiled).count(domains=cube)
+
+def _race(compiled: CompiledCSP, configuration: Dict[str, Any], results: mp.Queue) -> None:
+    """
+    Runs one portfolio member and reports its first solution.
+
+    :param compiled: Compiled CSP problem.
+    :param configuration: Keyword arguments of the CompiledBacktrackingSolver.
+    :param results: Queue receiving ('solution', dict | None) or ('error', message).
+    """
+    try:
+        solutions = CompiledBacktrackingSolver(compiled, **configuration).solve(collect_all=False)
+        results.put(('solution', solutions[0] if solutions else None))
+    except Exception as error: # always report, the parent waits for every member
+        results.put(('error', f"{configuration}: {error!r}"))
+
+class ParallelSolver:
+    """
+    Solves a CSP problem on several processes.
+
+    Finding one solution races a portfolio of differently configured solvers, the first
+    solution cancels the others. Enumerating or counting all solutions splits the top of
+    the search tree into independent subproblems (cubes) solved by a process pool. A worker
+    that dies without answering (killed, crashed) raises an error instead of blocking forever.
+    """
+    def __init__(self, csp: Union[CSP, CompiledCSP], processes: Optional[int] = None, cubes_per_process: int = 8):
+        """
+        Initializes a new ParallelSolver.
+
+        :param csp: CSP problem to solve, either as objects or already compiled.
+        :param processes: Number of worker processes. Defaults to the number of CPUs.
+        :param cubes_per_process: Number of cubes to generate per process, for load balancing.
+        """
+        self.compiled = csp if isinstance(csp, CompiledCSP) else CompiledCSP(csp)
+        self.processes = processes or os.cpu_count() or 1
+        self.cubes_per_process = cubes_per_process
+        self.solutions: List[Dict[str, Any]] = []
+
+    def default_portfolio(self) -> List[Dict[str, Any]]:
+        """
+        Builds one solver configuration per process.
+
+        :return: List of CompiledBacktrackingSolver keyword arguments.
+        """
+        portfolio = [{'variable_ordering': 'mrv'}, {'variable_ordering': 'static'}]
+        portfolio += [{'variable_ordering': 'mrv', 'value_ordering': 'random', 'seed': seed}
+                      for seed in range(max(self.processes - len(portfolio), 0))]
+        return portfolio[:max(self.processes, 1)]
+
+    def cubes(self, solver: Optional[CompiledBacktrackingSolver] = None) -> List[List[int]]:
+        """
+        Splits the search tree into independent subproblems.
+
+        The tree is expanded level by level until there are enough cubes for the pool.
+        Cubes are returned in search order so that merged results keep the sequential order.
+
+        :param solver: Solver whose orderings are used for splitting.
+        :return: List of domain bitsets, one per cube.
+        """
+        solver = solver or CompiledBacktrackingSolver(self.compiled)
+        root = self.compiled.propagate(self.compiled.domains)
+        cubes = [] if root is None else [root]
+        target = self.processes * self.cubes_per_process
+
+        while len(cubes) < target:
+            expanded, split = [], False
+            for cube in cubes:
+                var = solver.select_variable(cube)
+                if var is None: # already a solution
+                    expanded.append(cube)
+                else:
+                    expanded.extend(solver.branches(cube, var))
+                    split = True
+            cubes = expanded
+            if not split:
+                break
+        return cubes
+
+    def solve(self, collect_all: bool = True) -> List[Dict[str, Any]]:
+        """
+        Solves the CSP problem in parallel.
+
+        :param collect_all: If True, enumerates all solutions over cubes. If False, races the portfolio.
+        :return: List of dictionaries containing variable assignments for all solutions.
+        """
+        if not collect_all:
+            solution = self.race()
+            if solution is not None:
+                self.solutions.append(solution)
+            return self.solutions[-1:]
+
+        # Unlike mp.Pool, the executor raises BrokenProcessPool if a worker dies mid-task
+        with ProcessPoolExecutor(self.processes, initializer=_init_worker, initargs=(self.compiled,)) as pool:
+            for solutions in pool.map(_solve_cube, self.cubes()): # map keeps the cube order
+                self.solutions.extend(solutions)
+        return self.solutions
+
+    def count(self) -> int:
+        """
+        Counts the solutions of the CSP problem in parallel.
+
+        :return: Number of solutions.
+        """
+        with ProcessPoolExecutor(self.processes, initializer=_init_worker, initargs=(self.compiled,)) as pool:
+            return sum(pool.map(_count_cube, self.cubes()))
+
+    def race(self, portfolio: Optional[List[Dict[str, Any]]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Races differently configured solvers and returns the first solution found.
+
+        :param portfolio: Solver configurations, one process each. Defaults to `default_portfolio()`.
+        :return: The first solution, or None if the problem has no solution.
+        :raises RuntimeError: If no member finished its search (every one failed or died without answering).
+        """
+        portfolio = portfolio or self.default_portfolio()
+        results = mp.Queue()
+        members = [mp.Process(target=_race, args=(self.compiled, configuration, results), daemon=True)
+                   for configuration in portfolio]
+        for member in members:
+            member.start()
+
+        try:
+            errors, answers, completed = [], 0, 0
+            while answers < len(members):
+                try:
+                    kind, payload = results.get(timeout=_POLL_INTERVAL)
+                except queue.Empty:
+                    if any(member.is_alive() for member in members):
+                        continue
+                    try: # a member may have answered just before exiting
+                        kind, payload = results.get(timeout=_POLL_INTERVAL)
+                    except queue.Empty: # the remaining members died without answering
+                        errors += [f"{configuration}: exit code {member.exitcode}"
+                                   for configuration, member in zip(portfolio, members) if member.exitcode != 0]
+                        break
+                answers += 1
+                if kind == 'error':
+                    errors.append(payload)
+                elif payload is not None: # first solution wins
+                    return payload
+                else:
+                    completed += 1
+            if not completed: # no member finished its search
+                raise RuntimeError(f"Every portfolio member failed: {errors}")
+            return None # a member that completed its search proved the problem unsatisfiable
+        finally:
+            for member in members: # cancel the rest of the portfolio
+                if member.is_alive():
+                    member.terminate()
+                member.join()
+            results.close() # release the queue's pipe and feeder thread once no member can write to it
+            results.join_thread()
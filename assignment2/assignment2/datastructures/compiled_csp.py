@@ -0,0 +1,265 @@
+from assignment2.datastructures.csp import CSP
+from assignment2.datastructures.constraint import Constraint
+
+from collections import deque
+from typing import List, Dict, Any, Optional, Iterable, Tuple, Callable
+
+import numpy as np
+
+def bits_to_mask(bits: int, size: int) -> np.ndarray:
+    """
+    Converts a domain bitset into a boolean mask.
+
+    :param bits: Bitset where bit i is set if value index i is in the domain.
+    :param size: Size of the original domain.
+    :return: Boolean NumPy array of length `size`.
+    """
+    raw = np.frombuffer(bits.to_bytes((size + 7) // 8 or 1, 'little'), dtype=np.uint8)
+    return np.unpackbits(raw, bitorder='little')[:size].astype(bool)
+
+def mask_to_bits(mask: np.ndarray) -> int:
+    """
+    Converts a boolean mask into a domain bitset.
+
+    :param mask: Boolean NumPy array.
+    :return: Bitset where bit i is set if mask[i] is True.
+    """
+    return int.from_bytes(np.packbits(mask, bitorder='little').tobytes(), 'little')
+
+def iter_bits(bits: int) -> Iterable[int]:
+    """
+    Iterates over the indices of the set bits of a bitset, lowest first.
+
+    :param bits: Bitset to iterate over.
+    :return: Generator of value indices.
+    """
+    while bits:
+        low = bits & -bits # isolate the lowest set bit
+        yield low.bit_length() - 1
+        bits ^= low
+
+class CompiledCSP:
+    """
+    Compact, integer-indexed representation of a CSP.
+
+    Variables are mapped to dense ids, domains are stored as integer bitsets over the
+    value indices of each variable and every constraint is compiled once, either into an
+    extensional table (a boolean NumPy array with one axis per variable in its scope) or into
+    the dedicated domain filter returned by its `propagator`.
+    """
+    def __init__(self, csp: CSP, max_table_size: int = 1_000_000):
+        """
+        Compiles a CSP problem.
+
+        :param csp: CSP problem to compile.
+        :param max_table_size: Maximum number of tuples a single constraint table may have.
+        """
+        self.csp = csp
+        self.names: List[str] = [var.name for var in csp.variables]
+        self.ids: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+        self.values: List[List[Any]] = [list(var.domain) for var in csp.variables]
+        self.sizes: List[int] = [len(values) for values in self.values]
+        self.domains: List[int] = [(1 << size) - 1 for size in self.sizes] # all values allowed
+        self.max_table_size = max_table_size
+
+        self.scopes: List[Tuple[int, ...]] = []
+        self.tables: List[Optional[np.ndarray]] = []
+        self.supports: List[Optional[Tuple[List[int], List[int]]]] = [] # per-value support bitsets of binary tables
+        self.propagators: List[Optional[Callable[[List[int]], Optional[List[int]]]]] = [] # dedicated filters
+        self.watches: List[List[int]] = [[] for _ in self.names] # constraint ids per variable
+        for constraint in csp.constraints:
+            self.add_constraint(constraint)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """
+        Drops the source CSP when pickling, the compiled tables are self-contained.
+
+        :return: State of the compiled problem.
+        """
+        state = self.__dict__.copy()
+        state['csp'] = None
+        return state
+
+    def add_constraint(self, constraint: Constraint) -> int:
+        """
+        Compiles a constraint and registers it.
+
+        Constraints providing a `propagator` keep their dedicated filter. Other constraints
+        are compiled into an extensional table by enumerating every tuple of their scope and
+        evaluating `is_satisfied` on it, so arbitrary `Constraint` subclasses are supported.
+
+        :param constraint: Constraint to compile.
+        :return: Id of the compiled constraint.
+        """
+        scope = tuple(self.ids[var.name] for var in constraint.variables)
+        propagator = constraint.propagator([self.values[i] for i in scope])
+        if propagator is not None:
+            return self.add_propagator(scope, propagator)
+
+        shape = tuple(self.sizes[i] for i in scope)
+        if int(np.prod(shape, dtype=np.int64)) > self.max_table_size:
+            raise ValueError(f"Constraint table of shape {shape} exceeds max_table_size={self.max_table_size}")
+
+        table = np.zeros(shape, dtype=bool)
+        saved = [var.assigned_value for var in constraint.variables] # restore the user's assignment afterwards
+        try:
+            for index in np.ndindex(*shape):
+                for var, i, k in zip(constraint.variables, scope, index):
+                    var.assigned_value = self.values[i][k]
+                table[index] = constraint.is_satisfied()
+        finally:
+            for var, value in zip(constraint.variables, saved):
+                var.assigned_value = value
+
+        return self.add_table(scope, table)
+
+    def add_table(self, scope: Tuple[int, ...], table: np.ndarray) -> int:
+        """
+        Registers an already compiled extensional table.
+
+        :param scope: Variable ids covered by the table, one per axis.
+        :param table: Boolean array of allowed tuples (indexed by value indices).
+        :return: Id of the compiled constraint.
+        """
+        cid = self._register(scope, table, None)
+        if len(scope) == 2 and scope[0] != scope[1]: # binary tables are revised with bit operations only
+            self.supports.append(([mask_to_bits(row) for row in table], [mask_to_bits(column) for column in table.T]))
+        else:
+            self.supports.append(None)
+        return cid
+
+    def add_propagator(self, scope: Tuple[int, ...], propagator: Callable[[List[int]], Optional[List[int]]]) -> int:
+        """
+        Registers a constraint given by a dedicated domain filter.
+
+        :param scope: Variable ids the filter works on, in order.
+        :param propagator: Function from scope bitsets to filtered bitsets (None on wipe-out).
+        :return: Id of the compiled constraint.
+        """
+        cid = self._register(scope, None, propagator)
+        self.supports.append(None)
+        return cid
+
+    def _register(self, scope: Tuple[int, ...], table: Optional[np.ndarray], propagator: Optional[Callable]) -> int:
+        """
+        Stores a compiled constraint and watches its variables.
+
+        :return: Id of the compiled constraint.
+        """
+        cid = len(self.scopes)
+        self.scopes.append(scope)
+        self.tables.append(table)
+        self.propagators.append(propagator)
+        for i in set(scope):
+            self.watches[i].append(cid)
+        return cid
+
+    def revise(self, cid: int, domains: List[int]) -> Optional[List[int]]:
+        """
+        Computes the values of each variable of a constraint that still have a support.
+
+        :param cid: Id of the constraint to revise.
+        :param domains: Current domain bitsets of all variables.
+        :return: New bitsets for the scope of the constraint, or None if a domain is wiped out.
+        """
+        scope = self.scopes[cid]
+        if self.propagators[cid] is not None:
+            return self.propagators[cid]([domains[i] for i in scope])
+        if self.supports[cid] is not None:
+            return self._revise_binary(cid, domains)
+
+        indices = [np.flatnonzero(bits_to_mask(domains[i], self.sizes[i])) for i in scope]
+        sub = self.tables[cid][np.ix_(*indices)] # restrict the table to the current domains
+        axes = tuple(range(len(scope)))
+
+        revised = []
+        for axis, i in enumerate(scope):
+            others = axes[:axis] + axes[axis + 1:]
+            supported = sub.any(axis=others) if others else sub
+            mask = np.zeros(self.sizes[i], dtype=bool)
+            mask[indices[axis][supported]] = True
+            bits = domains[i] & mask_to_bits(mask)
+            if bits == 0:
+                return None
+            revised.append(bits)
+        return revised
+
+    def _revise_binary(self, cid: int, domains: List[int]) -> Optional[List[int]]:
+        """
+        Revises a binary constraint using its precomputed support bitsets.
+
+        :param cid: Id of the binary constraint to revise.
+        :param domains: Current domain bitsets of all variables.
+        :return: New bitsets for both variables, or None if a domain is wiped out.
+        """
+        (x, y), (x_supports, y_supports) = self.scopes[cid], self.supports[cid]
+        x_bits, y_bits = 0, 0
+        for k in iter_bits(domains[x]):
+            if x_supports[k] & domains[y]: # value k of x has a support in the domain of y
+                x_bits |= 1 << k
+        if x_bits == 0:
+            return None
+        for k in iter_bits(domains[y]):
+            if y_supports[k] & x_bits:
+                y_bits |= 1 << k
+        if y_bits == 0:
+            return None
+        return [x_bits, y_bits]
+
+    def propagate(self, domains: List[int], changed: Optional[Iterable[int]] = None) -> Optional[List[int]]:
+        """
+        Enforces generalised arc consistency on the compiled tables.
+
+        :param domains: Domain bitsets to start from (not modified).
+        :param changed: Ids of the variables whose domain changed. Defaults to all variables.
+        :return: New domain bitsets, or None if the problem became inconsistent.
+        """
+        domains = list(domains)
+        pending = deque(range(len(self.scopes)) if changed is None else
+                        dict.fromkeys(cid for i in changed for cid in self.watches[i]))
+        queued = set(pending)
+
+        while pending:
+            cid = pending.popleft()
+            queued.discard(cid)
+            revised = self.revise(cid, domains)
+            if revised is None: # a domain is empty
+                return None
+            for i, bits in zip(self.scopes[cid], revised):
+                if bits != domains[i]:
+                    domains[i] = bits
+                    for other in self.watches[i]: # requeue constraints sharing this variable
+                        if other != cid and other not in queued:
+                            pending.append(other)
+                            queued.add(other)
+        return domains
+
+    def is_satisfied(self, cid: int, assignment: List[int]) -> bool:
+        """
+        Checks a constraint against a complete assignment of its scope.
+
+        :param cid: Id of the constraint.
+        :param assignment: Value index per variable id.
+        :return: True if the tuple is allowed by the constraint, False otherwise.
+        """
+        if self.propagators[cid] is not None:
+            return self.propagators[cid]([1 << assignment[i] for i in self.scopes[cid]]) is not None
+        return bool(self.tables[cid][tuple(assignment[i] for i in self.scopes[cid])])
+
+    def is_singleton(self, bits: int) -> bool:
+        """
+        Checks if a domain bitset contains exactly one value.
+
+        :param bits: Domain bitset.
+        :return: True if exactly one bit is set, False otherwise.
+        """
+        return bits != 0 and bits & (bits - 1) == 0
+
+    def decode(self, domains: List[int]) -> Dict[str, Any]:
+        """
+        Converts singleton domains back to a `{name: value}` assignment.
+
+        :param domains: Domain bitsets, each containing a single value.
+        :return: Dictionary of variable assignments.
+        """
+        return {name: self.values[i][domains[i].bit_length() - 1] for i, name in enumerate(self.names)}
@@ -1,6 +1,6 @@
 from assignment2.datastructures.variable import Variable
 
-from typing import List, Dict, Union
+from typing import List, Dict, Union, Any, Callable, Optional
 
 class Constraint:
     """
@@ -21,14 +21,33 @@ class Constraint:
         :return: True if constraint is satisfied, False otherwise.
         """
         raise NotImplementedError("This method should be overridden by subclass")
+
+    def propagator(self, values: List[List[Any]]) -> Optional[Callable[[List[int]], Optional[List[int]]]]:
+        """
+        Builds a domain filter used by the compiled representation of the CSP.
+        
+        The filter receives the domain bitsets of the constraint's variables (bit k set if
+        the k-th value of `values[i]` is still allowed) and returns the filtered bitsets, or
+        None if a domain is wiped out. Constraints without a filter are compiled into a table.
+        
+        :param values: Domain values of each variable of the constraint, in order.
+        :return: Domain filter, or None to compile the constraint into an extensional table.
+        """
+        return None
     
 class HouseConstraint(Constraint):
+    ADJACENT_TO_C = {1: [2], 2: [1, 3], 3: [2, 4], 4: [3]}
+
+    def __init__(self, variables: List[Variable]):
+        super().__init__(variables)
+        # Fetch variables involved in this constraint once instead of on every check
+        var_dict = {var.name: var for var in self.variables}
+        self.C = var_dict.get('C', None)
+        self.F = var_dict.get('F', None)
+        self.P = var_dict.get('P', None)
+
     def is_satisfied(self) -> bool:
-        # Fetch variables involved in this constraint
-        var_dict = {var.name: var for var in self.variables} 
-        C = var_dict.get('C', None)
-        F = var_dict.get('F', None)
-        P = var_dict.get('P', None)
+        C, F, P = self.C, self.F, self.P
         
         if C is None or F is None or P is None:
             return True  # Incomplete assignment
@@ -39,8 +58,7 @@ class HouseConstraint(Constraint):
         c_val, f_val, p_val = C.assigned_value, F.assigned_value, P.assigned_value
         
         # F cannot be in C or adjacent to C
-        adjacent_to_C = {1: [2], 2: [1, 3], 3: [2, 4], 4: [3]}
-        if f_val == c_val or f_val in adjacent_to_C.get(c_val, []): 
+        if f_val == c_val or f_val in self.ADJACENT_TO_C.get(c_val, []): 
             return False
         
         # C and P cannot be on the same side
@@ -0,0 +1,363 @@
+from assignment2.datastructures.variable import Variable
+from assignment2.datastructures.constraint import Constraint
+from assignment2.datastructures.compiled_csp import bits_to_mask, iter_bits
+
+import operator
+from typing import List, Any, Dict, Callable, Optional, Iterable, Tuple
+
+import numpy as np
+
+class BinaryConstraint(Constraint):
+    """
+    Constraint `relation(x, y)` between two variables.
+
+    It has no dedicated propagator: the compiled representation turns it into a table
+    with per-value support bitsets.
+    """
+    def __init__(self, x: Variable, y: Variable, relation: Callable[[Any, Any], bool]):
+        """
+        Initializes a new BinaryConstraint.
+
+        :param x: First variable.
+        :param y: Second variable.
+        :param relation: Predicate that must hold on the values of x and y.
+        """
+        super().__init__([x, y])
+        self.relation = relation
+
+    def is_satisfied(self) -> bool:
+        x, y = self.variables
+        if not (x.is_assigned() and y.is_assigned()):
+            return True  # Incomplete assignment
+        return bool(self.relation(x.assigned_value, y.assigned_value))
+
+class NotEqualConstraint(BinaryConstraint):
+    """
+    Constraint `x != y`.
+    """
+    def __init__(self, x: Variable, y: Variable):
+        """
+        Initializes a new NotEqualConstraint.
+
+        :param x: First variable.
+        :param y: Second variable.
+        """
+        super().__init__(x, y, operator.ne)
+
+    def propagator(self, values: List[List[Any]]) -> '_NotEqualPropagator':
+        return _NotEqualPropagator(values)
+
+class TableConstraint(Constraint):
+    """
+    Extensional constraint given by its list of allowed tuples.
+    """
+    def __init__(self, variables: List[Variable], tuples: Iterable[Tuple[Any, ...]]):
+        """
+        Initializes a new TableConstraint.
+
+        :param variables: Variables of the constraint, in tuple order.
+        :param tuples: Allowed tuples of values.
+        """
+        super().__init__(variables)
+        self.tuples = [tuple(t) for t in tuples]
+        self._allowed = set(self.tuples)
+
+    def is_satisfied(self) -> bool:
+        if all(var.is_assigned() for var in self.variables):
+            return tuple(var.assigned_value for var in self.variables) in self._allowed
+        assigned = [(i, var.assigned_value) for i, var in enumerate(self.variables) if var.is_assigned()]
+        return any(all(t[i] == value for i, value in assigned) for t in self.tuples) # some tuple still matches
+
+    def propagator(self, values: List[List[Any]]) -> '_TablePropagator':
+        return _TablePropagator(values, self.tuples)
+
+class AllDifferentConstraint(Constraint):
+    """
+    Constraint requiring all variables to take pairwise different values.
+
+    Compiled propagation removes every value that belongs to no maximum matching between
+    variables and values (Régin's filtering), which is stronger than pairwise `!=`.
+    """
+    def is_satisfied(self) -> bool:
+        values = [var.assigned_value for var in self.variables if var.is_assigned()]
+        return len(values) == len(set(values))
+
+    def propagator(self, values: List[List[Any]]) -> '_AllDifferentPropagator':
+        return _AllDifferentPropagator(values)
+
+class LinearSumConstraint(Constraint):
+    """
+    Constraint `sum(coefficients[i] * variables[i]) <op> bound` with <op> one of '==', '<=', '>='.
+    """
+    OPERATORS = {'==': operator.eq, '<=': operator.le, '>=': operator.ge}
+
+    def __init__(self, variables: List[Variable], bound: float, op: str = '==', coefficients: Optional[List[float]] = None):
+        """
+        Initializes a new LinearSumConstraint.
+
+        :param variables: Variables of the sum.
+        :param bound: Right-hand side of the constraint.
+        :param op: Comparison operator, one of '==', '<=', '>='.
+        :param coefficients: Coefficient of each variable. Defaults to 1 for every variable.
+        """
+        if op not in self.OPERATORS:
+            raise ValueError(f"Unknown operator: {op}")
+        super().__init__(variables)
+        self.bound = bound
+        self.op = op
+        self.coefficients = list(coefficients) if coefficients is not None else [1] * len(variables)
+
+    def is_satisfied(self) -> bool:
+        # Bounds of the sum given the assigned values and the domains of the others
+        low, high = 0, 0
+        for a, var in zip(self.coefficients, self.variables):
+            terms = [a * var.assigned_value] if var.is_assigned() else [a * value for value in var.domain]
+            low, high = low + min(terms), high + max(terms)
+        if self.op in ('==', '<=') and low > self.bound:
+            return False
+        if self.op in ('==', '>=') and high < self.bound:
+            return False
+        return True
+
+    def propagator(self, values: List[List[Any]]) -> '_LinearSumPropagator':
+        return _LinearSumPropagator(values, self.coefficients, self.bound, self.op)
+
+class _NotEqualPropagator:
+    """
+    Removes the value of a fixed variable from the domain of the other one.
+    """
+    def __init__(self, values: List[List[Any]]):
+        x_values, y_values = values
+        y_index = {value: k for k, value in enumerate(y_values)}
+        x_index = {value: k for k, value in enumerate(x_values)}
+        self.x_to_y = [1 << y_index[value] if value in y_index else 0 for value in x_values] # bit of the equal value
+        self.y_to_x = [1 << x_index[value] if value in x_index else 0 for value in y_values]
+
+    def __call__(self, domains: List[int]) -> Optional[List[int]]:
+        x_bits, y_bits = domains
+        if x_bits and x_bits & (x_bits - 1) == 0: # x is fixed
+            y_bits &= ~self.x_to_y[x_bits.bit_length() - 1]
+        if y_bits and y_bits & (y_bits - 1) == 0:
+            x_bits &= ~self.y_to_x[y_bits.bit_length() - 1]
+        if x_bits == 0 or y_bits == 0:
+            return None
+        return [x_bits, y_bits]
+
+class _TablePropagator:
+    """
+    Generalised arc consistency on a list of tuples by simple tabular reduction (STR).
+
+    The tuples still valid are the prefix `order[:limit]` of a sparse set. A call only re-checks them
+    on the variables whose domain changed since the last reduction, and moves the invalid ones past
+    the limit. Every reduction is stacked with the domains it was made for: when the search backtracks
+    to larger domains, the reductions made for smaller ones are popped and restoring their limit makes
+    the tuples they removed valid again.
+    """
+    def __init__(self, values: List[List[Any]], tuples: List[Tuple[Any, ...]]):
+        indices = [{value: k for k, value in enumerate(var_values)} for var_values in values]
+        rows = [[index[value] for index, value in zip(indices, t)] for t in tuples
+                if all(value in index for index, value in zip(indices, t))] # drop tuples outside the domains
+        self.sizes = [len(var_values) for var_values in values]
+        self.tuples = np.array(rows, dtype=np.int64).reshape(len(rows), len(values))
+        self.order = np.arange(len(rows)) # sparse set of tuple indices, the valid ones first
+        self._full = [(1 << size) - 1 for size in self.sizes]
+        self._trail: List[Tuple[List[int], int]] = [] # (domains, limit) of every reduction, domains shrinking
+
+    def __call__(self, domains: List[int]) -> Optional[List[int]]:
+        while self._trail and any(bits & ~before for bits, before in zip(domains, self._trail[-1][0])):
+            self._trail.pop() # backtracked to domains larger than those of this reduction
+        previous, limit = self._trail[-1] if self._trail else (self._full, len(self.order))
+
+        changed = [i for i, (bits, before) in enumerate(zip(domains, previous)) if bits != before]
+        if changed:
+            alive = self.order[:limit]
+            valid = np.ones(limit, dtype=bool)
+            for i in changed:
+                valid &= bits_to_mask(domains[i], self.sizes[i])[self.tuples[alive, i]]
+            if not valid.any():
+                return None
+            self.order[:limit] = np.concatenate((alive[valid], alive[~valid]))
+            limit = int(np.count_nonzero(valid))
+            self._trail.append((list(domains), limit))
+        if limit == 0:
+            return None
+
+        alive = self.tuples[self.order[:limit]]
+        revised = []
+        for i in range(len(domains)):
+            bits = 0
+            for k in np.unique(alive[:, i]).tolist():
+                bits |= 1 << k
+            revised.append(bits)
+        return revised
+
+class _AllDifferentPropagator:
+    """
+    Régin's matching-based filtering for all-different.
+
+    The maximum matching found by the previous call is kept and only repaired for the
+    variables that lost their matched value, which makes repeated calls incremental.
+    """
+    def __init__(self, values: List[List[Any]]):
+        ids: Dict[Any, int] = {}
+        self.global_ids = [[ids.setdefault(value, len(ids)) for value in var_values] for var_values in values]
+        self.local = [{g: k for k, g in enumerate(var_ids)} for var_ids in self.global_ids]
+        self.n_values = len(ids)
+        self.matching: List[Optional[int]] = [None] * len(values) # variable -> global value id
+
+    def __call__(self, domains: List[int]) -> Optional[List[int]]:
+        n = len(domains)
+        adjacency = [[self.global_ids[i][k] for k in iter_bits(bits)] for i, bits in enumerate(domains)]
+        if n > self.n_values or any(not values for values in adjacency):
+            return None
+
+        # Repair the previous matching
+        matching = [m if m is not None and m in self.local[i] and (domains[i] >> self.local[i][m]) & 1 else None
+                    for i, m in enumerate(self.matching)]
+        owner: Dict[int, int] = {}
+        for i, m in enumerate(matching):
+            if m is not None:
+                if m in owner:
+                    matching[i] = None
+                else:
+                    owner[m] = i
+        for i in range(n):
+            if matching[i] is None and not self._augment(i, adjacency, matching, owner, set()):
+                return None # no matching covers every variable
+        self.matching = matching
+
+        # Residual graph: variable i -> matched value, value -> variables that could take it.
+        # Nodes 0..n-1 are variables, n + g is the value with global id g.
+        graph: Dict[int, List[int]] = {i: [n + matching[i]] for i in range(n)}
+        for i, values in enumerate(adjacency):
+            for g in values:
+                if g != matching[i]:
+                    graph.setdefault(n + g, []).append(i)
+
+        free = [n + g for values in adjacency for g in values if g not in owner]
+        reachable = set(free) # vertices on an alternating path from a free value
+        stack = list(free)
+        while stack:
+            for succ in graph.get(stack.pop(), ()):
+                if succ not in reachable:
+                    reachable.add(succ)
+                    stack.append(succ)
+        component = self._components(graph)
+
+        revised = []
+        for i, values in enumerate(adjacency):
+            bits = 0
+            for g in values:
+                if g == matching[i] or n + g in reachable or component[n + g] == component[i]:
+                    bits |= 1 << self.local[i][g]
+            revised.append(bits)
+        return revised
+
+    def _augment(self, i: int, adjacency: List[List[int]], matching: List[Optional[int]], owner: Dict[int, int], seen: set) -> bool:
+        """
+        Searches an augmenting path from an unmatched variable (depth-first).
+        """
+        for g in adjacency[i]:
+            if g in seen:
+                continue
+            seen.add(g)
+            if g not in owner or self._augment(owner[g], adjacency, matching, owner, seen):
+                matching[i] = g
+                owner[g] = i
+                return True
+        return False
+
+    def _components(self, graph: Dict[int, List[int]]) -> Dict[int, int]:
+        """
+        Computes the strongly connected components of a graph (iterative Tarjan).
+        """
+        index: Dict[int, int] = {}
+        low: Dict[int, int] = {}
+        component: Dict[int, int] = {}
+        stack: List[int] = []
+        on_stack = set()
+        counter = 0
+        for root in graph:
+            if root in index:
+                continue
+            work = [(root, iter(graph.get(root, ())))]
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                node, successors = work[-1]
+                advanced = False
+                for succ in successors:
+                    if succ not in index:
+                        index[succ] = low[succ] = counter
+                        counter += 1
+                        stack.append(succ)
+                        on_stack.add(succ)
+                        work.append((succ, iter(graph.get(succ, ()))))
+                        advanced = True
+                        break
+                    if succ in on_stack:
+                        low[node] = min(low[node], index[succ])
+                if advanced:
+                    continue
+                work.pop()
+                if work:
+                    low[work[-1][0]] = min(low[work[-1][0]], low[node])
+                if low[node] == index[node]: # node is the root of a component
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component[member] = node
+                        if member == node:
+                            break
+        return component
+
+class _LinearSumPropagator:
+    """
+    Bounds consistency for a linear sum.
+
+    The minimum and maximum contribution of each variable are cached per domain bitset,
+    so only variables whose domain changed since the previous call are rescanned.
+    """
+    def __init__(self, values: List[List[Any]], coefficients: List[float], bound: float, op: str):
+        self.terms = [[a * value for value in var_values] for a, var_values in zip(coefficients, values)]
+        self.bound = bound
+        self.op = op
+        self._cache: List[Tuple[int, float, float]] = [(-1, 0, 0)] * len(values) # (bits, min, max) per variable
+
+    def _bounds(self, i: int, bits: int) -> Tuple[float, float]:
+        cached_bits, low, high = self._cache[i]
+        if cached_bits != bits:
+            terms = [self.terms[i][k] for k in iter_bits(bits)]
+            low, high = min(terms), max(terms)
+            self._cache[i] = (bits, low, high)
+        return low, high
+
+    def __call__(self, domains: List[int]) -> Optional[List[int]]:
+        domains = list(domains)
+        if any(bits == 0 for bits in domains):
+            return None
+        changed = True
+        while changed: # iterate to the fixpoint of this constraint
+            changed = False
+            bounds = [self._bounds(i, bits) for i, bits in enumerate(domains)]
+            low, high = sum(b[0] for b in bounds), sum(b[1] for b in bounds)
+            if (self.op in ('==', '<=') and low > self.bound) or (self.op in ('==', '>=') and high < self.bound):
+                return None
+            for i, bits in enumerate(domains):
+                others_low, others_high = low - bounds[i][0], high - bounds[i][1]
+                kept = 0
+                for k in iter_bits(bits):
+                    term = self.terms[i][k]
+                    if self.op in ('==', '<=') and term + others_low > self.bound:
+                        continue
+                    if self.op in ('==', '>=') and term + others_high < self.bound:
+                        continue
+                    kept |= 1 << k
+                if kept == 0:
+                    return None
+                if kept != bits:
+                    domains[i] = kept
+                    changed = True
+        return domains
@@ -0,0 +1,245 @@
+import os
+import json
+import itertools
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+def _hashable(value: Any) -> Hashable:
+    """
+    Converts the JSON lists of a loaded label back to tuples (e.g. grid coordinates).
+    """
+    return tuple(_hashable(item) for item in value) if isinstance(value, list) else value
+
+class CSRGraph:
+    """
+    Directed graph stored in compressed sparse row (CSR) form.
+
+    Nodes are dense integer ids. The successors of node u are `indices[indptr[u]:indptr[u + 1]]`
+    (sorted) with matching `weights`. With int32 `indices` and float32 `weights`, a graph with n
+    nodes and m edges takes about 8 * m bytes for the edges plus 8 * (n + 1) bytes for the int64
+    `indptr`, and successor lookups are zero-copy array views. Arrays can be saved to and
+    memory-mapped from a directory of `.npy` files (labels are stored as JSON, nothing is
+    unpickled on load).
+    """
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, weights: Optional[np.ndarray] = None,
+                 labels: Optional[Sequence[Hashable]] = None):
+        """
+        Initializes a new CSRGraph from its arrays.
+
+        :param indptr: Row pointer array of length num_nodes + 1.
+        :param indices: Target node id of every edge, grouped by source.
+        :param weights: Weight of every edge. Defaults to 1 for every edge.
+        :param labels: Optional label of every node (e.g. 'S', 'G'), for graphs not built from integer ids.
+        """
+        if len(indptr) == 0 or indptr[-1] != len(indices):
+            raise ValueError("indptr must end with the number of edges")
+        if weights is not None and len(weights) != len(indices):
+            raise ValueError("weights must have one entry per edge")
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.labels = list(labels) if labels is not None else None
+        self._ids: Optional[Dict[Hashable, int]] = {label: i for i, label in enumerate(self.labels)} if self.labels is not None else None
+
+    @classmethod
+    def from_edges(cls, edges: Iterable[Sequence[Any]], num_nodes: Optional[int] = None) -> 'CSRGraph':
+        """
+        Builds a graph from an edge list.
+
+        :param edges: Edges (u, v) or (u, v, weight). Integer endpoints are used as ids, other
+                      endpoints (e.g. strings) are labelled with ids in order of appearance.
+        :param num_nodes: Number of nodes, for integer graphs with isolated trailing nodes.
+        :return: The CSR graph.
+        """
+        edges = list(edges)
+        weighted = bool(edges) and len(edges[0]) == 3
+        labels = None
+        if edges and not all(isinstance(e[0], (int, np.integer)) and isinstance(e[1], (int, np.integer)) for e in edges):
+            ids: Dict[Hashable, int] = {}
+            sources = np.array([ids.setdefault(e[0], len(ids)) for e in edges], dtype=np.int64)
+            for e in edges:
+                ids.setdefault(e[1], len(ids))
+            targets = np.array([ids[e[1]] for e in edges], dtype=np.int64)
+            labels = list(ids)
+        else:
+            sources = np.array([e[0] for e in edges], dtype=np.int64)
+            targets = np.array([e[1] for e in edges], dtype=np.int64)
+        weights = np.array([e[2] for e in edges], dtype=np.float32) if weighted else None
+        return cls.from_arrays(sources, targets, weights, num_nodes=len(labels) if labels is not None else num_nodes, labels=labels)
+
+    @classmethod
+    def from_arrays(cls, sources: np.ndarray, targets: np.ndarray, weights: Optional[np.ndarray] = None,
+                    num_nodes: Optional[int] = None, labels: Optional[Sequence[Hashable]] = None) -> 'CSRGraph':
+        """
+        Builds a graph from parallel arrays of edge endpoints.
+
+        :param sources: Source node id of every edge.
+        :param targets: Target node id of every edge.
+        :param weights: Weight of every edge.
+        :param num_nodes: Number of nodes. Defaults to the largest id + 1.
+        :param labels: Optional label of every node.
+        :return: The CSR graph.
+        """
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        if num_nodes is None:
+            num_nodes = int(max(sources.max(initial=-1), targets.max(initial=-1))) + 1
+        order = np.lexsort((targets, sources)) # group by source, sorted targets within a row
+        indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=num_nodes), out=indptr[1:])
+        indices = targets[order].astype(np.int32 if num_nodes < 2**31 else np.int64)
+        weights = np.asarray(weights, dtype=np.float32)[order] if weights is not None else None
+        return cls(indptr, indices, weights, labels)
+
+    @classmethod
+    def from_file(cls, path: str, delimiter: Optional[str] = None, num_nodes: Optional[int] = None,
+                  chunk_size: int = 1_000_000) -> 'CSRGraph':
+        """
+        Builds a graph from a text edge list with lines `u v` or `u v weight` (integer ids).
+
+        The file is parsed `chunk_size` lines at a time, ids as int64 and weights as float32,
+        so large edge lists are never held as text or as a float64 matrix at once.
+
+        :param path: Path of the edge list file. Lines starting with '#' are ignored.
+        :param delimiter: Column delimiter. Defaults to any whitespace.
+        :param num_nodes: Number of nodes. Defaults to the largest id + 1.
+        :param chunk_size: Number of lines parsed at a time.
+        :return: The CSR graph.
+        """
+        sources, targets, weights = [], [], []
+        dtype = None
+        with open(path) as file:
+            while True:
+                chunk = list(itertools.islice(file, chunk_size))
+                if not chunk:
+                    break
+                lines = [line for line in chunk if line.strip() and not line.lstrip().startswith('#')]
+                if not lines: # a chunk of comments only
+                    continue
+                if dtype is None: # the first edge tells whether the graph is weighted
+                    weighted = len(lines[0].split(delimiter)) > 2
+                    dtype = [('u', np.int64), ('v', np.int64)] + ([('w', np.float32)] if weighted else [])
+                chunk = np.loadtxt(lines, dtype=dtype, delimiter=delimiter, usecols=range(len(dtype)), ndmin=1)
+                sources.append(chunk['u'])
+                targets.append(chunk['v'])
+                if weighted:
+                    weights.append(chunk['w'])
+        if dtype is None: # no edges
+            return cls.from_arrays(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), num_nodes=num_nodes)
+        return cls.from_arrays(np.concatenate(sources), np.concatenate(targets),
+                               np.concatenate(weights) if weights else None, num_nodes=num_nodes)
+
+    def save(self, directory: str) -> None:
+        """
+        Saves the arrays as `.npy` files in a directory, and the labels as `labels.json`.
+
+        :param directory: Directory to write to (created if needed).
+        :raises TypeError: If a label cannot be written as JSON (strings, numbers and tuples of them can).
+        """
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, 'indptr.npy'), self.indptr)
+        np.save(os.path.join(directory, 'indices.npy'), self.indices)
+        if self.weights is not None:
+            np.save(os.path.join(directory, 'weights.npy'), self.weights)
+        if self.labels is not None:
+            with open(os.path.join(directory, 'labels.json'), 'w') as file:
+                json.dump([label.item() if isinstance(label, np.generic) else label for label in self.labels], file)
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> 'CSRGraph':
+        """
+        Loads a graph saved with `save`.
+
+        :param directory: Directory containing the `.npy` files.
+        :param mmap: If True, the arrays are memory-mapped read-only instead of read into memory.
+        :return: The CSR graph.
+        """
+        mode = 'r' if mmap else None
+        indptr = np.load(os.path.join(directory, 'indptr.npy'), mmap_mode=mode)
+        indices = np.load(os.path.join(directory, 'indices.npy'), mmap_mode=mode)
+        weights_path = os.path.join(directory, 'weights.npy')
+        weights = np.load(weights_path, mmap_mode=mode) if os.path.exists(weights_path) else None
+        labels_path = os.path.join(directory, 'labels.json')
+        labels = None
+        if os.path.exists(labels_path):
+            with open(labels_path) as file:
+                labels = [_hashable(label) for label in json.load(file)]
+        return cls(indptr, indices, weights, labels)
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.indptr) - 1
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.indices)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Memory used by the arrays, in bytes.
+        """
+        return self.indptr.nbytes + self.indices.nbytes + (self.weights.nbytes if self.weights is not None else 0)
+
+    def id_of(self, label: Hashable) -> int:
+        """
+        Returns the node id of a label (the label itself for integer graphs).
+        """
+        return self._ids[label] if self._ids is not None else int(label)
+
+    def label_of(self, node: int) -> Hashable:
+        """
+        Returns the label of a node id (the id itself for integer graphs).
+        """
+        return self.labels[node] if self.labels is not None else int(node)
+
+    def out_degree(self, node: int) -> int:
+        return int(self.indptr[node + 1] - self.indptr[node])
+
+    def successors(self, node: int) -> np.ndarray:
+        """
+        Returns the successors of a node as a zero-copy view.
+
+        Usable directly as the `successors` callable of GreedyBestFirstSearch and the informed searches.
+
+        :param node: Node id.
+        :return: Array of successor ids.
+        """
+        return self.indices[self.indptr[node]:self.indptr[node + 1]]
+
+    def edges(self, node: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the successors of a node and the weights of the edges to them (zero-copy views).
+
+        :param node: Node id.
+        :return: Tuple (successor ids, edge weights).
+        """
+        start, end = self.indptr[node], self.indptr[node + 1]
+        weights = self.weights[start:end] if self.weights is not None else np.ones(end - start, dtype=np.float32)
+        return self.indices[start:end], weights
+
+    def cost(self, node: int, successor: int) -> float:
+        """
+        Returns the weight of an edge, by binary search in the sorted row of its source.
+
+        Usable directly as the `cost` callable of the informed searches.
+
+        :param node: Source node id.
+        :param successor: Target node id.
+        :return: Weight of the edge (1 for unweighted graphs).
+        """
+        start, end = self.indptr[node], self.indptr[node + 1]
+        k = start + np.searchsorted(self.indices[start:end], successor)
+        if k >= end or self.indices[k] != successor:
+            raise KeyError(f"No edge {node} -> {successor}")
+        return float(self.weights[k]) if self.weights is not None else 1.0
+
+    def labelled_successors(self, label: Hashable) -> List[Hashable]:
+        """
+        Returns the successors of a node by label, for graphs built from labelled edges.
+
+        :param label: Node label.
+        :return: Labels of the successors.
+        """
+        return [self.label_of(node) for node in self.successors(self.id_of(label))]
@@ -0,0 +1,154 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence
+
+class HeuristicCache:
+    """
+    Bounded memoization of a heuristic function.
+
+    The cache is callable like the heuristic it wraps, so it can be passed to any search in
+    `assignment2.algorithms`. Entries are evicted with a least recently used ('lru') or least
+    frequently used ('lfu') policy, both in O(1) per access. Values are stored as floats, so a
+    state gets the same value whether it was computed by `__call__` or by `batch`.
+    """
+    def __init__(self, heuristic: Callable[[Any], float], maxsize: int = 100_000, policy: str = 'lru',
+                 batch_heuristic: Optional[Callable[[Sequence[Any]], Sequence[float]]] = None):
+        """
+        Initializes a new HeuristicCache.
+
+        :param heuristic: Heuristic to memoize.
+        :param maxsize: Maximum number of cached states.
+        :param policy: Eviction policy, 'lru' or 'lfu'.
+        :param batch_heuristic: Optional vectorised heuristic evaluating a list of states at once.
+        """
+        if policy not in ('lru', 'lfu'):
+            raise ValueError(f"Unknown eviction policy: {policy}")
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.heuristic = heuristic
+        self.batch_heuristic = batch_heuristic
+        self.maxsize = maxsize
+        self.policy = policy
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._values: Dict[Hashable, float] = {}
+        self._recency: OrderedDict[Hashable, None] = OrderedDict() # lru order
+        self._frequency: Dict[Hashable, int] = {} # lfu counts
+        self._buckets: Dict[int, OrderedDict[Hashable, None]] = {} # lfu count -> states, oldest first
+        self._min_frequency = 0
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __contains__(self, state: Hashable) -> bool:
+        return state in self._values
+
+    def __call__(self, state: Hashable) -> float:
+        """
+        Returns the heuristic value of a state, computing it on a miss.
+
+        :param state: State to evaluate.
+        :return: Heuristic value.
+        """
+        if state in self._values:
+            self.hits += 1
+            self._touch(state)
+            return self._values[state]
+        self.misses += 1
+        self._insert(state, self.heuristic(state))
+        return self._values[state]
+
+    def batch(self, states: Sequence[Hashable]) -> List[float]:
+        """
+        Returns the heuristic values of several states, evaluating all misses in one call.
+
+        :param states: States to evaluate (e.g. all successors of a node).
+        :return: Heuristic values, in the order of `states`.
+        """
+        values: List[Optional[float]] = [None] * len(states)
+        missing: Dict[Hashable, List[int]] = {}
+        for i, state in enumerate(states):
+            if state in self._values:
+                self.hits += 1
+                self._touch(state)
+                values[i] = self._values[state]
+            else:
+                missing.setdefault(state, []).append(i)
+
+        if missing:
+            self.misses += len(missing)
+            pending = list(missing)
+            computed = self.batch_heuristic(pending) if self.batch_heuristic else [self.heuristic(s) for s in pending]
+            for state, value in zip(pending, computed):
+                self._insert(state, value)
+                for i in missing[state]:
+                    values[i] = self._values[state]
+        return values
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Fraction of lookups answered from the cache.
+        """
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Returns the cache statistics.
+
+        :return: Dictionary with size, hits, misses, evictions and hit rate.
+        """
+        return {'size': len(self), 'hits': self.hits, 'misses': self.misses,
+                'evictions': self.evictions, 'hit_rate': self.hit_rate}
+
+    def clear(self) -> None:
+        """
+        Empties the cache and resets the statistics.
+        """
+        self._values.clear()
+        self._recency.clear()
+        self._frequency.clear()
+        self._buckets.clear()
+        self._min_frequency = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _touch(self, state: Hashable) -> None:
+        if self.policy == 'lru':
+            self._recency.move_to_end(state)
+            return
+        frequency = self._frequency[state]
+        bucket = self._buckets[frequency]
+        del bucket[state]
+        if not bucket:
+            del self._buckets[frequency]
+            if self._min_frequency == frequency:
+                self._min_frequency = frequency + 1
+        self._frequency[state] = frequency + 1
+        self._buckets.setdefault(frequency + 1, OrderedDict())[state] = None
+
+    def _insert(self, state: Hashable, value: float) -> None:
+        if len(self._values) >= self.maxsize:
+            self._evict()
+        self._values[state] = float(value) # one type whichever path computed it
+        if self.policy == 'lru':
+            self._recency[state] = None
+        else:
+            self._frequency[state] = 1
+            self._buckets.setdefault(1, OrderedDict())[state] = None
+            self._min_frequency = 1
+
+    def _evict(self) -> None:
+        if self.policy == 'lru':
+            state, _ = self._recency.popitem(last=False)
+        else:
+            bucket = self._buckets[self._min_frequency]
+            state, _ = bucket.popitem(last=False)
+            if not bucket:
+                del self._buckets[self._min_frequency]
+            del self._frequency[state]
+        del self._values[state]
+        self.evictions += 1
@@ -9,7 +9,7 @@ class Node:
     :param cost: The cost to reach this node from the start.
     :param h: The heuristic value for this node.
     """
-    def __init__(self, state: Any, parent: Optional['Node'] = None, h: float = 0):
+    def __init__(self, state: Any, parent: Optional['Node'] = None, h: float = 0, cost: float = 0):
         """
         Initialize a node.
 
@@ -21,6 +21,7 @@ class Node:
         self.state = state
         self.parent = parent
         self.h = h  # Heuristic value
+        self.cost = cost  # Path cost from the start (g)
 
     def f(self) -> float:
         """
@@ -28,7 +29,7 @@ class Node:
 
         :return: Total estimated cost.
         """
-        return self.h
+        return self.cost + self.h
 
     def __eq__(self, other: 'Node') -> bool:
         """
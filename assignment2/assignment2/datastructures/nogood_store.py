@@ -0,0 +1,72 @@
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, Tuple, Optional
+
+Nogood = FrozenSet[Tuple[str, Any]]
+
+class NogoodStore:
+    """
+    Bounded store of nogoods (partial assignments known to have no solution).
+
+    Each nogood is watched by its deepest variable in the search order, so it is only
+    checked when that variable gets assigned. When the store is full, the least recently
+    used nogood is evicted.
+    """
+    def __init__(self, capacity: int, max_size: Optional[int] = None):
+        """
+        Initializes a new NogoodStore.
+
+        :param capacity: Maximum number of nogoods kept.
+        :param max_size: Maximum number of variables in a nogood, longer ones are not stored.
+        """
+        self.capacity = capacity
+        self.max_size = max_size
+        self._lru: OrderedDict[Nogood, str] = OrderedDict() # nogood -> watching variable
+        self._watches: Dict[str, Dict[Nogood, None]] = {}
+        self.hits = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._lru)
+
+    def clear(self) -> None:
+        """
+        Forgets every nogood, e.g. before a search with different fixed variables.
+        """
+        self._lru.clear()
+        self._watches.clear()
+
+    def add(self, assignment: Dict[str, Any], watch: str) -> None:
+        """
+        Records a nogood.
+
+        :param assignment: Partial assignment `{name: value}` that cannot be extended to a solution.
+        :param watch: Name of the deepest variable of the nogood in the search order.
+        """
+        if self.capacity <= 0 or (self.max_size is not None and len(assignment) > self.max_size):
+            return
+        nogood = frozenset(assignment.items())
+        if nogood in self._lru:
+            self._lru.move_to_end(nogood)
+            return
+
+        if len(self._lru) >= self.capacity: # evict the least recently used nogood
+            evicted, watcher = self._lru.popitem(last=False)
+            del self._watches[watcher][evicted]
+            self.evictions += 1
+        self._lru[nogood] = watch
+        self._watches.setdefault(watch, {})[nogood] = None
+
+    def violated(self, name: str, assignment: Dict[str, Any]) -> Optional[Nogood]:
+        """
+        Finds a nogood watched by a variable that is contained in the current assignment.
+
+        :param name: Name of the variable that was just assigned.
+        :param assignment: Current partial assignment `{name: value}`.
+        :return: The violated nogood, or None.
+        """
+        for nogood in self._watches.get(name, ()):
+            if all(assignment.get(var, None) == value for var, value in nogood):
+                self._lru.move_to_end(nogood)
+                self.hits += 1
+                return nogood
+        return None
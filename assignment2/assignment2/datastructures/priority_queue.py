@@ -0,0 +1,94 @@
+from typing import Any, Dict, List, Tuple, Hashable
+
+class IndexedPriorityQueue:
+    """
+    Binary min-heap keyed by hashable items, supporting decrease-key.
+
+    Each item is stored at most once; a position map gives O(log n) updates of the
+    priority of an item that is already queued.
+    """
+    def __init__(self):
+        """
+        Initializes an empty IndexedPriorityQueue.
+        """
+        self._heap: List[Tuple[Any, int, Hashable]] = [] # (priority, insertion counter, item)
+        self._position: Dict[Hashable, int] = {}
+        self._counter = 0 # ties are popped in insertion order
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self._position
+
+    def priority(self, item: Hashable) -> Any:
+        """
+        Returns the current priority of a queued item.
+
+        :param item: Queued item.
+        :return: Its priority.
+        """
+        return self._heap[self._position[item]][0]
+
+    def push(self, item: Hashable, priority: Any) -> bool:
+        """
+        Inserts an item or lowers its priority if it is already queued.
+
+        :param item: Item to insert.
+        :param priority: Priority of the item, lower is popped first.
+        :return: True if the queue changed, False if the item was queued with a lower or equal priority.
+        """
+        if item in self._position:
+            index = self._position[item]
+            if not priority < self._heap[index][0]:
+                return False
+            self._heap[index] = (priority, self._heap[index][1], item)
+            self._sift_up(index) # decrease-key
+            return True
+
+        self._heap.append((priority, self._counter, item))
+        self._counter += 1
+        self._position[item] = len(self._heap) - 1
+        self._sift_up(len(self._heap) - 1)
+        return True
+
+    def pop(self) -> Tuple[Hashable, Any]:
+        """
+        Removes the item with the lowest priority.
+
+        :return: Tuple (item, priority).
+        """
+        priority, _, item = self._heap[0]
+        last = self._heap.pop()
+        del self._position[item]
+        if self._heap:
+            self._heap[0] = last
+            self._position[last[2]] = 0
+            self._sift_down(0)
+        return item, priority
+
+    def _swap(self, i: int, j: int) -> None:
+        self._heap[i], self._heap[j] = self._heap[j], self._heap[i]
+        self._position[self._heap[i][2]] = i
+        self._position[self._heap[j][2]] = j
+
+    def _sift_up(self, index: int) -> None:
+        while index > 0:
+            parent = (index - 1) // 2
+            if self._heap[index][:2] < self._heap[parent][:2]:
+                self._swap(index, parent)
+                index = parent
+            else:
+                break
+
+    def _sift_down(self, index: int) -> None:
+        size = len(self._heap)
+        while True:
+            smallest = index
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < size and self._heap[child][:2] < self._heap[smallest][:2]:
+                    smallest = child
+            if smallest == index:
+                break
+            self._swap(index, smallest)
+            index = smallest
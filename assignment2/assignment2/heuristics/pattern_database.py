@@ -0,0 +1,192 @@
+from collections import deque
+from typing import Any, Callable, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+class PatternDatabase:
+    """
+    Abstraction heuristic stored as a table of exact abstract goal distances.
+
+    A state is mapped to an abstract state (`abstraction`), which is ranked to a dense index
+    (`rank`) into a NumPy array of distances, so a lookup is O(1). The table is computed once by
+    a backward breadth-first search from the abstract goals and can be saved to disk and
+    memory-mapped by every process that needs it.
+    """
+    def __init__(self, values: np.ndarray, abstraction: Callable[[Any], Any], rank: Callable[[Any], int]):
+        """
+        Initializes a new PatternDatabase from its table.
+
+        :param values: Distance of every ranked abstract state to the abstract goal. The largest value of the dtype marks unreachable states.
+        :param abstraction: Function mapping a concrete state to its abstract state.
+        :param rank: Function mapping an abstract state to its index in `values`.
+        """
+        self.values = values
+        self.abstraction = abstraction
+        self.rank = rank
+        self.unreachable = np.iinfo(values.dtype).max
+
+    @classmethod
+    def build(cls, goals: Iterable[Any], predecessors: Callable[[Any], Iterable[Any]], rank: Callable[[Any], int],
+              size: int, abstraction: Callable[[Any], Any]) -> 'PatternDatabase':
+        """
+        Builds the table by backward breadth-first search over the abstract space (unit move costs).
+
+        :param goals: Abstract goal states.
+        :param predecessors: Function returning the abstract states with a move into a given abstract state.
+        :param rank: Function mapping an abstract state to an index in [0, size).
+        :param size: Number of abstract states.
+        :param abstraction: Function mapping a concrete state to its abstract state.
+        :return: The pattern database.
+        """
+        distances = np.full(size, -1, dtype=np.int64)
+        queue = deque()
+        for goal in goals:
+            distances[rank(goal)] = 0
+            queue.append(goal)
+
+        while queue:
+            state = queue.popleft()
+            distance = distances[rank(state)] + 1
+            for previous in predecessors(state):
+                index = rank(previous)
+                if distances[index] < 0: # first visit is the shortest distance
+                    distances[index] = distance
+                    queue.append(previous)
+
+        # Store in the smallest unsigned dtype that still leaves room for the unreachable marker
+        dtype = next(t for t in (np.uint8, np.uint16, np.uint32, np.uint64) if distances.max(initial=0) < np.iinfo(t).max)
+        values = np.where(distances < 0, np.iinfo(dtype).max, distances).astype(dtype)
+        return cls(values, abstraction, rank)
+
+    def save(self, path: str) -> None:
+        """
+        Saves the table as a `.npy` file.
+
+        :param path: Path of the file.
+        """
+        np.save(path, self.values)
+
+    @classmethod
+    def load(cls, path: str, abstraction: Callable[[Any], Any], rank: Callable[[Any], int], mmap: bool = True) -> 'PatternDatabase':
+        """
+        Loads a table saved with `save`.
+
+        :param path: Path of the `.npy` file.
+        :param abstraction: Function mapping a concrete state to its abstract state.
+        :param rank: Function mapping an abstract state to its index in the table.
+        :param mmap: If True, the table is memory-mapped read-only and shared by all processes using it.
+        :return: The pattern database.
+        """
+        return cls(np.load(path, mmap_mode='r' if mmap else None), abstraction, rank)
+
+    def __call__(self, state: Any) -> float:
+        """
+        Returns the heuristic value of a concrete state.
+
+        :param state: Concrete state.
+        :return: Abstract goal distance, or infinity if the goal is unreachable.
+        """
+        value = self.values[self.rank(self.abstraction(state))]
+        return float('inf') if value == self.unreachable else float(value)
+
+    def batch(self, states: Sequence[Any]) -> np.ndarray:
+        """
+        Returns the heuristic values of several states with one gather, e.g. as a `batch_heuristic`.
+
+        :param states: Concrete states.
+        :return: Array of heuristic values.
+        """
+        indices = np.fromiter((self.rank(self.abstraction(state)) for state in states), dtype=np.int64, count=len(states))
+        values = self.values[indices].astype(np.float64)
+        values[values == self.unreachable] = np.inf
+        return values
+
+class HanoiPatternDatabase(PatternDatabase):
+    """
+    Pattern database for the Towers of Hanoi that only keeps track of a subset of the disks.
+
+    States are tuples of pegs, each peg a list of disks with the smallest on top (index 0), as in
+    the assignment1 Hanoi nodes. Ignoring the other disks relaxes the problem, so the heuristic is
+    admissible, and databases over disjoint subsets of disks can be added together.
+    """
+    def __init__(self, values: np.ndarray, pattern: Sequence[int], pegs: int = 3):
+        """
+        Initializes a new HanoiPatternDatabase from its table.
+
+        :param values: Distance table, indexed by the base-`pegs` number of the pattern disks' pegs.
+        :param pattern: Disks tracked by the database.
+        :param pegs: Number of pegs.
+        """
+        self.pattern = tuple(sorted(pattern))
+        self.pegs = pegs
+        self._weights = [pegs ** i for i in range(len(self.pattern))]
+        super().__init__(values, self.abstract, self.rank_of)
+
+    @classmethod
+    def build(cls, pattern: Sequence[int], pegs: int = 3, goal_peg: Optional[int] = None) -> 'HanoiPatternDatabase':
+        """
+        Builds the database for a subset of disks.
+
+        :param pattern: Disks to track.
+        :param pegs: Number of pegs.
+        :param goal_peg: Peg all disks must reach. Defaults to the last peg.
+        :return: The pattern database.
+        """
+        database = cls(np.zeros(0, dtype=np.uint8), pattern, pegs)
+        goal_peg = pegs - 1 if goal_peg is None else goal_peg
+        goal = (goal_peg,) * len(database.pattern)
+        # Hanoi moves are reversible, so the predecessors are the successors
+        table = PatternDatabase.build([goal], database.moves, database.rank_of, pegs ** len(database.pattern), database.abstract)
+        return cls(table.values, pattern, pegs)
+
+    @classmethod
+    def load(cls, path: str, pattern: Sequence[int], pegs: int = 3, mmap: bool = True) -> 'HanoiPatternDatabase':
+        """
+        Loads a table saved with `save`.
+
+        :param path: Path of the `.npy` file.
+        :param pattern: Disks tracked by the database.
+        :param pegs: Number of pegs.
+        :param mmap: If True, the table is memory-mapped read-only.
+        :return: The pattern database.
+        """
+        return cls(np.load(path, mmap_mode='r' if mmap else None), pattern, pegs)
+
+    def abstract(self, state: Sequence[Sequence[int]]) -> Tuple[int, ...]:
+        """
+        Maps a concrete state to the peg of every pattern disk.
+
+        :param state: Tuple of pegs, each a list of disks.
+        :return: Peg index of each pattern disk, in pattern order.
+        """
+        position = {disk: peg for peg, disks in enumerate(state) for disk in disks}
+        return tuple(position[disk] for disk in self.pattern)
+
+    def rank_of(self, abstract_state: Tuple[int, ...]) -> int:
+        """
+        Ranks an abstract state as a base-`pegs` number.
+
+        :param abstract_state: Peg index of each pattern disk.
+        :return: Index in the table.
+        """
+        return sum(peg * weight for peg, weight in zip(abstract_state, self._weights))
+
+    def moves(self, abstract_state: Tuple[int, ...]) -> List[Tuple[int, ...]]:
+        """
+        Returns the abstract states reachable by moving one pattern disk.
+
+        :param abstract_state: Peg index of each pattern disk (pattern sorted by size).
+        :return: Neighbouring abstract states.
+        """
+        top: List[Optional[int]] = [None] * self.pegs # smallest pattern disk on each peg
+        for i, peg in enumerate(abstract_state):
+            if top[peg] is None:
+                top[peg] = i
+        neighbours = []
+        for peg, i in enumerate(top):
+            if i is None:
+                continue
+            for target in range(self.pegs):
+                if target != peg and (top[target] is None or top[target] > i): # only onto larger disks
+                    neighbours.append(abstract_state[:i] + (target,) + abstract_state[i + 1:])
+        return neighbours
@@ -0,0 +1,82 @@
+# This module is kept byte-identical in assignment1/src/trees/rendering.py and
+# assignment2/assignment2/visualisations/rendering.py (the packages are installed separately),
+# any change must be copied to the twin file.
+
+import os
+import json
+import random
+import hashlib
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional, Tuple
+
+if TYPE_CHECKING:
+    import networkx as nx # networkx is imported when a layout or subgraph is computed
+
+def graph_hash(G: 'nx.Graph', **options: Any) -> str:
+    """
+    Stable hash of the nodes and edges of a graph (and of layout options), used as layout cache key.
+
+    :param G: Graph to hash.
+    :param options: Options of the layout, so different layouts of a graph get different keys.
+    :return: Hexadecimal digest.
+    """
+    content = repr((sorted(map(repr, G.nodes())), sorted(map(repr, G.edges())), sorted(options.items())))
+    return hashlib.sha1(content.encode()).hexdigest()
+
+def cached_layout(G: 'nx.Graph', cache_dir: Optional[str] = None, **options: Any) -> Dict[Any, Tuple[float, float]]:
+    """
+    Spring layout of a graph, loaded from the on-disk cache when it was computed before.
+
+    Layouts are stored as JSON lists of [repr(node), x, y], so reading a cache file never runs code.
+
+    :param G: Graph to lay out.
+    :param cache_dir: Directory where layouts are stored, keyed by graph hash. No cache by default.
+    :param options: Keyword arguments of `nx.spring_layout` (seed defaults to 0).
+    :return: Position of every node.
+    """
+    options.setdefault('seed', 0)
+    path = None
+    if cache_dir is not None:
+        path = os.path.join(cache_dir, f"{graph_hash(G, **options)}.json")
+        if os.path.exists(path):
+            nodes = {repr(node): node for node in G.nodes()}
+            with open(path) as f:
+                pos = {nodes[key]: (x, y) for key, x, y in json.load(f) if key in nodes}
+            if len(pos) == len(nodes):
+                return pos
+
+    import networkx as nx
+    pos = {node: (float(x), float(y)) for node, (x, y) in nx.spring_layout(G, **options).items()}
+    if path is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump([[repr(node), x, y] for node, (x, y) in pos.items()], f)
+    return pos
+
+def neighbourhood(G: 'nx.DiGraph', keep: Iterable[Any], hops: int = 1, max_nodes: Optional[int] = None,
+                  seed: int = 0) -> 'nx.DiGraph':
+    """
+    Subgraph made of some nodes and every node within `hops` edges of them (in either direction).
+
+    :param G: Graph to cut.
+    :param keep: Nodes that are always kept (e.g. the solution path), those not in the graph are ignored.
+    :param hops: Radius of the neighbourhood.
+    :param max_nodes: If given, the other nodes are randomly sampled down to this total.
+    :param seed: Seed of the sampling.
+    :return: The subgraph (a view of G).
+    """
+    undirected = G.to_undirected(as_view=True)
+    keep = [node for node in dict.fromkeys(keep) if node in G]
+    seen, frontier = set(keep), list(keep)
+    for _ in range(hops):
+        reached = []
+        for node in frontier:
+            for n in undirected.neighbors(node):
+                if n not in seen: # a node reached from several parents is expanded once
+                    seen.add(n)
+                    reached.append(n)
+        frontier = reached
+
+    others = sorted(seen.difference(keep), key=repr)
+    if max_nodes is not None and len(keep) + len(others) > max_nodes:
+        others = random.Random(seed).sample(others, max(max_nodes - len(keep), 0))
+    return G.subgraph(keep + others)
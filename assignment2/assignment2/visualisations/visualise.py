@@ -1,29 +1,88 @@
 from assignment2.datastructures.node import Node
+from assignment2.visualisations.rendering import cached_layout, neighbourhood
 
-import matplotlib.pyplot as plt
-import networkx as nx
-from matplotlib.animation import FuncAnimation
-from typing import List
+from typing import TYPE_CHECKING, List, Optional, Dict, Any
+
+if TYPE_CHECKING:
+    import networkx as nx # matplotlib and networkx are imported when a graph is built or drawn
 
 class GraphVisualizer:
-    def __init__(self, graph_edges):
+    def __init__(self, graph_edges, layout_cache_dir: Optional[str] = None):
+        """
+        :param graph_edges: Edges of the graph to draw.
+        :param layout_cache_dir: Directory where computed layouts are stored, keyed by graph hash.
+        """
+        import networkx as nx
         self.G = nx.DiGraph(graph_edges)  # Use DiGraph for directed graph
-        self.pos = nx.spring_layout(self.G)
+        self.layout_cache_dir = layout_cache_dir
+        self._pos = None
+
+    @property
+    def pos(self) -> Dict[Any, Any]:
+        """Layout of the full graph, computed on first use."""
+        if self._pos is None:
+            self._pos = self.layout(self.G)
+        return self._pos
+
+    @pos.setter
+    def pos(self, pos: Dict[Any, Any]):
+        self._pos = pos
+
+    def layout(self, G: 'nx.Graph') -> Dict[Any, Any]:
+        """Spring layout of a graph, loaded from the on-disk cache when it was computed before."""
+        return cached_layout(G, self.layout_cache_dir)
+
+    def neighbourhood(self, states: List[Any], hops: int = 1, max_nodes: Optional[int] = None, seed: int = 0) -> 'nx.DiGraph':
+        """
+        Subgraph made of some states and every node within `hops` edges of them (in either direction).
 
-    def plot_graph(self):
-        nx.draw(self.G, self.pos, with_labels=True, node_color='skyblue', node_size=1500, width=2.0, alpha=0.6, arrows=True)  # arrows=True to show direction
+        :param states: States that are always kept (e.g. the solution path).
+        :param hops: Radius of the neighbourhood.
+        :param max_nodes: If given, the other nodes are randomly sampled down to this total.
+        :param seed: Seed of the sampling.
+        """
+        return neighbourhood(self.G, states, hops, max_nodes, seed)
+
+    def plot_graph(self, G: Optional['nx.DiGraph'] = None, pos: Optional[Dict[Any, Any]] = None):
+        import networkx as nx
+        G = self.G if G is None else G
+        pos = self.pos if pos is None else pos
+        nx.draw(G, pos, with_labels=True, node_color='skyblue', node_size=1500, width=2.0, alpha=0.6, arrows=True)  # arrows=True to show direction
 
 
 class SearchPathVisualizer(GraphVisualizer):
-    def plot_search_path(self, path: List[Node]):
-        """Visualize the graph with the search path."""
-        super().plot_graph()  # Plot the base graph
+    def plot_search_path(self, path: List[Node], hops: Optional[int] = None, max_nodes: Optional[int] = None,
+                         output: Optional[str] = None, format: Optional[str] = None):
+        """
+        Visualize the graph with the search path.
+
+        :param path: Path returned by a search.
+        :param hops: If given, only the path and its `hops`-neighbourhood are drawn instead of the full graph.
+        :param max_nodes: If given, the drawn nodes outside the path are sampled down to this total.
+        :param output: If given, the figure is written to this file (e.g. .svg, .pdf, .png) instead of being shown.
+        :param format: File format, deduced from the extension of `output` by default.
+        """
+        import matplotlib.pyplot as plt
+        import networkx as nx
+
+        states = [node.state for node in path]
+        if hops is None and max_nodes is None:
+            G, pos = self.G, self.pos
+        else:
+            G = self.neighbourhood(states, hops or 0, max_nodes)
+            pos = self.layout(G)
+
+        super().plot_graph(G, pos)  # Plot the base graph
 
         # Highlight the path edges in red
         path_edges = [(path[i].state, path[i+1].state) for i in range(len(path)-1)]
-        nx.draw_networkx_edges(self.G, self.pos, edgelist=path_edges, edge_color='r', node_size=1500, width=3, arrows=True) 
+        nx.draw_networkx_edges(G, pos, edgelist=path_edges, edge_color='r', node_size=1500, width=3, arrows=True)
 
-        nx.draw_networkx_nodes(self.G, self.pos, nodelist='S', node_color='red', node_size=1500, alpha=0.6)
-        nx.draw_networkx_nodes(self.G, self.pos, nodelist='G', node_color='green', node_size=1500, alpha=0.6)
+        nx.draw_networkx_nodes(G, pos, nodelist=states[:1], node_color='red', node_size=1500, alpha=0.6)
+        nx.draw_networkx_nodes(G, pos, nodelist=states[-1:], node_color='green', node_size=1500, alpha=0.6)
 
-        plt.show()
+        if output is None:
+            plt.show()
+        else:
+            plt.savefig(output, format=format)
+            plt.close()
@@ -0,0 +1,56 @@
+import itertools
+import random
+from typing import Any, Dict, FrozenSet, List, Set, Tuple
+
+from assignment2.datastructures.variable import Variable
+from assignment2.datastructures.constraint import HouseConstraint
+from assignment2.datastructures.constraint_library import BinaryConstraint
+from assignment2.datastructures.csp import CSP
+
+Solution = FrozenSet[Tuple[str, Any]]
+
+def house_problem() -> CSP:
+    """
+    The house problem of the assignment notebook.
+    """
+    C = Variable(name='C', domain=[1, 2, 3, 4])
+    F = Variable(name='F', domain=[2, 3])
+    P = Variable(name='P', domain=[2, 3])
+    return CSP(variables=[C, F, P], constraints=[HouseConstraint([C, F, P])])
+
+def random_binary_csp(n_variables: int, domain_size: int, density: float, tightness: float, seed: int) -> CSP:
+    """
+    Random binary CSP: each pair of variables is constrained with probability `density`, and a
+    constraint forbids each pair of values with probability `tightness`.
+    """
+    rng = random.Random(seed)
+    variables = [Variable(f"x{i}", list(range(domain_size))) for i in range(n_variables)]
+    constraints = []
+    for x, y in itertools.combinations(variables, 2):
+        if rng.random() < density:
+            allowed = {(a, b) for a in x.domain for b in y.domain if rng.random() >= tightness}
+            constraints.append(BinaryConstraint(x, y, lambda a, b, allowed=allowed: (a, b) in allowed))
+    return CSP(variables, constraints)
+
+def brute_force(csp: CSP) -> Set[Solution]:
+    """
+    Every solution of a CSP, by checking every complete assignment.
+    """
+    free = [var for var in csp.variables if not var.is_assigned()]
+    solutions = set()
+    try:
+        for values in itertools.product(*(var.domain for var in free)):
+            for var, value in zip(free, values):
+                var.assigned_value = value
+            if csp.is_consistent():
+                solutions.add(frozenset((var.name, var.assigned_value) for var in csp.variables))
+    finally:
+        for var in free:
+            var.assigned_value = None
+    return solutions
+
+def as_set(solutions: List[Dict[str, Any]]) -> Set[Solution]:
+    """
+    Solutions returned by a solver, in the form returned by `brute_force`.
+    """
+    return {frozenset(solution.items()) for solution in solutions}
@@ -0,0 +1,71 @@
+import pytest
+
+from assignment2.algorithms.backtracking import BacktrackingSolver
+from assignment2.datastructures.nogood_store import NogoodStore
+from tests.problems import house_problem, random_binary_csp, brute_force, as_set
+
+SETTINGS = [{'backjumping': True}, {'nogood_capacity': 100}, {'backjumping': True, 'nogood_capacity': 100},
+            {'backjumping': True, 'nogood_capacity': 5, 'max_nogood_size': 2}]
+
+@pytest.mark.parametrize('settings', SETTINGS)
+def test_house_problem_matches_backtracking(settings):
+    assert as_set(BacktrackingSolver(house_problem(), **settings).solve()) == as_set(BacktrackingSolver(house_problem()).solve())
+
+@pytest.mark.parametrize('seed', range(6))
+@pytest.mark.parametrize('tightness', [0.3, 0.6])
+@pytest.mark.parametrize('settings', SETTINGS)
+def test_random_problems_match_brute_force(seed, tightness, settings):
+    csp = random_binary_csp(7, 4, density=0.5, tightness=tightness, seed=seed)
+    expected = brute_force(csp)
+    solutions = BacktrackingSolver(csp, **settings).solve()
+    assert len(solutions) == len(expected)
+    assert as_set(solutions) == expected
+    assert all(not var.is_assigned() for var in csp.variables)
+
+    first = BacktrackingSolver(csp, **settings).solve(collect_all=False)
+    assert len(first) == min(len(expected), 1)
+    assert as_set(first) <= expected
+
+def test_nogoods_are_learned_and_used():
+    solver = BacktrackingSolver(random_binary_csp(7, 4, density=0.5, tightness=0.6, seed=0), nogood_capacity=100)
+    solver.solve()
+    assert len(solver.nogoods) > 0 and solver.nogoods.hits > 0
+
+def test_preassigned_variables_stay_fixed():
+    csp = random_binary_csp(7, 4, density=0.5, tightness=0.3, seed=2)
+    csp.get_variable('x3').assigned_value = 1
+    expected = {solution for solution in brute_force(csp) if ('x3', 1) in solution}
+    assert as_set(BacktrackingSolver(csp, backjumping=True, nogood_capacity=100).solve()) == expected
+    assert csp.get_variable('x3').assigned_value == 1
+
+def test_nogood_store_watches_deepest_variable():
+    store = NogoodStore(capacity=10)
+    store.add({'a': 1, 'b': 2}, watch='b')
+    assert store.violated('a', {'a': 1, 'b': 2}) is None # only checked when its watch is assigned
+    assert store.violated('b', {'a': 1, 'b': 3}) is None
+    assert store.violated('b', {'a': 1, 'b': 2, 'c': 0}) == frozenset({('a', 1), ('b', 2)})
+    assert store.hits == 1
+
+def test_nogood_store_limits():
+    store = NogoodStore(capacity=2, max_size=2)
+    store.add({'a': 1, 'b': 2, 'c': 3}, watch='c') # too long
+    assert len(store) == 0
+    store.add({'a': 1}, watch='a')
+    store.add({'b': 1}, watch='b')
+    store.violated('a', {'a': 1}) # a is now the most recently used
+    store.add({'c': 1}, watch='c')
+    assert len(store) == 2 and store.evictions == 1
+    assert store.violated('b', {'b': 1}) is None
+    assert store.violated('a', {'a': 1}) is not None
+
+@pytest.mark.parametrize('seed', range(3))
+@pytest.mark.parametrize('name', ['x0', 'x3', 'x6'])
+def test_nogoods_do_not_leak_between_solves(seed, name):
+    csp = random_binary_csp(7, 4, density=0.5, tightness=0.3, seed=seed)
+    solver = BacktrackingSolver(csp, backjumping=True, nogood_capacity=100)
+    for value in range(4): # same solver, different fixed values
+        csp.get_variable(name).assigned_value = value
+        expected = {solution for solution in brute_force(csp) if (name, value) in solution}
+        found = len(solver.solutions)
+        solver.solve()
+        assert as_set(solver.solutions[found:]) == expected
@@ -0,0 +1,56 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from assignment2.algorithms.backtracking import BacktrackingSolver
+from assignment2.algorithms.compiled_backtracking import CompiledBacktrackingSolver
+from assignment2.datastructures.compiled_csp import CompiledCSP, bits_to_mask, mask_to_bits, iter_bits
+from tests.problems import house_problem, random_binary_csp, brute_force, as_set
+
+def test_bitset_conversions():
+    mask = np.array([True, False, True, True, False, False, False, False, True])
+    bits = mask_to_bits(mask)
+    assert bits == 0b100001101
+    assert np.array_equal(bits_to_mask(bits, len(mask)), mask)
+    assert list(iter_bits(bits)) == [0, 2, 3, 8]
+
+def test_house_problem_matches_backtracking():
+    expected = as_set(BacktrackingSolver(house_problem()).solve())
+    assert expected == brute_force(house_problem())
+    assert as_set(CompiledBacktrackingSolver(house_problem()).solve()) == expected
+
+@pytest.mark.parametrize('seed', range(8))
+@pytest.mark.parametrize('tightness', [0.3, 0.6]) # 0.6 gives a few unsatisfiable problems
+@pytest.mark.parametrize('ordering', [{}, {'variable_ordering': 'mrv'},
+                                      {'variable_ordering': 'mrv', 'value_ordering': 'random', 'seed': 3}])
+def test_random_problems_match_brute_force(seed, tightness, ordering):
+    csp = random_binary_csp(7, 4, density=0.5, tightness=tightness, seed=seed)
+    expected = brute_force(csp)
+    solver = CompiledBacktrackingSolver(csp, **ordering)
+    solutions = solver.solve()
+    assert len(solutions) == len(expected)
+    assert as_set(solutions) == expected
+    assert CompiledBacktrackingSolver(csp, **ordering).count() == len(expected)
+
+def test_first_solution_only():
+    csp = random_binary_csp(7, 4, density=0.5, tightness=0.3, seed=1)
+    first = CompiledBacktrackingSolver(csp).solve(collect_all=False)
+    assert len(first) == 1
+    assert as_set(first) <= brute_force(csp)
+
+def test_compilation_keeps_assignment():
+    csp = house_problem()
+    csp.get_variable('C').assigned_value = 4
+    CompiledCSP(csp)
+    assert [var.assigned_value for var in csp.variables] == [4, None, None]
+
+def test_table_size_limit():
+    with pytest.raises(ValueError):
+        CompiledCSP(house_problem(), max_table_size=10)
+
+def test_pickle_drops_source_problem():
+    compiled = CompiledCSP(random_binary_csp(5, 3, density=0.6, tightness=0.3, seed=0))
+    copy = pickle.loads(pickle.dumps(compiled))
+    assert copy.csp is None
+    assert CompiledBacktrackingSolver(copy).count() == CompiledBacktrackingSolver(compiled).count()
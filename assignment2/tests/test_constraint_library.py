@@ -0,0 +1,128 @@
+import itertools
+import random
+
+import pytest
+
+from assignment2.algorithms.compiled_backtracking import CompiledBacktrackingSolver
+from assignment2.datastructures.variable import Variable
+from assignment2.datastructures.csp import CSP
+from assignment2.datastructures.constraint_library import (NotEqualConstraint, TableConstraint, AllDifferentConstraint,
+                                                           LinearSumConstraint)
+from tests.problems import brute_force, as_set
+
+def _supported(values, domains, allowed):
+    """
+    Generalised arc consistent domains by enumeration: bit k of variable i is kept if some allowed tuple uses it.
+    """
+    choices = [[k for k in range(len(var_values)) if bits >> k & 1] for var_values, bits in zip(values, domains)]
+    revised = [0] * len(values)
+    for index in itertools.product(*choices):
+        if allowed(tuple(var_values[k] for var_values, k in zip(values, index))):
+            for i, k in enumerate(index):
+                revised[i] |= 1 << k
+    return None if 0 in revised else revised
+
+def _random_domains(rng, values):
+    return [rng.randrange(1, 1 << len(var_values)) for var_values in values]
+
+def test_not_equal_is_arc_consistent():
+    values = [[1, 2, 3], [2, 3, 4]]
+    propagator = NotEqualConstraint(Variable('x', values[0]), Variable('y', values[1])).propagator(values)
+    rng = random.Random(0)
+    for _ in range(200):
+        domains = _random_domains(rng, values)
+        assert propagator(domains) == _supported(values, domains, lambda t: t[0] != t[1])
+
+def test_table_is_arc_consistent():
+    rng = random.Random(1)
+    values = [[0, 1, 2], [0, 1, 2, 3], ['a', 'b']]
+    tuples = [t for t in itertools.product(*values) if rng.random() < 0.3]
+    propagator = TableConstraint([Variable(f"v{i}", v) for i, v in enumerate(values)], tuples).propagator(values)
+    for _ in range(200):
+        domains = _random_domains(rng, values)
+        assert propagator(domains) == _supported(values, domains, set(tuples).__contains__)
+
+def test_table_reductions_are_undone_on_backtrack():
+    rng = random.Random(4)
+    values = [[0, 1, 2, 3], [0, 1, 2], [0, 1, 2, 3, 4], [0, 1]]
+    tuples = [t for t in itertools.product(*values) if rng.random() < 0.4]
+    propagator = TableConstraint([Variable(f"v{i}", v) for i, v in enumerate(values)], tuples).propagator(values)
+    allowed = set(tuples).__contains__
+    path = [[(1 << len(v)) - 1 for v in values]] # domains along a depth-first search
+    for _ in range(500):
+        if len(path) > 1 and rng.random() < 0.4:
+            path.pop() # backtrack
+        else:
+            domains = list(path[-1])
+            i = rng.randrange(len(values))
+            domains[i] &= ~(1 << rng.choice([k for k in range(len(values[i])) if domains[i] >> k & 1]))
+            if 0 in domains:
+                continue
+            path.append(domains)
+        assert propagator(path[-1]) == _supported(values, path[-1], allowed)
+
+def test_table_only_rechecks_changed_domains(monkeypatch):
+    from assignment2.datastructures import constraint_library
+    values = [[0, 1, 2], [0, 1, 2], [0, 1, 2]]
+    tuples = [t for t in itertools.product(*values) if sum(t) % 2 == 0]
+    propagator = TableConstraint([Variable(f"v{i}", v) for i, v in enumerate(values)], tuples).propagator(values)
+    checked = []
+    bits_to_mask = constraint_library.bits_to_mask
+    monkeypatch.setattr(constraint_library, 'bits_to_mask', lambda bits, size: checked.append(bits) or bits_to_mask(bits, size))
+    propagator([0b111, 0b011, 0b111])
+    assert checked == [0b011]
+    propagator([0b111, 0b011, 0b110])
+    assert checked == [0b011, 0b110]
+    propagator([0b111, 0b011, 0b110]) # nothing changed
+    assert len(checked) == 2
+
+def test_all_different_is_arc_consistent():
+    rng = random.Random(2)
+    values = [[1, 2, 3], [1, 2], [2, 3, 4], [1, 3, 4, 5], [4, 5]]
+    propagator = AllDifferentConstraint([Variable(f"v{i}", v) for i, v in enumerate(values)]).propagator(values)
+    for _ in range(300): # the same propagator is reused, so its matching is repaired between calls
+        domains = _random_domains(rng, values)
+        assert propagator(domains) == _supported(values, domains, lambda t: len(set(t)) == len(t))
+
+@pytest.mark.parametrize('op', ['==', '<=', '>='])
+def test_linear_sum_is_sound(op):
+    rng = random.Random(3)
+    values = [[0, 1, 2, 3], [1, 2, 5], [0, 4]]
+    coefficients = [2, -1, 1]
+    constraint = LinearSumConstraint([Variable(f"v{i}", v) for i, v in enumerate(values)], 4, op, coefficients)
+    propagator = constraint.propagator(values)
+    check = LinearSumConstraint.OPERATORS[op]
+    for _ in range(300):
+        domains = _random_domains(rng, values)
+        revised = propagator(domains)
+        exact = _supported(values, domains, lambda t: check(sum(a * v for a, v in zip(coefficients, t)), 4))
+        if exact is None: # bounds consistency may not detect every wipe-out
+            continue
+        assert revised is not None
+        assert all(r & e == e and r & ~d == 0 for r, e, d in zip(revised, exact, domains)) # keeps every support
+
+def _puzzle(seed):
+    rng = random.Random(seed)
+    variables = [Variable(f"v{i}", list(range(1, 6))) for i in range(6)]
+    constraints = [AllDifferentConstraint(variables[:4]),
+                   LinearSumConstraint(variables[2:5], rng.randint(6, 12), rng.choice(['==', '<=', '>='])),
+                   NotEqualConstraint(variables[4], variables[5]),
+                   TableConstraint(variables[0:2], [t for t in itertools.product(range(1, 6), repeat=2) if rng.random() < 0.5])]
+    return CSP(variables, constraints)
+
+@pytest.mark.parametrize('seed', range(8))
+def test_mixed_problems_match_brute_force(seed):
+    expected = brute_force(_puzzle(seed))
+    assert as_set(CompiledBacktrackingSolver(_puzzle(seed)).solve()) == expected
+    assert CompiledBacktrackingSolver(_puzzle(seed), variable_ordering='mrv').count() == len(expected)
+
+def test_partial_assignments():
+    x, y, z = (Variable(name, [1, 2, 3]) for name in 'xyz')
+    table = TableConstraint([x, y], [(1, 2), (2, 3)])
+    total = LinearSumConstraint([x, y, z], 8, '>=')
+    x.assigned_value = 3
+    assert not table.is_satisfied() # no tuple starts with 3
+    assert total.is_satisfied() # y and z can still reach the bound
+    y.assigned_value = 1
+    assert not total.is_satisfied()
+    assert AllDifferentConstraint([x, y, z]).is_satisfied()
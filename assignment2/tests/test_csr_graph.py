@@ -0,0 +1,78 @@
+import random
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from assignment2.algorithms.informed_search import AStarSearch
+from assignment2.datastructures.csr_graph import CSRGraph
+from assignment2.datastructures.node import Node
+
+def random_edges(n: int, m: int, seed: int) -> list:
+    rng = random.Random(seed)
+    return list({(rng.randrange(n), rng.randrange(n)): rng.randint(1, 9) for _ in range(m)}.items())
+
+def _assert_same_graph(graph: CSRGraph, G: nx.DiGraph):
+    for u in range(graph.num_nodes):
+        successors, weights = graph.edges(u)
+        assert successors.tolist() == sorted(G.successors(u))
+        assert weights.tolist() == [G[u][v]['weight'] for v in successors.tolist()]
+        assert all(graph.cost(u, v) == G[u][v]['weight'] for v in successors.tolist())
+
+def test_matches_networkx():
+    edges = random_edges(50, 300, 0)
+    graph = CSRGraph.from_edges([(u, v, w) for (u, v), w in edges], num_nodes=55)
+    G = nx.DiGraph()
+    G.add_nodes_from(range(55))
+    G.add_weighted_edges_from((u, v, w) for (u, v), w in edges)
+    assert (graph.num_nodes, graph.num_edges) == (55, G.number_of_edges())
+    _assert_same_graph(graph, G)
+    with pytest.raises(KeyError):
+        graph.cost(54, 0)
+
+def test_memory_matches_documented_size():
+    edges = random_edges(50, 300, 0)
+    graph = CSRGraph.from_edges([(u, v, w) for (u, v), w in edges], num_nodes=55)
+    assert graph.nbytes == 8 * graph.num_edges + 8 * (graph.num_nodes + 1)
+
+def test_labelled_graph():
+    graph = CSRGraph.from_edges([('S', 'A', 3), ('S', 'B', 1), ('A', 'G', 5), ('B', 'A', 1)])
+    assert graph.labelled_successors('S') == ['A', 'B']
+    assert graph.cost(graph.id_of('B'), graph.id_of('A')) == 1
+    path = AStarSearch(graph.successors, lambda s: 0, cost=graph.cost).execute(Node(graph.id_of('S')), graph.id_of('G'))
+    assert [graph.label_of(node.state) for node in path] == ['S', 'B', 'A', 'G']
+
+@pytest.mark.parametrize('mmap', [True, False])
+def test_save_load_round_trip(tmp_path, mmap):
+    graph = CSRGraph.from_edges([((0, 0), (0, 1), 1.5), ((0, 1), (1, 1), 2.0), ('x', (0, 0), 1.0)])
+    graph.save(tmp_path / 'graph')
+    loaded = CSRGraph.load(tmp_path / 'graph', mmap=mmap)
+    assert isinstance(loaded.indices, np.memmap) == mmap
+    assert loaded.labels == graph.labels # tuples come back as tuples
+    assert loaded.labelled_successors((0, 0)) == [(0, 1)]
+    for name in ('indptr', 'indices', 'weights'):
+        assert np.array_equal(getattr(loaded, name), getattr(graph, name))
+
+@pytest.mark.parametrize('weighted', [True, False])
+def test_from_file_matches_from_edges(tmp_path, weighted):
+    edges = random_edges(40, 200, 1)
+    path = tmp_path / 'edges.txt'
+    with open(path, 'w') as file:
+        file.write('# comment\n\n')
+        for i, ((u, v), w) in enumerate(edges):
+            file.write(f"{u} {v} {w}\n" if weighted else f"{u} {v}\n")
+            if i % 17 == 0:
+                file.write('# another comment\n')
+    expected = CSRGraph.from_edges([(u, v, w) if weighted else (u, v) for (u, v), w in edges])
+    loaded = CSRGraph.from_file(str(path), chunk_size=7)
+    for name in ('indptr', 'indices'):
+        assert np.array_equal(getattr(loaded, name), getattr(expected, name))
+    assert (loaded.weights is None) == (not weighted)
+    if weighted:
+        assert np.array_equal(loaded.weights, expected.weights)
+
+def test_from_file_without_edges(tmp_path):
+    path = tmp_path / 'empty.txt'
+    path.write_text('# nothing\n')
+    graph = CSRGraph.from_file(str(path), num_nodes=3)
+    assert (graph.num_nodes, graph.num_edges) == (3, 0)
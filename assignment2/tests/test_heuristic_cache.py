@@ -0,0 +1,80 @@
+import random
+from collections import Counter, OrderedDict
+
+import numpy as np
+import pytest
+
+from assignment2.algorithms.greedy_search import GreedyBestFirstSearch
+from assignment2.datastructures.heuristic_cache import HeuristicCache
+from assignment2.datastructures.node import Node
+
+def _heuristic(state):
+    return np.int64(state * 7 % 13) # non-float values are stored as floats
+
+def test_lru_evicts_least_recently_used():
+    rng = random.Random(0)
+    cache, reference = HeuristicCache(_heuristic, maxsize=10), OrderedDict()
+    for _ in range(2000):
+        state = rng.randrange(30)
+        assert cache(state) == float(_heuristic(state))
+        reference[state] = None
+        reference.move_to_end(state)
+        if len(reference) > 10:
+            reference.popitem(last=False)
+        assert list(cache._recency) == list(reference)
+    assert cache.hits + cache.misses == 2000
+    assert cache.evictions == cache.misses - len(cache)
+
+def test_lfu_evicts_least_frequently_used():
+    rng = random.Random(1)
+    cache, counts, arrival = HeuristicCache(_heuristic, maxsize=10, policy='lfu'), Counter(), {}
+    for step in range(2000):
+        state = rng.choice(range(30)) if rng.random() < 0.5 else rng.randrange(5) # a few hot states
+        if state not in counts and len(counts) == 10: # evict the least used, then the oldest at that count
+            victim = min(counts, key=lambda s: (counts[s], arrival[s]))
+            del counts[victim]
+        counts[state] += 1
+        arrival[state] = step
+        cache(state)
+        assert set(cache._values) == set(counts)
+        assert cache._frequency == dict(counts)
+
+def test_batch_matches_single_calls():
+    calls = []
+    def batch(states):
+        calls.append(list(states))
+        return [_heuristic(state) for state in states]
+    cache = HeuristicCache(_heuristic, maxsize=100, batch_heuristic=batch)
+    assert cache(3) == _heuristic(3)
+    values = cache.batch([1, 2, 3, 2, 4])
+    assert values == [float(_heuristic(s)) for s in [1, 2, 3, 2, 4]]
+    assert calls == [[1, 2, 4]] # misses evaluated once, in one call
+    assert (cache.hits, cache.misses) == (1, 4)
+    assert all(type(value) is float for value in values + [cache(3)])
+
+def test_clear_resets_everything():
+    cache = HeuristicCache(_heuristic, maxsize=3, policy='lfu')
+    for state in [1, 1, 2, 3, 4, 5]:
+        cache(state)
+    cache.clear()
+    assert len(cache) == 0 and cache.stats() == {'size': 0, 'hits': 0, 'misses': 0, 'evictions': 0, 'hit_rate': 0.0}
+    for state in [6, 7, 8, 9]:
+        cache(state)
+    assert len(cache) == 3 and 6 not in cache
+
+def test_invalid_settings():
+    with pytest.raises(ValueError):
+        HeuristicCache(_heuristic, policy='fifo')
+    with pytest.raises(ValueError):
+        HeuristicCache(_heuristic, maxsize=0)
+
+GRAPH = {'S': ['F', 'A'], 'F': ['H', 'G', 'A'], 'A': ['C', 'F'], 'C': ['D', 'G'], 'D': ['G'], 'G': [], 'H': []}
+HEURISTIC = {'S': 10, 'A': 5, 'C': 4, 'D': 3, 'F': 4, 'G': 0, 'H': 2}
+
+@pytest.mark.parametrize('settings', [{'cache_size': 2}, {'cache_size': 100, 'cache_policy': 'lfu'},
+                                      {'batch_heuristic': lambda states: [HEURISTIC[s] for s in states]}])
+def test_greedy_search_path_is_unchanged(settings):
+    expected = GreedyBestFirstSearch(GRAPH.get, HEURISTIC.get).execute(Node('S'), 'G')
+    search = GreedyBestFirstSearch(GRAPH.get, HEURISTIC.get, **settings)
+    assert [n.state for n in search.execute(Node('S'), 'G')] == [n.state for n in expected]
+    assert isinstance(search.heuristic, HeuristicCache)
@@ -0,0 +1,98 @@
+import random
+
+import networkx as nx
+import pytest
+
+from assignment2.algorithms.informed_search import AStarSearch, WeightedAStarSearch, BeamSearch
+from assignment2.datastructures.node import Node
+from assignment2.datastructures.priority_queue import IndexedPriorityQueue
+
+def random_graph(n: int, p: float, seed: int) -> nx.DiGraph:
+    rng = random.Random(seed)
+    G = nx.gnp_random_graph(n, p, seed=seed, directed=True)
+    for u, v in G.edges():
+        G[u][v]['weight'] = rng.randint(1, 10)
+    return G
+
+def _search(algorithm, G, **kwargs):
+    distance = nx.single_source_dijkstra_path_length(G.reverse(copy=False), len(G) - 1, weight='weight') # to the goal
+    heuristics = {'zero': lambda s: 0, 'half': lambda s: 0.5 * distance.get(s, 0), 'exact': lambda s: distance.get(s, 0)}
+    return {name: algorithm(lambda s: list(G.successors(s)), h, cost=lambda u, v: G[u][v]['weight'], **kwargs)
+            for name, h in heuristics.items()}
+
+def _cost(G, path):
+    assert all(G.has_edge(u.state, v.state) for u, v in zip(path, path[1:]))
+    return sum(G[u.state][v.state]['weight'] for u, v in zip(path, path[1:]))
+
+@pytest.mark.parametrize('seed', range(10))
+def test_astar_finds_shortest_paths(seed):
+    G = random_graph(40, 0.08, seed)
+    goal = len(G) - 1
+    expected = nx.shortest_path_length(G, 0, goal, weight='weight') if nx.has_path(G, 0, goal) else None
+    for name, search in _search(AStarSearch, G).items():
+        path = search.execute(Node(0), goal)
+        if expected is None:
+            assert path is None
+            continue
+        assert path[0].state == 0 and path[-1].state == goal
+        assert _cost(G, path) == expected == path[-1].cost
+        assert search.evaluations <= len(G) # one heuristic call per generated state
+
+@pytest.mark.parametrize('seed', range(10))
+def test_weighted_astar_is_bounded(seed):
+    G = random_graph(40, 0.08, seed)
+    goal = len(G) - 1
+    if not nx.has_path(G, 0, goal):
+        return
+    expected = nx.shortest_path_length(G, 0, goal, weight='weight')
+    for search in _search(WeightedAStarSearch, G, weight=2.0).values():
+        assert _cost(G, search.execute(Node(0), goal)) <= 2.0 * expected
+
+def test_weighted_astar_rejects_small_weights():
+    with pytest.raises(ValueError):
+        WeightedAStarSearch(lambda s: [], lambda s: 0, weight=0.5)
+
+def test_astar_expands_fewer_states_with_better_heuristic():
+    G = random_graph(60, 0.06, 1)
+    searches = _search(AStarSearch, G)
+    for search in searches.values():
+        search.execute(Node(0), len(G) - 1)
+    assert searches['exact'].expanded <= searches['half'].expanded <= searches['zero'].expanded
+
+@pytest.mark.parametrize('seed', range(10))
+def test_wide_beam_reaches_every_reachable_goal(seed):
+    G = random_graph(40, 0.08, seed)
+    goal = len(G) - 1
+    path = BeamSearch(lambda s: list(G.successors(s)), lambda s: 0, beam_width=len(G)).execute(Node(0), goal)
+    assert (path is not None) == nx.has_path(G, 0, goal)
+    if path is not None:
+        assert len(path) - 1 == nx.shortest_path_length(G, 0, goal) # a full beam is breadth-first
+        _cost(G, path)
+
+def test_beam_revisits_pruned_states():
+    graph = {'S': ['A', 'B'], 'A': ['B'], 'B': ['G'], 'G': []}
+    h = {'S': 3, 'A': 1, 'B': 5, 'G': 0}
+    search = BeamSearch(graph.get, h.get, beam_width=1)
+    path = search.execute(Node('S'), 'G')
+    assert [node.state for node in path] == ['S', 'A', 'B', 'G'] # B was pruned from the first layer
+    assert search.evaluations == 4
+
+def test_priority_queue_matches_reference():
+    rng = random.Random(0)
+    queue, reference, order = IndexedPriorityQueue(), {}, {}
+    for step in range(2000):
+        if reference and rng.random() < 0.3:
+            item, priority = queue.pop()
+            best = min(reference.items(), key=lambda kv: (kv[1], order[kv[0]]))
+            assert (item, priority) == best
+            del reference[item]
+        else:
+            item, priority = rng.randrange(100), rng.randrange(50)
+            changed = queue.push(item, priority)
+            assert changed == (item not in reference or priority < reference[item])
+            if item not in reference:
+                order[item] = step
+            if changed:
+                reference[item] = priority
+        assert len(queue) == len(reference)
+        assert all(item in queue and queue.priority(item) == priority for item, priority in reference.items())
@@ -0,0 +1,71 @@
+import random
+
+import pytest
+
+from assignment2.algorithms.min_conflicts import MinConflictsSolver
+from assignment2.datastructures.variable import Variable
+from assignment2.datastructures.csp import CSP
+from assignment2.datastructures.constraint_library import BinaryConstraint
+from tests.problems import random_binary_csp, brute_force, as_set
+
+def queens(n: int) -> CSP:
+    rows = [Variable(f"q{i}", list(range(n))) for i in range(n)]
+    constraints = [BinaryConstraint(rows[i], rows[j], lambda a, b, d=j - i: a != b and abs(a - b) != d)
+                   for i in range(n) for j in range(i + 1, n)]
+    return CSP(rows, constraints)
+
+def _direct_table(solver: MinConflictsSolver) -> dict:
+    """
+    Conflict table recomputed from scratch: violated constraints of every free variable for every value.
+    """
+    table = {}
+    for var in solver._free:
+        current, row = var.assigned_value, []
+        for value in var.domain:
+            var.assigned_value = value
+            row.append(sum(not solver.csp.constraints[cid].is_satisfied() for cid in solver._constraints_of[var]))
+        var.assigned_value = current
+        table[var] = row
+    return table
+
+@pytest.mark.parametrize('seed', range(5))
+def test_solutions_are_valid(seed):
+    csp = random_binary_csp(7, 4, density=0.5, tightness=0.3, seed=seed)
+    solutions = MinConflictsSolver(csp, seed=seed).solve()
+    assert len(solutions) == 1
+    assert as_set(solutions) <= brute_force(csp)
+    assert all(not var.is_assigned() for var in csp.variables)
+
+def test_queens():
+    csp = queens(20)
+    solution = MinConflictsSolver(csp, seed=0).solve()[0]
+    for var in csp.variables:
+        var.assigned_value = solution[var.name]
+    assert csp.is_consistent()
+
+def test_unsatisfiable_problem_gives_up():
+    csp = random_binary_csp(7, 4, density=0.5, tightness=0.6, seed=0)
+    solver = MinConflictsSolver(csp, max_steps=200, max_restarts=2, seed=0)
+    assert solver.solve() == []
+    assert solver.restarts == 2
+
+def test_preassigned_variables_stay_fixed():
+    csp = random_binary_csp(7, 4, density=0.5, tightness=0.3, seed=1)
+    csp.get_variable('x0').assigned_value = 2
+    solution = MinConflictsSolver(csp, seed=0).solve()[0]
+    assert solution['x0'] == 2
+    assert as_set([solution]) <= brute_force(csp)
+
+def test_same_seed_same_solution():
+    assert MinConflictsSolver(queens(12), seed=4).solve() == MinConflictsSolver(queens(12), seed=4).solve()
+
+@pytest.mark.parametrize('greedy', [True, False])
+def test_incremental_table_matches_direct_evaluation(greedy):
+    solver = MinConflictsSolver(random_binary_csp(9, 4, density=0.6, tightness=0.4, seed=3), seed=0)
+    solver._initialise(greedy=greedy)
+    rng = random.Random(0)
+    for _ in range(50):
+        assert solver._table == _direct_table(solver)
+        assert solver._total == sum(not constraint.is_satisfied() for constraint in solver.csp.constraints)
+        var = rng.choice(solver._free)
+        solver._move(var, rng.choice(var.domain))
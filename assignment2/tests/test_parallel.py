@@ -0,0 +1,63 @@
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from assignment2.algorithms import parallel
+from assignment2.algorithms.compiled_backtracking import CompiledBacktrackingSolver
+from assignment2.algorithms.parallel import ParallelSolver
+from tests.problems import random_binary_csp, brute_force, as_set
+
+def _die(*args):
+    os._exit(3)
+
+@pytest.mark.parametrize('seed', range(3))
+def test_enumeration_matches_sequential_solver(seed):
+    csp = random_binary_csp(7, 4, density=0.5, tightness=0.3, seed=seed)
+    solver = ParallelSolver(csp, processes=2, cubes_per_process=4)
+    assert len(solver.cubes()) >= 8
+    solutions = solver.solve()
+    assert solutions == CompiledBacktrackingSolver(csp).solve() # cubes are merged in search order
+    assert as_set(solutions) == brute_force(csp)
+    assert ParallelSolver(csp, processes=2).count() == len(solutions)
+
+def test_race_returns_a_solution():
+    csp = random_binary_csp(7, 4, density=0.5, tightness=0.3, seed=0)
+    solutions = ParallelSolver(csp, processes=2).solve(collect_all=False)
+    assert len(solutions) == 1
+    assert as_set(solutions) <= brute_force(csp)
+
+def test_race_proves_unsatisfiability():
+    csp = random_binary_csp(7, 4, density=0.5, tightness=0.6, seed=0)
+    assert not brute_force(csp)
+    assert ParallelSolver(csp, processes=2).race() is None
+    assert ParallelSolver(csp, processes=2).count() == 0
+
+def test_race_reports_failing_members():
+    csp = random_binary_csp(5, 3, density=0.5, tightness=0.3, seed=0)
+    with pytest.raises(RuntimeError):
+        ParallelSolver(csp).race([{'variable_ordering': 'unknown'}])
+
+def test_race_does_not_wait_for_dead_members(monkeypatch):
+    monkeypatch.setattr(parallel, '_race', _die)
+    with pytest.raises(RuntimeError, match='exit code 3'):
+        ParallelSolver(random_binary_csp(5, 3, density=0.5, tightness=0.3, seed=0), processes=2).race()
+
+def test_dead_cube_worker_raises(monkeypatch):
+    monkeypatch.setattr(parallel, '_solve_cube', _die)
+    with pytest.raises(BrokenProcessPool):
+        ParallelSolver(random_binary_csp(5, 3, density=0.5, tightness=0.3, seed=0), processes=2).solve()
+
+@pytest.mark.parametrize('kill', [False, True])
+def test_race_closes_its_queue(monkeypatch, kill):
+    queues, make_queue = [], parallel.mp.Queue
+    monkeypatch.setattr(parallel.mp, 'Queue', lambda: queues.append(make_queue()) or queues[-1])
+    if kill:
+        monkeypatch.setattr(parallel, '_race', _die)
+    csp = random_binary_csp(5, 3, density=0.5, tightness=0.3, seed=0)
+    try:
+        ParallelSolver(csp, processes=2).race()
+    except RuntimeError:
+        assert kill
+    [results] = queues
+    assert results._closed
@@ -0,0 +1,84 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from assignment2.algorithms.informed_search import AStarSearch
+from assignment2.datastructures.node import Node
+from assignment2.heuristics.pattern_database import PatternDatabase, HanoiPatternDatabase
+
+DISKS = 5
+
+def hanoi_state(pegs_of_disks) -> tuple:
+    """
+    Concrete state (tuple of pegs, smallest disk on top) from the peg of every disk 1..n.
+    """
+    return tuple(tuple(disk for disk, peg in enumerate(pegs_of_disks, start=1) if peg == p) for p in range(3))
+
+def hanoi_moves(state) -> list:
+    moves = []
+    for source, target in itertools.permutations(range(3), 2):
+        if state[source] and (not state[target] or state[target][0] > state[source][0]):
+            pegs = list(state)
+            pegs[target] = (state[source][0],) + state[target]
+            pegs[source] = state[source][1:]
+            moves.append(tuple(pegs))
+    return moves
+
+@pytest.fixture(scope='module')
+def distances() -> dict:
+    """
+    Exact goal distance of every state, by breadth-first search from the goal (moves are reversible).
+    """
+    goal = hanoi_state([2] * DISKS)
+    distances, layer = {goal: 0}, [goal]
+    while layer:
+        next_layer = []
+        for state in layer:
+            for neighbour in hanoi_moves(state):
+                if neighbour not in distances:
+                    distances[neighbour] = distances[state] + 1
+                    next_layer.append(neighbour)
+        layer = next_layer
+    return distances
+
+def test_full_pattern_is_exact(distances):
+    database = HanoiPatternDatabase.build(range(1, DISKS + 1))
+    assert len(distances) == 3 ** DISKS
+    assert all(database(state) == distance for state, distance in distances.items())
+    assert database(hanoi_state([0] * DISKS)) == 2 ** DISKS - 1
+
+def test_partial_patterns_are_admissible_and_additive(distances):
+    small, large = HanoiPatternDatabase.build([1, 2]), HanoiPatternDatabase.build([3, 4, 5])
+    assert small.values.dtype == np.uint8 and len(large.values) == 27
+    states = list(distances)
+    assert all(small(s) + large(s) <= distances[s] for s in states)
+    assert np.array_equal(small.batch(states) + large.batch(states), [small(s) + large(s) for s in states])
+
+def test_astar_with_database_is_optimal():
+    database = HanoiPatternDatabase.build([3, 4, 5])
+    start, goal = hanoi_state([0] * DISKS), hanoi_state([2] * DISKS)
+    search = AStarSearch(hanoi_moves, database)
+    path = search.execute(Node(start), goal)
+    assert len(path) - 1 == 2 ** DISKS - 1
+    blind = AStarSearch(hanoi_moves, lambda s: 0)
+    blind.execute(Node(start), goal)
+    assert search.expanded < blind.expanded
+
+@pytest.mark.parametrize('mmap', [True, False])
+def test_save_load_round_trip(tmp_path, mmap):
+    database = HanoiPatternDatabase.build([1, 3, 4])
+    path = str(tmp_path / 'hanoi.npy')
+    database.save(path)
+    loaded = HanoiPatternDatabase.load(path, [1, 3, 4], mmap=mmap)
+    assert isinstance(loaded.values, np.memmap) == mmap
+    assert np.array_equal(loaded.values, database.values)
+    state = hanoi_state([0, 1, 2, 2, 0])
+    assert loaded(state) == database(state)
+
+def test_unreachable_states_are_infinite():
+    graph = {0: [1], 1: [2], 2: [], 3: [2]} # predecessors: 3 and 1 reach 2, nothing reaches 3
+    predecessors = lambda s: [u for u, successors in graph.items() if s in successors]
+    database = PatternDatabase.build([2], predecessors, rank=int, size=5, abstraction=lambda s: s)
+    assert [database(s) for s in range(5)] == [2.0, 1.0, 0.0, 1.0, float('inf')]
+    assert np.array_equal(database.batch(range(5)), [2, 1, 0, 1, np.inf])
@@ -0,0 +1,79 @@
+import json
+import os
+import subprocess
+import sys
+
+import matplotlib
+matplotlib.use('Agg')
+import networkx as nx
+import pytest
+
+from assignment2.datastructures.node import Node
+from assignment2.visualisations.rendering import graph_hash, cached_layout, neighbourhood
+from assignment2.visualisations.visualise import SearchPathVisualizer
+
+EDGES = [('S', 'F'), ('S', 'A'), ('F', 'H'), ('F', 'G'), ('F', 'A'), ('A', 'C'), ('A', 'F'), ('C', 'D'), ('C', 'G'), ('D', 'G')]
+
+def test_graph_hash_ignores_insertion_order():
+    assert graph_hash(nx.DiGraph(EDGES)) == graph_hash(nx.DiGraph(EDGES[::-1]))
+    assert graph_hash(nx.DiGraph(EDGES)) != graph_hash(nx.DiGraph(EDGES[1:]))
+    assert graph_hash(nx.DiGraph(EDGES), seed=0) != graph_hash(nx.DiGraph(EDGES), seed=1)
+
+def test_layout_is_read_back_from_cache(tmp_path, monkeypatch):
+    G = nx.DiGraph([((0, 0), (0, 1)), ((0, 1), (1, 1))]) # tuple nodes go through repr
+    pos = cached_layout(G, str(tmp_path))
+    [name] = os.listdir(tmp_path)
+    assert name.endswith('.json') and len(json.load(open(tmp_path / name))) == 3
+
+    def fail(*args, **kwargs):
+        raise AssertionError("the layout should come from the cache")
+    monkeypatch.setattr(nx, 'spring_layout', fail)
+    assert cached_layout(G, str(tmp_path)) == pos
+    with pytest.raises(AssertionError):
+        cached_layout(G, str(tmp_path), seed=1) # other options get another cache entry
+
+def test_neighbourhood():
+    G = nx.DiGraph(EDGES)
+    assert set(neighbourhood(G, ['D'], hops=1)) == {'D', 'C', 'G'} # edges in either direction
+    assert set(neighbourhood(G, ['D', 'X'], hops=2)) == {'D', 'C', 'G', 'A', 'F'} # unknown nodes are ignored
+    sampled = neighbourhood(G, ['S', 'F', 'G'], hops=2, max_nodes=4, seed=3)
+    assert len(sampled) == 4 and {'S', 'F', 'G'} <= set(sampled)
+    assert set(sampled) == set(neighbourhood(G, ['S', 'F', 'G'], hops=2, max_nodes=4, seed=3))
+
+class CountingDiGraph(nx.DiGraph):
+    """Directed graph whose undirected view counts the expansions of every node."""
+    def to_undirected(self, as_view=False):
+        undirected, expanded = super().to_undirected(as_view=as_view), self.expanded
+        class Counting:
+            def neighbors(self, node):
+                expanded[node] = expanded.get(node, 0) + 1
+                return undirected.neighbors(node)
+        return Counting()
+
+def test_neighbourhood_expands_each_node_once():
+    G = CountingDiGraph([(a, b) for a in range(5) for b in range(5, 10)]) # every b is reached from every a
+    G.expanded = {}
+    assert set(neighbourhood(G, range(5), hops=3)) == set(range(10))
+    assert max(G.expanded.values()) == 1
+
+TWIN = os.path.join(os.path.dirname(__file__), '..', '..', 'assignment1', 'src', 'trees', 'rendering.py')
+
+@pytest.mark.skipif(not os.path.exists(TWIN), reason='assignment1 is not checked out next to assignment2')
+def test_rendering_matches_its_twin():
+    with open(TWIN, 'rb') as twin, open(os.path.join(os.path.dirname(__file__), '..', 'assignment2', 'visualisations', 'rendering.py'), 'rb') as f:
+        assert f.read() == twin.read()
+
+def test_plot_neighbourhood_of_path(tmp_path):
+    visualizer = SearchPathVisualizer(EDGES, layout_cache_dir=str(tmp_path / 'layouts'))
+    path = [Node('S'), Node('F'), Node('G')]
+    visualizer.plot_search_path(path, hops=1, max_nodes=5, output=str(tmp_path / 'path.svg'))
+    assert (tmp_path / 'path.svg').stat().st_size > 0
+    assert len(os.listdir(tmp_path / 'layouts')) == 1
+
+
+@pytest.mark.parametrize("module", ["assignment2.visualisations.visualise", "assignment2.algorithms.informed_search"])
+def test_import_does_not_load_drawing_libraries(module):
+    code = f"import sys, {module}; print(sorted(m for m in ('networkx', 'matplotlib') if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], cwd=os.path.dirname(os.path.dirname(__file__)),
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
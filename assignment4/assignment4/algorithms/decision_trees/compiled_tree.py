@@ -0,0 +1,320 @@
+import json
+import numpy as np
+import pandas as pd
+
+from assignment4.data_structures.node import Node
+
+class CompiledTree:
+	"""
+	Flat-array form of a trained decision tree for batch inference.
+
+	Node i is a leaf if feature[i] == -1, with class value[i]. Otherwise the child reached
+	by the k-th branch value of its feature (keys[feature[i]][k]) is child_table[child_offset[i] + k],
+	-1 if the node has no branch for that value. For a numeric feature split by thresholds, keys holds
+	the sorted thresholds of the tree and a node splitting at keys[feature[i]][rank[i]] has the
+	branches 0 (value <= threshold) and 1. If has_majority[i], value[i] of an inner node is the
+	majority class of its training rows, predicted for rows without a branch there. All rows of a
+	batch advance one level at a time with NumPy fancy indexing.
+	"""
+	def __init__(self, features: list[str], keys: list[np.ndarray], feature: np.ndarray, value: np.ndarray,
+				 child_offset: np.ndarray, child_table: np.ndarray, branch_offset: np.ndarray, branch_count: np.ndarray,
+				 branches: np.ndarray, numeric: np.ndarray | None = None, rank: np.ndarray | None = None,
+				 has_majority: np.ndarray | None = None):
+		self.features = features
+		self.keys = keys
+		self.numeric = numeric if numeric is not None else np.zeros(len(features), dtype=bool)
+		self.rank = rank if rank is not None else np.full(len(feature), -1, dtype=np.int32) # threshold index, -1 for value splits
+		self.has_majority = has_majority if has_majority is not None else np.zeros(len(feature), dtype=bool)
+		self.feature = feature
+		self.value = value
+		self.child_offset = child_offset
+		self.child_table = child_table
+		self.branch_offset = branch_offset # existing children of each node, for unseen values
+		self.branch_count = branch_count
+		self.branches = branches
+		self.metadata = {}
+
+	@classmethod
+	def from_tree(cls, root: Node | int) -> 'CompiledTree':
+		"""
+		Flatten a tree of Node objects.
+
+		Parameters:
+		----------------
+		root (Node | int): The root of the decision tree.
+
+		Returns:
+		----------------
+		CompiledTree: The compiled tree.
+
+		Raises:
+		----------------
+		ValueError: If a leaf has no class, as when the tree was built without any row or feature.
+		"""
+		# Branch values seen for every feature, in a fixed order
+		features, seen, thresholded = [], {}, set()
+		stack = [root]
+		while stack:
+			node = stack.pop()
+			if isinstance(node, Node) and node.children:
+				if node.attribute not in seen:
+					seen[node.attribute] = set()
+					features.append(node.attribute)
+				if node.threshold is not None:
+					thresholded.add(node.attribute)
+					seen[node.attribute].add(node.threshold)
+				else:
+					seen[node.attribute].update(node.children)
+				stack.extend(node.children.values())
+		keys = [np.array(sorted(seen[f]), dtype=np.float64) for f in features]
+		numeric = np.array([f in thresholded for f in features], dtype=bool)
+		index = {f: i for i, f in enumerate(features)}
+
+		# Breadth-first numbering of the nodes
+		order, feature, value, rank, has_majority = [root], [], [], [], []
+		child_offset, child_table, branch_offset, branch_count, branches = [], [], [], [], []
+		i = 0
+		while i < len(order):
+			node = order[i]
+			if isinstance(node, Node) and node.children:
+				f = index[node.attribute]
+				feature.append(f)
+				value.append(node.majority if node.majority is not None else -1)
+				has_majority.append(node.majority is not None)
+				if node.threshold is not None:
+					rank.append(int(np.searchsorted(keys[f], node.threshold)))
+					table = [-1, -1]
+				else:
+					rank.append(-1)
+					table = [-1] * len(keys[f])
+				branch_offset.append(len(branches))
+				branch_count.append(len(node.children))
+				for key, child in sorted(node.children.items()):
+					child_id = len(order)
+					order.append(child)
+					table[key if node.threshold is not None else int(np.searchsorted(keys[f], key))] = child_id
+					branches.append(child_id)
+				child_offset.append(len(child_table))
+				child_table.extend(table)
+			else:
+				if node is None:
+					raise ValueError("The tree has a leaf without a class (was it built without any row or feature?)")
+				feature.append(-1)
+				rank.append(-1)
+				value.append(node if not isinstance(node, Node) else -1)
+				has_majority.append(False)
+				child_offset.append(0)
+				branch_offset.append(0)
+				branch_count.append(0)
+			i += 1
+
+		return cls(features, keys, np.array(feature, dtype=np.int32), np.array(value, dtype=np.int64),
+				   np.array(child_offset, dtype=np.int64), np.array(child_table, dtype=np.int32),
+				   np.array(branch_offset, dtype=np.int64), np.array(branch_count, dtype=np.int64),
+				   np.array(branches, dtype=np.int32), numeric, np.array(rank, dtype=np.int32), np.array(has_majority, dtype=bool))
+
+	# Binary model format: MAGIC, then a little-endian uint32 header length, a JSON header describing
+	# every array (dtype, shape, offset) and the raw arrays, each aligned on ALIGNMENT bytes
+	MAGIC = b'ID3TREE1'
+	ALIGNMENT = 64
+	ARRAYS = ('feature', 'value', 'child_offset', 'child_table', 'branch_offset', 'branch_count', 'branches', 'numeric', 'rank', 'has_majority')
+
+	def save(self, path: str, metadata: dict | None = None) -> None:
+		"""
+		Write the tree to a binary model file that load can memory-map.
+
+		Parameters:
+		----------------
+		path (str): The file to write.
+		metadata (dict): JSON-serialisable information stored in the header (e.g. the training settings).
+		"""
+		arrays = {name: np.ascontiguousarray(getattr(self, name)) for name in self.ARRAYS}
+		arrays['key_values'] = np.concatenate(self.keys) if self.keys else np.empty(0, dtype=np.float64)
+		arrays['key_offset'] = np.cumsum([0] + [len(k) for k in self.keys], dtype=np.int64)
+
+		layout, offset = {}, 0
+		for name, array in arrays.items():
+			layout[name] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset}
+			offset += -(-array.nbytes // self.ALIGNMENT) * self.ALIGNMENT
+		header = json.dumps({'features': self.features, 'arrays': layout, 'metadata': metadata or {}}).encode()
+		start = -(-(len(self.MAGIC) + 4 + len(header)) // self.ALIGNMENT) * self.ALIGNMENT
+
+		with open(path, 'wb') as f:
+			f.write(self.MAGIC)
+			f.write(len(header).to_bytes(4, 'little'))
+			f.write(header)
+			for name, array in arrays.items():
+				f.seek(start + layout[name]['offset'])
+				f.write(array.tobytes())
+			f.truncate(start + offset)
+
+	@classmethod
+	def load(cls, path: str, mmap: bool = True) -> 'CompiledTree':
+		"""
+		Read a model file written by save.
+
+		Parameters:
+		----------------
+		path (str): The model file.
+		mmap (bool): If True, the arrays are read-only views of a memory map of the file, shared by
+		all processes loading it. Otherwise they are read into memory.
+
+		Returns:
+		----------------
+		CompiledTree: The compiled tree, with the header metadata in its metadata attribute.
+		"""
+		with open(path, 'rb') as f:
+			if f.read(len(cls.MAGIC)) != cls.MAGIC:
+				raise ValueError(f"{path} is not a compiled tree file")
+			size = int.from_bytes(f.read(4), 'little')
+			header = json.loads(f.read(size))
+		start = -(-(len(cls.MAGIC) + 4 + size) // cls.ALIGNMENT) * cls.ALIGNMENT
+
+		buffer = np.memmap(path, dtype=np.uint8, mode='r') if mmap else np.fromfile(path, dtype=np.uint8)
+		arrays = {}
+		for name, spec in header['arrays'].items():
+			dtype = np.dtype(spec['dtype'])
+			begin = start + spec['offset']
+			count = int(np.prod(spec['shape'], dtype=np.int64))
+			arrays[name] = buffer[begin:begin + count * dtype.itemsize].view(dtype).reshape(spec['shape'])
+
+		offsets = arrays.pop('key_offset')
+		values = arrays.pop('key_values')
+		keys = [values[offsets[i]:offsets[i + 1]] for i in range(len(offsets) - 1)]
+		tree = cls(header['features'], keys, **arrays)
+		tree.metadata = header['metadata']
+		return tree
+
+	def to_tree(self) -> Node | int:
+		"""
+		Rebuild the tree of Node objects.
+
+		Returns:
+		----------------
+		Node | int: The root of the decision tree.
+		"""
+		nodes = [None] * self.n_nodes
+		for i in reversed(range(self.n_nodes)): # children are numbered after their parent
+			f = int(self.feature[i])
+			if f < 0:
+				nodes[i] = int(self.value[i])
+				continue
+			if self.rank[i] >= 0:
+				node = Node(self.features[f], threshold=float(self.keys[f][self.rank[i]]))
+				keys = [0, 1]
+			else:
+				node = Node(self.features[f])
+				keys = [int(k) if float(k).is_integer() else float(k) for k in self.keys[f]]
+			if self.has_majority[i]:
+				node.majority = int(self.value[i])
+			table = self.child_table[self.child_offset[i]:self.child_offset[i] + len(keys)]
+			for key, child in zip(keys, table):
+				if child >= 0:
+					node.children[key] = nodes[child]
+			nodes[i] = node
+		return nodes[0]
+
+	@property
+	def n_nodes(self) -> int:
+		return len(self.feature)
+
+	def encode(self, data: pd.DataFrame) -> np.ndarray:
+		"""
+		Map the values of the features used by the tree to branch indices.
+
+		Parameters:
+		----------------
+		data (DataFrame): The rows to encode.
+
+		Returns:
+		----------------
+		ndarray: (n_rows x n_features) branch indices, -1 for values without a branch.
+		"""
+		columns = {name: pd.to_numeric(data[name], errors='coerce').to_numpy(dtype=np.float64) for name in self.features}
+		return self.encode_values(columns, len(data))
+
+	def encode_values(self, columns: dict[str, np.ndarray], n_rows: int) -> np.ndarray:
+		"""
+		Map numeric feature columns to branch indices.
+
+		Parameters:
+		----------------
+		columns (dict): Float column of every feature used by the tree (NaN for missing values).
+		n_rows (int): The number of rows.
+
+		Returns:
+		----------------
+		ndarray: (n_rows x n_features) branch indices, -1 for values without a branch. For numeric
+		features, the number of thresholds below the value (value <= keys[k] iff code <= k).
+		"""
+		codes = np.full((n_rows, len(self.features)), -1, dtype=np.int64)
+		for j, (name, keys) in enumerate(zip(self.features, self.keys)):
+			if len(keys) == 0:
+				continue
+			column = columns[name]
+			if self.numeric[j]:
+				codes[:, j] = np.where(np.isnan(column), -1, np.searchsorted(keys, column))
+				continue
+			position = np.minimum(np.searchsorted(keys, column), len(keys) - 1)
+			codes[:, j] = np.where(keys[position] == column, position, -1)
+		return codes
+
+	def predict(self, data: pd.DataFrame, rng: np.random.Generator | None = None) -> np.ndarray:
+		"""
+		Predict the class of every row.
+
+		Parameters:
+		----------------
+		data (DataFrame): The rows to classify.
+		rng (Generator): Random generator used for values without a branch (see predict_codes).
+
+		Returns:
+		----------------
+		ndarray: The predicted class of every row.
+		"""
+		return self.predict_codes(self.encode(data), rng)
+
+	def predict_codes(self, codes: np.ndarray, rng: np.random.Generator | None = None) -> np.ndarray:
+		"""
+		Predict the class of encoded rows, advancing all rows one level at a time.
+
+		Rows reaching a node without a branch for their value are predicted the majority class of the node,
+		as reduced-error pruning assumes. Nodes without a majority class send them down a random existing branch.
+
+		Parameters:
+		----------------
+		codes (ndarray): Branch indices of the rows, as returned by encode.
+		rng (Generator): Random generator used for values without a branch. Default is seeded, so that
+		repeated predictions of the same rows agree.
+
+		Returns:
+		----------------
+		ndarray: The predicted class of every row.
+		"""
+		rng = rng if rng is not None else np.random.default_rng(0)
+		node = np.zeros(len(codes), dtype=np.int64)
+		active = np.flatnonzero(self.feature[node] >= 0)
+
+		while active.size:
+			current = node[active]
+			code = codes[active, self.feature[current]]
+			rank = self.rank[current]
+			code = np.where((rank >= 0) & (code >= 0), code > rank, code) # threshold nodes: branch 0 or 1
+			child = np.where(code >= 0, self.child_table[self.child_offset[current] + np.maximum(code, 0)], -1)
+
+			unseen = np.flatnonzero(child < 0)
+			stopped = np.zeros(len(active), dtype=bool)
+			if unseen.size:
+				parents = current[unseen]
+				known = self.has_majority[parents]
+				stopped[unseen[known]] = True # predicted value[parent], the majority class
+				child[unseen[known]] = parents[known]
+				if not known.all():
+					parents = parents[~known]
+					pick = rng.integers(0, self.branch_count[parents])
+					child[unseen[~known]] = self.branches[self.branch_offset[parents] + pick]
+
+			node[active] = child
+			active = active[(self.feature[child] >= 0) & ~stopped]
+
+		return self.value[node]
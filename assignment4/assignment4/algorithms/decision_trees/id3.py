@@ -1,9 +1,9 @@
 import random
 import numpy as np
 import pandas as pd
-from anytree import AnyNode, RenderTree
 
-from assignment4.utils import (information_gain, gini_index,)
+from assignment4.algorithms.decision_trees.split_criteria import (encode_columns, contingency_tensor, best_split, bin_features, threshold_tensor, split_scores, impurity_decreases,)
+from assignment4.algorithms.decision_trees.compiled_tree import CompiledTree
 from assignment4.data_structures.node import Node
 
 class ID3DecisionTree:
@@ -12,9 +12,36 @@ class ID3DecisionTree:
 
 	This class creates a decision tree for classification based on the Information Gain metric.
 	"""
-	def __init__(self, use_gini: bool = False):
+	def __init__(self, use_gini: bool = False, max_features: int | None = None, random_state: int | None = None, max_bins: int | None = None,
+				 max_depth: int | None = None, min_samples_split: int = 2, min_samples_leaf: int = 1, min_gain: float | None = None):
+		"""
+		Parameters:
+		----------------
+		use_gini (bool): Whether to use Gini Index instead of Information Gain. Default is False.
+		max_features (int): If given, each node only considers this many randomly drawn features (as in random forests).
+		random_state (int): Seed of the feature subsampling.
+		max_bins (int): If given, numeric features with more distinct values are quantised into at most max_bins
+		bins and split in two by a threshold instead of one branch per value.
+		max_depth (int): If given, nodes at this depth become leaves.
+		min_samples_split (int): Nodes with fewer training rows become leaves.
+		min_samples_leaf (int): Branches with fewer training rows become leaves predicting the majority class of their parent
+		(thresholds leaving fewer rows on one side are not considered).
+		min_gain (float): If given, splits decreasing the impurity by less than this value are not made.
+		"""
 		self.root = None
 		self.use_gini = use_gini
+		self.max_features = max_features
+		self.max_bins = max_bins
+		self.max_depth = max_depth
+		self.min_samples_split = min_samples_split
+		self.min_samples_leaf = min_samples_leaf
+		self.min_gain = min_gain
+		self.thresholds = [] # per feature, upper value of every bin (None for features split by value)
+		self.rng = np.random.default_rng(random_state)
+		self.features = []
+		self.categories = []
+		self.classes = np.array([])
+		self.compiled = None
   
 	def __str__(self) -> str:
 		"""
@@ -55,6 +82,11 @@ class ID3DecisionTree:
 		"""
 		Build a decision tree using the ID3 algorithm.
 
+		The dataset is integer-encoded once; the recursion then only passes arrays of row
+		indices down the tree, so no DataFrame is created per node. Rows with a missing
+		target are ignored, and rows with a missing value of a split feature do not go
+		down any branch of that split.
+
 		Parameters:
 		----------------
 			data (DataFrame): The dataset used for building the decision tree.
@@ -66,33 +98,201 @@ class ID3DecisionTree:
 		----------------
 			Node: The root node of the decision tree.
 		"""
-		# If all target values are the same, return this value
-		if len(np.unique(data[target_attribute])) <= 1:
-			return int(np.unique(data[target_attribute])[0])
+		features = list(features)
+		codes, categories = encode_columns(data, features + [target_attribute])
+		X, y = codes[:, :-1], codes[:, -1]
+		X, thresholds = bin_features(X, categories[:-1], self.max_bins, np.flatnonzero(y >= 0), copy=False) # codes are ours to overwrite
+		return self.build_encoded(X, y, features, categories[:-1], categories[-1], parent_node=parent_node, thresholds=thresholds)
+
+	def build_encoded(self, X: np.ndarray, y: np.ndarray, features: list, categories: list[np.ndarray], classes: np.ndarray,
+					  rows: np.ndarray | None = None, parent_node: any = None, thresholds: list | None = None) -> Node | int:
+		"""
+		Build the decision tree from an already encoded dataset (see encode_columns).
 
-		# If the dataset is empty, return the mode target feature value in the original dataset
-		if len(data) == 0:
-			return int(np.unique(data[target_attribute])[np.argmax(np.unique(data[target_attribute], return_counts=True)[1])])
+		Numeric features with more than max_bins values are quantised on the training rows first,
+		unless X was already binned by bin_features and its thresholds are given.
+
+		Parameters:
+		----------------
+			X (ndarray): Integer-encoded features (-1 for missing values).
+			y (ndarray): Integer-encoded target (-1 for missing values).
+			features (list): Name of every column of X.
+			categories (list): Sorted values of every feature.
+			classes (ndarray): Sorted values of the target.
+			rows (ndarray): Rows to train on, possibly repeated (e.g. a bootstrap sample). Default is all rows.
+			parent_node (Any): The class value of the parent node for the current branch.
+			thresholds (list): Bin thresholds returned by bin_features if X holds bins instead of codes.
+
+		Returns:
+		----------------
+			Node: The root node of the decision tree.
+		"""
+		self.features, self.categories, self.classes = list(features), categories, classes
+		rows = np.arange(len(y)) if rows is None else np.asarray(rows)
+		rows = rows[y[rows] >= 0]
+		if thresholds is None:
+			X, thresholds = bin_features(X, categories, self.max_bins, rows)
+		self.thresholds = list(thresholds)
+
+		self.root = self._build(X, y, rows, list(range(len(self.features))), parent_node)
+		self.compiled = None
+		return self.root
+
+	def _build(self, X: np.ndarray, y: np.ndarray, rows: np.ndarray, feature_ids: list[int], parent_node: any,
+			   counts: np.ndarray | None = None, depth: int = 0) -> Node | int:
+		"""
+		Recursively build the subtree of a set of rows.
+
+		Parameters:
+		----------------
+			X (ndarray): Integer-encoded features of the whole dataset (-1 for missing values).
+			y (ndarray): Integer-encoded target of the whole dataset.
+			rows (ndarray): Indices of the rows reaching this node.
+			feature_ids (list): Columns of X that can still be used.
+			parent_node (Any): The class value of the parent node for the current branch.
+			counts (ndarray): Class histograms of feature_ids on these rows, when already known (binned mode).
+			depth (int): Depth of the node.
+
+		Returns:
+		----------------
+			Node | int: The subtree, or a class value for a leaf.
+		"""
+		class_counts = np.bincount(y[rows], minlength=len(self.classes))
+
+		# If the dataset is empty, return the mode target feature value of the parent
+		if len(rows) == 0:
+			return parent_node
+
+		# If all target values are the same, return this value
+		if np.count_nonzero(class_counts) <= 1:
+			return int(self.classes[np.argmax(class_counts)])
 
 		# If the feature space is empty, return the mode target feature value of the direct parent node
-		if len(features) == 0:
+		if len(feature_ids) == 0:
+			return parent_node
+
+		parent_node = int(self.classes[np.argmax(class_counts)])
+
+		# Pre-pruning: stop growing and return the majority class
+		if (self.max_depth is not None and depth >= self.max_depth) or len(rows) < self.min_samples_split:
+			return parent_node
+
+		candidates = feature_ids
+		if self.max_features is not None and self.max_features < len(feature_ids):
+			candidates = sorted(self.rng.choice(feature_ids, self.max_features, replace=False).tolist())
+
+		if any(self.thresholds[f] is not None for f in feature_ids):
+			return self._build_binned(X, y, rows, feature_ids, candidates, parent_node, counts, depth)
+
+		n_values = max(len(self.categories[f]) for f in candidates)
+		counts = contingency_tensor(X[np.ix_(rows, candidates)], y[rows], n_values, len(self.classes))
+		best_index = best_split(counts, use_gini=self.use_gini)
+
+		# No remaining feature has a value on these rows
+		if counts[best_index].sum() == 0:
+			return parent_node
+
+		if self.min_gain is not None and impurity_decreases(counts[best_index:best_index + 1], self.use_gini)[0] < self.min_gain:
 			return parent_node
 
-		parent_node = int(np.unique(data[target_attribute])[np.argmax(np.unique(data[target_attribute], return_counts=True)[1])])
-		best_feature = self._find_best_feature(data, features, target_attribute, use_gini=self.use_gini)
+		return self._split_values(X, y, rows, feature_ids, candidates[best_index], parent_node, depth)
 
+	def _split_values(self, X: np.ndarray, y: np.ndarray, rows: np.ndarray, feature_ids: list[int], best: int, parent_node: int,
+					  depth: int = 0) -> Node:
+		"""
+		Create a node with one branch per value of the best feature.
+		"""
 		# Create tree
-		tree = Node(best_feature)
-		features = [i for i in features if i != best_feature]
+		tree = Node(self.features[best])
+		tree.majority = parent_node
+		remaining = [f for f in feature_ids if f != best]
+
+		# Partition the rows by value of the best feature with one stable sort
+		column = X[rows, best]
+		order = np.argsort(column, kind='stable')
+		values, starts = np.unique(column[order], return_index=True)
+		ends = np.append(starts[1:], len(order))
 
 		# Grow branches under the root node for each value of the best feature
-		for value in np.unique(data[best_feature]):
-			sub_data = data.where(data[best_feature] == value).dropna()
-			subtree = self.build_tree(sub_data, features, target_attribute, parent_node)
-			tree.children[int(value)] = subtree
+		for value, start, end in zip(values, starts, ends):
+			if value < 0: # missing values do not go down any branch
+				continue
+			if end - start < self.min_samples_leaf:
+				subtree = parent_node
+			else:
+				subtree = self._build(X, y, rows[order[start:end]], remaining, parent_node, depth=depth + 1)
+			tree.children[int(self.categories[best][value])] = subtree
+
+		return tree
+
+	def _build_binned(self, X: np.ndarray, y: np.ndarray, rows: np.ndarray, feature_ids: list[int], candidates: list[int],
+					  parent_node: int, counts: np.ndarray | None, depth: int = 0) -> Node | int:
+		"""
+		Choose between value splits and the thresholds of quantised features from class histograms.
+
+		Parameters:
+		----------------
+			X (ndarray): Integer-encoded features, quantised features holding their bin.
+			y (ndarray): Integer-encoded target.
+			rows (ndarray): Indices of the rows reaching this node.
+			feature_ids (list): Columns of X that can still be used.
+			candidates (list): Columns considered at this node.
+			parent_node (int): The majority class of these rows.
+			counts (ndarray): Class histograms of feature_ids on these rows, if already known.
+			depth (int): Depth of the node.
+
+		Returns:
+		----------------
+			Node | int: The subtree, or a class value for a leaf.
+		"""
+		n_values = max(len(t) if t is not None else len(self.categories[f]) for f, t in enumerate(self.thresholds))
+		if counts is None:
+			counts = contingency_tensor(X[np.ix_(rows, feature_ids)], y[rows], n_values, len(self.classes))
+		position = {f: i for i, f in enumerate(feature_ids)}
+
+		best, best_bin, best_score, best_counts = None, None, -np.inf, None
+		by_value = [f for f in candidates if self.thresholds[f] is None]
+		if by_value:
+			scores = split_scores(counts[[position[f] for f in by_value]], self.use_gini)
+			k = int(np.argmax(scores))
+			best, best_score, best_counts = by_value[k], scores[k], counts[position[by_value[k]]]
+
+		by_threshold = [f for f in candidates if self.thresholds[f] is not None]
+		if by_threshold and n_values > 1:
+			sides = threshold_tensor(counts[[position[f] for f in by_threshold]]) # (features, thresholds, 2, classes)
+			scores = split_scores(sides.reshape(-1, 2, len(self.classes)), self.use_gini).reshape(sides.shape[:2])
+			scores[(sides.sum(axis=3) < max(self.min_samples_leaf, 1)).any(axis=2)] = -np.inf # one side (nearly) empty
+			f, b = np.unravel_index(np.argmax(scores), scores.shape)
+			if scores[f, b] > best_score:
+				best, best_bin, best_score, best_counts = by_threshold[f], int(b), scores[f, b], sides[f, b]
+
+		# No remaining feature has a value on these rows
+		if best is None or best_score == -np.inf:
+			return parent_node
+
+		if self.min_gain is not None and impurity_decreases(best_counts[None], self.use_gini)[0] < self.min_gain:
+			return parent_node
+
+		if best_bin is None:
+			return self._split_values(X, y, rows, feature_ids, best, parent_node, depth)
+
+		tree = Node(self.features[best], threshold=self.thresholds[best][best_bin].item())
+		tree.majority = parent_node
+		column = X[rows, best]
+		sides = [rows[(column >= 0) & (column <= best_bin)], rows[column > best_bin]]
+
+		# Histogram subtraction: count the smaller side, the larger one is the rest of the node
+		# (only exact when no row is missing the split feature)
+		side_counts = [None, None]
+		small = int(len(sides[1]) < len(sides[0]))
+		side_counts[small] = contingency_tensor(X[np.ix_(sides[small], feature_ids)], y[sides[small]], n_values, len(self.classes))
+		if np.all(column >= 0):
+			side_counts[1 - small] = counts - side_counts[small]
+
+		# Numeric features stay available below a threshold split
+		for branch in (0, 1):
+			tree.children[branch] = self._build(X, y, sides[branch], feature_ids, parent_node, side_counts[branch], depth + 1)
 
-		self.root = tree # is this necessary?
-  
 		return tree
 
 	def _find_best_feature(self, data: pd.DataFrame, features: list[str], target_attribute: str, use_gini: bool = False) -> str:
@@ -112,13 +312,65 @@ class ID3DecisionTree:
   		----------
 		str: The best feature for splitting the dataset.
 		"""
-		gini_indices = {feature: gini_index(data, feature, target_attribute) for feature in features}
-		information_gains = {feature: information_gain(data, feature, target_attribute) for feature in features}
-  
-		if use_gini:
-			return min(gini_indices, key=gini_indices.get)
+		features = list(features)
+		codes, categories = encode_columns(data, features + [target_attribute])
+		X, y = codes[:, :-1], codes[:, -1]
+		n_values = max([len(c) for c in categories[:-1]] + [1])
+
+		# One contingency tensor for all features, scored with the selected criterion only
+		counts = contingency_tensor(X, y, n_values, max(len(categories[-1]), 1))
+		return features[best_split(counts, use_gini=use_gini)]
+
+	def prune(self, data: pd.DataFrame, target_attribute: str) -> Node | int:
+		"""
+		Reduced-error post-pruning: bottom-up, replace every subtree by a leaf predicting its majority
+		class when that does not increase the number of errors on a validation set.
 
-		return max(information_gains, key=information_gains.get)
+		Parameters:
+		----------------
+		data (DataFrame): The validation dataset (not used for training).
+		target_attribute (str): The name of the target attribute.
+
+		Returns:
+		----------------
+		Node | int: The root of the pruned tree.
+		"""
+		columns = {name: pd.to_numeric(data[name], errors='coerce').to_numpy(dtype=np.float64) for name in self.features}
+		y = data[target_attribute].to_numpy()
+		self.root, _ = self._reduced_error(self.root, np.arange(len(data)), columns, y)
+		self.compiled = None
+		return self.root
+
+	def _reduced_error(self, node: Node | int, rows: np.ndarray, columns: dict[str, np.ndarray], y: np.ndarray) -> tuple:
+		"""
+		Prune the subtree of a node given the validation rows reaching it.
+
+		Returns:
+		----------------
+		tuple: The pruned subtree and its number of errors on the rows.
+		"""
+		if not isinstance(node, Node) or not node.children:
+			return node, int(np.count_nonzero(y[rows] != node))
+
+		column = columns[node.attribute][rows]
+		if node.threshold is not None:
+			column = np.where(np.isnan(column), np.nan, (column > node.threshold).astype(np.float64))
+
+		errors, routed = 0, np.zeros(len(rows), dtype=bool)
+		for key, child in node.children.items():
+			reaches = column == key
+			routed |= reaches
+			node.children[key], child_errors = self._reduced_error(child, rows[reaches], columns, y)
+			errors += child_errors
+
+		if node.majority is None:
+			return node, errors
+		# Rows without a branch here are predicted the majority class (see CompiledTree.predict_codes), in both cases
+		errors += int(np.count_nonzero(y[rows[~routed]] != node.majority))
+		leaf_errors = int(np.count_nonzero(y[rows] != node.majority))
+		if leaf_errors <= errors:
+			return node.majority, leaf_errors
+		return node, errors
 
 	def _traverse(self, node: Node | int, current_data: dict) -> dict:
 		"""
@@ -137,7 +389,11 @@ class ID3DecisionTree:
 			return node
 
 		branch_value = current_data[node.attribute]
+		if node.threshold is not None and not pd.isna(branch_value):
+			branch_value = int(branch_value > node.threshold)
 		if branch_value not in node.children:
+			if node.majority is not None: # as the compiled tree predicts
+				return node.majority
 			branch_value = random.choice(list(node.children.keys()))
   
 		return self._traverse(node.children[branch_value], current_data) # next node
@@ -146,39 +402,87 @@ class ID3DecisionTree:
 		"""
 		Predict the class labels for a given dataset.
 
+		The tree is compiled to flat arrays on first use and all rows are scored in one batch.
+
+		Parameters:
+		------------
+		data (DataFrame): The rows to classify.
+
+		Returns:
+		---------
+		Series: A Series containing the predicted class labels.
+		"""
+		return pd.Series(self.compile().predict(data), name="c")
+
+	def compile(self) -> CompiledTree:
+		"""
+		Flatten the trained tree into arrays for batch inference (cached until the tree is rebuilt).
+
+		Returns:
+		---------
+		CompiledTree: The compiled tree.
+		"""
+		if self.compiled is None:
+			self.compiled = CompiledTree.from_tree(self.root)
+		return self.compiled
+
+	def save(self, path: str) -> None:
+		"""
+		Save the compiled tree to a binary model file.
+
 		Parameters:
 		------------
-		num_samples (int): The number of data points to generate.
+		path (str): The file to write.
+		"""
+		self.compile().save(path, metadata={'use_gini': self.use_gini, 'features': self.features,
+											'classes': self.classes.tolist(), 'max_bins': self.max_bins})
+
+	@classmethod
+	def load(cls, path: str, mmap: bool = True, with_root: bool = False) -> 'ID3DecisionTree':
+		"""
+		Load a tree saved with save, ready to predict without rebuilding any Node.
+
+		Parameters:
+		------------
+		path (str): The model file.
+		mmap (bool): Whether to memory-map the node arrays instead of reading them.
+		with_root (bool): Whether to also rebuild the Node objects (needed by __str__, __eq__ and render_tree).
 
 		Returns:
 		---------
-		Series: A Series containing the generated data points.
+		ID3DecisionTree: The loaded tree.
 		"""
-		predictions = []
-		for _, row in data.iterrows():
-			data_point = self._traverse(self.root, row.to_dict())
-			predictions.append(data_point)
-   
-		return pd.Series(predictions, name="c")
+		compiled = CompiledTree.load(path, mmap=mmap)
+		metadata = compiled.metadata
+		tree = cls(use_gini=metadata.get('use_gini', False), max_bins=metadata.get('max_bins'))
+		tree.features = metadata.get('features', compiled.features)
+		tree.classes = np.array(metadata.get('classes', []))
+		tree.compiled = compiled
+		if with_root:
+			tree.root = compiled.to_tree()
+		return tree
 
 	def render_tree(self):
 		"""
 		Render the decision tree using RenderTree for visual representation.
 		"""
-		def convert_to_anytree(node, parent=None, edge_value=None):
+		from anytree import AnyNode, RenderTree
+
+		def convert_to_anytree(node, parent=None, edge_value=None, threshold=None):
 			"""
 			Recursively convert a Node to an AnyNode.
 			"""
 			if parent is None:
 				current_node = AnyNode(name=node.attribute, parent=parent)
 			else:
-				intermediate_node = AnyNode(name=f"Value: {edge_value}", parent=parent)
+				label = f"Value: {edge_value}" if threshold is None else f"{'<=' if edge_value == 0 else '>'} {threshold}"
+				intermediate_node = AnyNode(name=label, parent=parent)
 				current_node = AnyNode(name=node.attribute if isinstance(node, Node) else f"Leaf: {bool(node)}", parent=intermediate_node)
 
 			# Recursively convert child nodes
 			if isinstance(node, Node):
 				for value, child in node.children.items():
-					convert_to_anytree(child, parent=current_node, edge_value=value)
+					convert_to_anytree(child, parent=current_node, edge_value=value, threshold=node.threshold)
 
 			return current_node
 
@@ -0,0 +1,222 @@
+import os
+import numpy as np
+import pandas as pd
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+
+from assignment4.algorithms.decision_trees.split_criteria import encode_columns, bin_features
+from assignment4.algorithms.decision_trees.id3 import ID3DecisionTree
+
+# Training data of a worker process, attached once to the shared memory blocks
+_shared = {}
+
+def _attach(blocks: dict, features: list, categories: list, classes: np.ndarray, use_gini: bool, max_features: int | None,
+			thresholds: list):
+	"""
+	Pool initializer: map the shared training matrix into the worker without copying it.
+	"""
+	for name, (shm_name, shape, dtype) in blocks.items():
+		shm = SharedMemory(name=shm_name)
+		_shared[name + '_shm'] = shm # keep the mapping alive
+		_shared[name] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+	_shared.update(features=features, categories=categories, classes=classes, use_gini=use_gini, max_features=max_features,
+				   thresholds=thresholds)
+
+def _fit_tree(seed: int, bootstrap: bool = True) -> tuple:
+	"""
+	Train one tree of the forest on a bootstrap sample of the shared training data.
+
+	Parameters:
+	----------------
+	seed (int): Seed of the bootstrap sample, the feature subsampling and the out-of-bag prediction.
+	bootstrap (bool): Whether to train on a bootstrap sample instead of all rows.
+
+	Returns:
+	----------------
+	tuple: The root of the tree, the out-of-bag rows and the class index predicted for each of them.
+	"""
+	X, y = _shared['X'], _shared['y']
+	rng = np.random.default_rng(seed)
+	n_rows = len(y)
+	rows = rng.integers(0, n_rows, n_rows) if bootstrap else np.arange(n_rows)
+
+	tree = ID3DecisionTree(use_gini=_shared['use_gini'], max_features=_shared['max_features'], random_state=seed)
+	tree.build_encoded(X, y, _shared['features'], _shared['categories'], _shared['classes'], rows=rows, thresholds=_shared['thresholds'])
+
+	in_bag = np.zeros(n_rows, dtype=bool)
+	in_bag[rows] = True
+	oob = np.flatnonzero(~in_bag & (y >= 0))
+	if len(oob) == 0:
+		return tree.root, oob, np.empty(0, dtype=np.int64)
+
+	columns = {}
+	for f, (name, values, thresholds) in enumerate(zip(_shared['features'], _shared['categories'], _shared['thresholds'])):
+		if thresholds is not None: # the upper value of a bin goes down the same side of every split as the values in it
+			values = thresholds
+		codes = X[oob, f]
+		columns[name] = np.where(codes >= 0, values[np.maximum(codes, 0)].astype(np.float64), np.nan) if len(values) else np.full(len(oob), np.nan)
+	compiled = tree.compile()
+	predictions = compiled.predict_codes(compiled.encode_values(columns, len(oob)), rng)
+	return tree.root, oob, np.searchsorted(_shared['classes'], predictions)
+
+class RandomForest:
+	"""
+	Random forest of ID3 decision trees.
+
+	Every tree is trained on a bootstrap sample of the rows and only considers max_features random
+	features at each node. Trees are trained on a process pool; the encoded training matrix is binned
+	(see max_bins) and placed in shared memory once instead of being pickled for every worker.
+	"""
+	def __init__(self, n_trees: int = 100, max_features: int | float | str | None = 'sqrt', use_gini: bool = False,
+				 bootstrap: bool = True, n_jobs: int | None = None, random_state: int | None = None, max_bins: int | None = None):
+		"""
+		Parameters:
+		----------------
+		n_trees (int): Number of trees.
+		max_features (int | float | str): Features considered per node: a number, a fraction, 'sqrt', 'log2' or None for all.
+		use_gini (bool): Whether to use Gini Index instead of Information Gain. Default is False.
+		bootstrap (bool): Whether every tree is trained on a bootstrap sample. Required for the out-of-bag score.
+		n_jobs (int): Number of worker processes. Default is the number of CPUs, 1 trains in the current process.
+		random_state (int): Seed of the forest.
+		max_bins (int): If given, numeric features with more values are split by thresholds over at most max_bins bins,
+			placed once on all training rows and shared by every tree.
+		"""
+		self.n_trees = n_trees
+		self.max_features = max_features
+		self.use_gini = use_gini
+		self.bootstrap = bootstrap
+		self.n_jobs = n_jobs or os.cpu_count() or 1
+		self.random_state = random_state
+		self.max_bins = max_bins
+		self.trees = []
+		self.features = []
+		self.classes = np.array([])
+		self.oob_score = None
+		self.oob_votes = None
+
+	def __len__(self) -> int:
+		return len(self.trees)
+
+	def _resolve_max_features(self, n_features: int) -> int | None:
+		"""
+		Number of features drawn at each node.
+		"""
+		if self.max_features is None:
+			return None
+		if self.max_features == 'sqrt':
+			return max(1, int(np.sqrt(n_features)))
+		if self.max_features == 'log2':
+			return max(1, int(np.log2(n_features)))
+		if isinstance(self.max_features, float):
+			return max(1, int(self.max_features * n_features))
+		if isinstance(self.max_features, int):
+			return max(1, min(self.max_features, n_features))
+		raise ValueError(f"Invalid max_features: {self.max_features}")
+
+	def fit(self, data: pd.DataFrame, features: list, target_attribute: str) -> 'RandomForest':
+		"""
+		Train the forest.
+
+		Parameters:
+		----------------
+		data (DataFrame): The training dataset.
+		features (list): List of feature names.
+		target_attribute (str): The name of the target attribute.
+
+		Returns:
+		----------------
+		RandomForest: The trained forest.
+		"""
+		self.features = list(features)
+		codes, categories = encode_columns(data, self.features + [target_attribute])
+		categories, self.classes = categories[:-1], categories[-1]
+		_, thresholds = bin_features(codes[:, :-1], categories, self.max_bins, np.flatnonzero(codes[:, -1] >= 0), copy=False)
+		dtype = np.min_scalar_type(-max([len(c) for c in categories] + [len(self.classes), 1]))
+		arrays = {'X': np.ascontiguousarray(codes[:, :-1], dtype=dtype), 'y': codes[:, -1].astype(dtype)}
+		seeds = np.random.SeedSequence(self.random_state).generate_state(self.n_trees).tolist()
+		settings = (self.features, categories, self.classes, self.use_gini, self._resolve_max_features(len(self.features)), thresholds)
+
+		if self.n_jobs == 1 or self.n_trees == 1:
+			try:
+				_attach({}, *settings)
+				_shared.update(arrays)
+				results = [_fit_tree(seed, self.bootstrap) for seed in seeds]
+			finally:
+				_shared.clear()
+		else:
+			blocks, segments = {}, []
+			try:
+				for name, array in arrays.items():
+					shm = SharedMemory(create=True, size=max(array.nbytes, 1))
+					segments.append(shm)
+					np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+					blocks[name] = (shm.name, array.shape, array.dtype)
+				with Pool(min(self.n_jobs, self.n_trees), initializer=_attach, initargs=(blocks, *settings)) as pool:
+					results = pool.starmap(_fit_tree, [(seed, self.bootstrap) for seed in seeds])
+			finally:
+				for shm in segments:
+					shm.close()
+					shm.unlink()
+
+		self.trees = []
+		for root, _, _ in results:
+			tree = ID3DecisionTree(use_gini=self.use_gini)
+			tree.root, tree.features, tree.categories, tree.classes = root, self.features, categories, self.classes
+			self.trees.append(tree)
+
+		# Out-of-bag votes: every row is scored by the trees that did not see it
+		self.oob_votes = np.zeros((len(data), len(self.classes)), dtype=np.int64)
+		for _, oob, predictions in results:
+			self.oob_votes[oob, predictions] += 1 # a tree scores every out-of-bag row once
+		voted = self.oob_votes.sum(axis=1) > 0
+		y = arrays['y']
+		self.oob_score = float(np.mean(np.argmax(self.oob_votes[voted], axis=1) == y[voted])) if voted.any() else None
+		return self
+
+	def votes(self, data: pd.DataFrame, batch_size: int = 65536, random_state: int | None = None) -> np.ndarray:
+		"""
+		Count the votes of the trees for every class.
+
+		Feature columns are converted once and every tree scores whole batches of rows.
+
+		Parameters:
+		----------------
+		data (DataFrame): The rows to classify.
+		batch_size (int): Number of rows scored at a time.
+		random_state (int): Seed of the random branch chosen for unseen values at nodes without a majority class.
+
+		Returns:
+		----------------
+		ndarray: (n_rows x n_classes) number of trees voting for each class.
+		"""
+		rng = np.random.default_rng(random_state)
+		columns = {name: pd.to_numeric(data[name], errors='coerce').to_numpy(dtype=np.float64) for name in self.features}
+		compiled = [tree.compile() for tree in self.trees]
+		votes = np.zeros((len(data), len(self.classes)), dtype=np.int64)
+
+		for start in range(0, len(data), batch_size):
+			batch = {name: column[start:start + batch_size] for name, column in columns.items()}
+			n_rows = min(batch_size, len(data) - start)
+			offsets = np.arange(n_rows) * len(self.classes)
+			for tree in compiled:
+				predictions = tree.predict_codes(tree.encode_values(batch, n_rows), rng)
+				flat = offsets + np.searchsorted(self.classes, predictions)
+				votes[start:start + n_rows] += np.bincount(flat, minlength=n_rows * len(self.classes)).reshape(n_rows, -1)
+		return votes
+
+	def predict(self, data: pd.DataFrame, batch_size: int = 65536, random_state: int | None = None) -> pd.Series:
+		"""
+		Predict the class labels for a given dataset by majority vote of the trees.
+
+		Parameters:
+		----------------
+		data (DataFrame): The rows to classify.
+		batch_size (int): Number of rows scored at a time.
+		random_state (int): Seed of the random branch chosen for unseen values at nodes without a majority class.
+
+		Returns:
+		----------------
+		Series: A Series containing the predicted class labels.
+		"""
+		votes = self.votes(data, batch_size, random_state)
+		return pd.Series(self.classes[np.argmax(votes, axis=1)], name="c")
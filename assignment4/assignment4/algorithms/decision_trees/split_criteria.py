@@ -0,0 +1,222 @@
+import numpy as np
+import pandas as pd
+
+def encode_columns(data: pd.DataFrame, columns: list) -> tuple[np.ndarray, list[np.ndarray]]:
+	"""
+	Integer-encode columns of a dataframe in one pass per column.
+
+	Parameters:
+	----------------
+	data (DataFrame): The dataset.
+	columns (list): Names of the columns to encode.
+
+	Returns:
+	----------------
+	tuple: The (n_rows x n_columns) int64 code matrix, with -1 for missing values,
+	and the sorted categories of every column (code k stands for categories[j][k]).
+	"""
+	codes = np.full((len(data), len(columns)), -1, dtype=np.int64)
+	categories = []
+	for j, column in enumerate(columns):
+		values = data[column].to_numpy()
+		present = ~pd.isna(values)
+		column_categories, inverse = np.unique(values[present], return_inverse=True)
+		codes[present, j] = inverse
+		categories.append(column_categories)
+	return codes, categories
+
+def quantile_bins(codes: np.ndarray, n_categories: int, max_bins: int) -> np.ndarray:
+	"""
+	Group the sorted categories of a continuous feature into at most max_bins bins of about equal row counts.
+
+	Parameters:
+	----------------
+	codes (ndarray): Integer-encoded values of the feature on the training rows (-1 for missing values).
+	n_categories (int): Number of categories of the feature.
+	max_bins (int): Maximum number of bins.
+
+	Returns:
+	----------------
+	ndarray: The bin of every category, non-decreasing from 0 to n_bins - 1.
+	"""
+	frequencies = np.bincount(codes[codes >= 0], minlength=n_categories)
+	before = np.cumsum(frequencies) - frequencies # rows strictly below each category
+	bins = np.minimum(before * max_bins // max(frequencies.sum(), 1), max_bins - 1)
+	return np.unique(bins, return_inverse=True)[1] # consecutive bin ids
+
+def bin_features(X: np.ndarray, categories: list[np.ndarray], max_bins: int | None, rows: np.ndarray | None = None,
+				 copy: bool = True) -> tuple[np.ndarray, list[np.ndarray | None]]:
+	"""
+	Quantise the numeric features with more than max_bins values into bins of about equal row counts.
+
+	Parameters:
+	----------------
+	X (ndarray): (n_rows x n_features) integer-encoded features, -1 for missing values.
+	categories (list): Sorted values of every feature.
+	max_bins (int): Maximum number of bins, None to leave every feature as is.
+	rows (ndarray): Rows used to place the bin edges. Default is all rows.
+	copy (bool): Whether to write the bins into a copy of X (made only if a feature is quantised) instead of X itself.
+
+	Returns:
+	----------------
+	tuple: X with the codes of the quantised features replaced by their bin, and per feature the upper
+	value of every bin (None for features split by value).
+	"""
+	thresholds = [None] * len(categories)
+	binned = X
+	for f, values in enumerate(categories):
+		if max_bins is None or len(values) <= max_bins or not np.issubdtype(values.dtype, np.number):
+			continue
+		column = X[:, f] if rows is None else X[rows, f]
+		bins = quantile_bins(column, len(values), max_bins)
+		last = np.flatnonzero(np.diff(bins, append=bins[-1] + 1)) # last category of every bin
+		thresholds[f] = values[last]
+		if copy and binned is X:
+			binned = X.copy()
+		binned[:, f] = np.where(X[:, f] >= 0, bins[np.maximum(X[:, f], 0)], -1)
+	return binned, thresholds
+
+def contingency_tensor(X: np.ndarray, y: np.ndarray, n_values: int, n_classes: int) -> np.ndarray:
+	"""
+	Count rows per (feature, value, class) with a single bincount.
+
+	Parameters:
+	----------------
+	X (ndarray): (n_rows x n_features) integer-encoded features, -1 for missing values.
+	y (ndarray): Integer-encoded classes of the rows.
+	n_values (int): Upper bound on the number of values of a feature.
+	n_classes (int): Number of classes.
+
+	Returns:
+	----------------
+	ndarray: counts[f, v, c], the number of rows with X[:, f] == v and y == c. Missing values are not counted.
+	"""
+	n_features = X.shape[1]
+	X, y = X.astype(np.int64, copy=False), y.astype(np.int64, copy=False) # narrow code dtypes would overflow
+	flat = (np.arange(n_features) * (n_values * n_classes))[None, :] + X * n_classes + y[:, None]
+	flat = flat[X >= 0]
+	counts = np.bincount(flat, minlength=n_features * n_values * n_classes)
+	return counts.reshape(n_features, n_values, n_classes)
+
+def _entropy(counts: np.ndarray) -> np.ndarray:
+	"""
+	Entropy (base 2) of class counts along the last axis.
+	"""
+	totals = counts.sum(axis=-1, keepdims=True)
+	with np.errstate(divide='ignore', invalid='ignore'):
+		p = np.where(totals > 0, counts / totals, 0.0)
+	logs = np.log2(p, where=p > 0, out=np.zeros_like(p))
+	return -(p * logs).sum(axis=-1)
+
+def _gini(counts: np.ndarray) -> np.ndarray:
+	"""
+	Gini impurity of class counts along the last axis.
+	"""
+	totals = counts.sum(axis=-1, keepdims=True)
+	with np.errstate(divide='ignore', invalid='ignore'):
+		p = np.where(totals > 0, counts / totals, 0.0)
+	return 1 - (p ** 2).sum(axis=-1)
+
+def information_gains(counts: np.ndarray) -> np.ndarray:
+	"""
+	Information gain of splitting on every feature of a contingency tensor.
+
+	Parameters:
+	----------------
+	counts (ndarray): (n_features x n_values x n_classes) contingency tensor.
+
+	Returns:
+	----------------
+	ndarray: The information gain of each feature (-inf for features without any value).
+	"""
+	value_totals = counts.sum(axis=2) # (features, values)
+	totals = value_totals.sum(axis=1) # (features,)
+	with np.errstate(divide='ignore', invalid='ignore'):
+		weighted = (value_totals * _entropy(counts)).sum(axis=1) / totals
+		gains = _entropy(counts.sum(axis=1)) - weighted
+	return np.where(totals > 0, gains, -np.inf)
+
+def gini_indices(counts: np.ndarray) -> np.ndarray:
+	"""
+	Weighted Gini index of splitting on every feature of a contingency tensor.
+
+	Parameters:
+	----------------
+	counts (ndarray): (n_features x n_values x n_classes) contingency tensor.
+
+	Returns:
+	----------------
+	ndarray: The Gini index of each feature (inf for features without any value).
+	"""
+	value_totals = counts.sum(axis=2)
+	totals = value_totals.sum(axis=1)
+	with np.errstate(divide='ignore', invalid='ignore'):
+		indices = (value_totals * _gini(counts)).sum(axis=1) / totals
+	return np.where(totals > 0, indices, np.inf)
+
+def threshold_tensor(counts: np.ndarray) -> np.ndarray:
+	"""
+	Class counts on both sides of every threshold of binned features, from cumulative histograms.
+
+	Parameters:
+	----------------
+	counts (ndarray): (n_features x n_bins x n_classes) class histograms of binned features.
+
+	Returns:
+	----------------
+	ndarray: (n_features x n_bins - 1 x 2 x n_classes) tensor; [f, b, 0] counts the rows with bin <= b and [f, b, 1] the others.
+	"""
+	left = np.cumsum(counts, axis=1)[:, :-1]
+	right = counts.sum(axis=1, keepdims=True) - left
+	return np.stack((left, right), axis=2)
+
+def split_scores(counts: np.ndarray, use_gini: bool = False) -> np.ndarray:
+	"""
+	Score of every split of a contingency tensor, higher is better.
+
+	Parameters:
+	----------------
+	counts (ndarray): (n_splits x n_values x n_classes) contingency tensor.
+	use_gini (bool): Whether to score with the (negated) Gini index instead of the Information Gain.
+
+	Returns:
+	----------------
+	ndarray: The score of each split (-inf for splits without any row).
+	"""
+	if use_gini:
+		return -gini_indices(counts)
+	return information_gains(counts)
+
+def impurity_decreases(counts: np.ndarray, use_gini: bool = False) -> np.ndarray:
+	"""
+	Decrease of impurity (entropy or Gini impurity) obtained by every split of a contingency tensor.
+
+	Parameters:
+	----------------
+	counts (ndarray): (n_splits x n_values x n_classes) contingency tensor.
+	use_gini (bool): Whether to measure the impurity with the Gini impurity instead of the entropy.
+
+	Returns:
+	----------------
+	ndarray: The impurity decrease of each split (-inf for splits without any row).
+	"""
+	if use_gini:
+		return _gini(counts.sum(axis=1)) - gini_indices(counts)
+	return information_gains(counts)
+
+def best_split(counts: np.ndarray, use_gini: bool = False) -> int:
+	"""
+	Index of the best feature to split on, evaluating only the selected criterion.
+
+	Parameters:
+	----------------
+	counts (ndarray): (n_features x n_values x n_classes) contingency tensor.
+	use_gini (bool): Whether to minimise the Gini index instead of maximising the Information Gain.
+
+	Returns:
+	----------------
+	int: Index of the best feature (the first one on ties).
+	"""
+	if use_gini:
+		return int(np.argmin(gini_indices(counts)))
+	return int(np.argmax(information_gains(counts)))
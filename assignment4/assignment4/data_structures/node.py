@@ -5,10 +5,16 @@ class Node:
     Attributes:
     attribute (str): The attribute used for splitting at this node.
     children (dict): A dictionary mapping attribute values to child nodes or class labels.
+    threshold (float): For a split on a continuous attribute, rows with a value <= threshold go to
+    children[0] and the others to children[1]. None for a split with one child per value.
+    majority (int): The most frequent class of the training rows reaching the node, used when it is pruned
+    and predicted for rows without a branch at this node.
     """
-    def __init__(self, attribute):
+    def __init__(self, attribute, threshold=None):
         self.attribute = attribute
         self.children = {}
+        self.threshold = threshold
+        self.majority = None
         
     def __str__(self) -> str:
         """
@@ -17,6 +23,8 @@ class Node:
         Returns:
         str: A string representation of the node.
         """
+        if self.threshold is not None:
+            return f"Node(attribute={self.attribute}, threshold={self.threshold}, children={self.children})"
         return f"Node(attribute={self.attribute}, children={self.children})"
     
     def __repr__(self) -> str:
@@ -40,4 +48,4 @@ class Node:
         ----------------
         bool: Whether the two nodes are equal.
         """
-        return self.attribute == other.attribute and self.children == other.children
\ No newline at end of file
+        return self.attribute == other.attribute and self.threshold == other.threshold and self.children == other.children
\ No newline at end of file
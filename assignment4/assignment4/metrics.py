@@ -0,0 +1,214 @@
+"""
+This file contains classification metrics computed from a confusion matrix.
+"""
+
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class ConfusionMatrix:
+    """Multi-class confusion matrix built with one `np.bincount` per batch of predictions.
+
+    Every metric is derived from the matrix, so accuracy, precision, recall and F1 of all classes
+    cost a single pass over the predictions. Batches can be accumulated with `update` to evaluate
+    predictions that do not fit in memory at once.
+
+    Attributes
+    ----------
+    labels : np.ndarray
+        The sorted class labels seen so far (or given up front).
+    matrix : np.ndarray
+        matrix[i, j] is the number of rows of true class labels[i] predicted as labels[j].
+    """
+
+    def __init__(self, labels: Optional[Iterable] = None):
+        """
+        Parameters
+        ----------
+        labels : Iterable, optional
+            The class labels. If not given, they are collected from the data as it is added.
+        """
+        self.labels = np.unique(np.asarray(list(labels))) if labels is not None else np.array([])
+        self.fixed = labels is not None
+        self.matrix = np.zeros((len(self.labels), len(self.labels)), dtype=np.int64)
+
+    @classmethod
+    def from_predictions(cls, y_true, y_pred, labels: Optional[Iterable] = None) -> "ConfusionMatrix":
+        """Build the confusion matrix of a set of predictions.
+
+        Parameters
+        ----------
+        y_true : array-like
+            The actual target values.
+        y_pred : array-like
+            The predicted values.
+        labels : Iterable, optional
+            The class labels.
+
+        Returns
+        -------
+        ConfusionMatrix
+            The confusion matrix.
+        """
+        return cls(labels).update(y_true, y_pred)
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[Tuple], labels: Optional[Iterable] = None) -> "ConfusionMatrix":
+        """Accumulate the confusion matrix over an iterable of (y_true, y_pred) chunks.
+
+        Parameters
+        ----------
+        chunks : Iterable[Tuple]
+            Pairs of actual and predicted values, e.g. produced batch by batch.
+        labels : Iterable, optional
+            The class labels.
+
+        Returns
+        -------
+        ConfusionMatrix
+            The confusion matrix of all chunks.
+        """
+        confusion = cls(labels)
+        for y_true, y_pred in chunks:
+            confusion.update(y_true, y_pred)
+        return confusion
+
+    def _grow(self, values: np.ndarray) -> None:
+        """Add the unseen labels of `values`, keeping the labels sorted."""
+        new = np.setdiff1d(values, self.labels)
+        if len(new) == 0:
+            return
+        if self.fixed:
+            raise ValueError(f"Unknown labels: {new.tolist()}")
+        labels = np.union1d(self.labels, new) if len(self.labels) else new
+        position = np.searchsorted(labels, self.labels)
+        matrix = np.zeros((len(labels), len(labels)), dtype=np.int64)
+        matrix[np.ix_(position, position)] = self.matrix
+        self.labels, self.matrix = labels, matrix
+
+    def update(self, y_true, y_pred) -> "ConfusionMatrix":
+        """Add a batch of predictions to the matrix.
+
+        Parameters
+        ----------
+        y_true : array-like
+            The actual target values.
+        y_pred : array-like
+            The predicted values, in the same order.
+
+        Returns
+        -------
+        ConfusionMatrix
+            The updated confusion matrix (self).
+        """
+        y_true, y_pred = np.asarray(y_true).ravel(), np.asarray(y_pred).ravel()
+        if len(y_true) != len(y_pred):
+            raise ValueError("y_true and y_pred must have the same length")
+        if len(y_true) == 0:
+            return self
+        self._grow(np.unique(np.concatenate((np.unique(y_true), np.unique(y_pred)))))
+
+        n = len(self.labels)
+        flat = np.searchsorted(self.labels, y_true) * n + np.searchsorted(self.labels, y_pred)
+        self.matrix += np.bincount(flat, minlength=n * n).reshape(n, n)
+        return self
+
+    def __add__(self, other: "ConfusionMatrix") -> "ConfusionMatrix":
+        """Merge the confusion matrices of two disjoint sets of predictions."""
+        merged = ConfusionMatrix()
+        merged._grow(np.union1d(self.labels, other.labels))
+        for confusion in (self, other):
+            position = np.searchsorted(merged.labels, confusion.labels)
+            merged.matrix[np.ix_(position, position)] += confusion.matrix
+        return merged
+
+    @property
+    def total(self) -> int:
+        return int(self.matrix.sum())
+
+    def support(self) -> np.ndarray:
+        """Number of rows of every true class."""
+        return self.matrix.sum(axis=1)
+
+    def accuracy(self) -> float:
+        """Fraction of correct predictions."""
+        return float(np.trace(self.matrix) / self.total) if self.total else 0.0
+
+    def _index(self, label) -> Optional[int]:
+        """Position of a label in the matrix, None if it was never seen."""
+        i = int(np.searchsorted(self.labels, label)) if len(self.labels) else 0
+        return i if i < len(self.labels) and self.labels[i] == label else None
+
+    def _per_class(self, counts: np.ndarray) -> np.ndarray:
+        """Diagonal divided by `counts`, 0 where `counts` is 0."""
+        diagonal = np.diag(self.matrix).astype(np.float64)
+        return np.divide(diagonal, counts, out=np.zeros_like(diagonal), where=counts > 0)
+
+    def _metric(self, per_class: np.ndarray, label, average: Optional[str]):
+        if label is not None:
+            i = self._index(label)
+            return float(per_class[i]) if i is not None else 0.0
+        if average == "macro":
+            return float(per_class.mean()) if len(per_class) else 0.0
+        if average == "micro":
+            return self.accuracy() # every row has exactly one true and one predicted class
+        if average is None:
+            return per_class
+        raise ValueError(f"Unknown average: {average}")
+
+    def precision(self, label=None, average: Optional[str] = "macro"):
+        """Precision of one class, or averaged over the classes.
+
+        Parameters
+        ----------
+        label : optional
+            The positive class. If given, `average` is ignored.
+        average : str, optional
+            'macro' (unweighted mean over classes), 'micro' (over all rows) or None for the array of every class.
+
+        Returns
+        -------
+        float or np.ndarray
+            The precision.
+        """
+        return self._metric(self._per_class(self.matrix.sum(axis=0)), label, average)
+
+    def recall(self, label=None, average: Optional[str] = "macro"):
+        """Recall of one class, or averaged over the classes (see `precision`)."""
+        return self._metric(self._per_class(self.matrix.sum(axis=1)), label, average)
+
+    def f1(self, label=None, average: Optional[str] = "macro"):
+        """F1 score of one class, or averaged over the classes (see `precision`)."""
+        precision = self._per_class(self.matrix.sum(axis=0))
+        recall = self._per_class(self.matrix.sum(axis=1))
+        total = precision + recall
+        per_class = np.divide(2 * precision * recall, total, out=np.zeros_like(total), where=total > 0)
+        return self._metric(per_class, label, average)
+
+    def scores(self, label=1, average: Optional[str] = "macro") -> dict:
+        """All metrics at once, with the keys expected by `utils.render_scores`.
+
+        Parameters
+        ----------
+        label : optional
+            The positive class, default 1. If None, precision, recall and F1 are averaged.
+        average : str, optional
+            The average used when `label` is None.
+
+        Returns
+        -------
+        dict
+            Dictionary with keys 'Accuracy', 'Precision', 'Recall', 'F1'.
+        """
+        return {
+            "Accuracy": self.accuracy(),
+            "Precision": self.precision(label, average),
+            "Recall": self.recall(label, average),
+            "F1": self.f1(label, average),
+        }
+
+    def to_frame(self) -> pd.DataFrame:
+        """The matrix as a DataFrame indexed by true class, with one column per predicted class."""
+        return pd.DataFrame(self.matrix, index=pd.Index(self.labels, name="true"), columns=pd.Index(self.labels, name="predicted"))
@@ -4,7 +4,9 @@ This file contains utility functions for the assignment.
 
 import pandas as pd
 import numpy as np
-from IPython.display import HTML, display
+
+from assignment4.algorithms.decision_trees.split_criteria import (encode_columns, contingency_tensor, information_gains, gini_indices,)
+from assignment4.metrics import ConfusionMatrix
 
 def entropy(data: pd.DataFrame, column: str) -> float:
     """Calculate the entropy of a given column in a dataframe.
@@ -28,6 +30,12 @@ def entropy(data: pd.DataFrame, column: str) -> float:
     return entropy
 
 
+def _split_counts(data: pd.DataFrame, split_attribute: str, target_attribute: str) -> np.ndarray:
+    """Build the (1 x values x classes) contingency tensor of one attribute in a single pass."""
+    codes, categories = encode_columns(data, [split_attribute, target_attribute])
+    present = codes[:, 1] >= 0 # rows without a target value are ignored
+    return contingency_tensor(codes[present, :1], codes[present, 1], max(len(categories[0]), 1), max(len(categories[1]), 1))
+
 def information_gain(data: pd.DataFrame, split_attribute: str, target_attribute: str) -> float:
     """Calculate the Information Gain of a dataset after splitting on an attribute.
     
@@ -45,13 +53,7 @@ def information_gain(data: pd.DataFrame, split_attribute: str, target_attribute:
     float
         The Information Gain of the dataset after the split.
     """
-    total_entropy = entropy(data, target_attribute)
-    vals, counts = np.unique(data[split_attribute], return_counts=True)
-    
-    weighted_entropy = sum([(counts[i] / sum(counts)) * entropy(data.where(data[split_attribute] == vals[i]).dropna(), target_attribute) 
-                            for i in range(len(vals))])
-    
-    return total_entropy - weighted_entropy
+    return float(information_gains(_split_counts(data, split_attribute, target_attribute))[0])
 
 def gini_index(data: pd.DataFrame, split_attribute: str, target_attribute: str) -> float:
     """Calculate the Gini Index of a dataset after splitting on an attribute.
@@ -70,14 +72,7 @@ def gini_index(data: pd.DataFrame, split_attribute: str, target_attribute: str)
     float
         The Gini Index of the dataset after the split.
     """
-    vals, counts = np.unique(data[split_attribute], return_counts=True)
-
-    # Calculate the weighted Gini index
-    weighted_gini = sum([(counts[i] / sum(counts)) * (1 - sum([(len(data[(data[split_attribute] == vals[i]) & (data[target_attribute] == k)]) / counts[i])**2 
-                                                              for k in np.unique(data[target_attribute])]))
-                         for i in range(len(vals))])
-    
-    return weighted_gini
+    return float(gini_indices(_split_counts(data, split_attribute, target_attribute))[0])
 
 def accuracy(predictions: pd.Series, original_data: pd.DataFrame) -> float:
     """Calculate the accuracy of predictions against actual data.
@@ -94,9 +89,7 @@ def accuracy(predictions: pd.Series, original_data: pd.DataFrame) -> float:
     float
         The accuracy of the predictions.
     """
-    correct = (predictions == original_data).sum()
-    total = predictions.shape[0]
-    return correct / total
+    return ConfusionMatrix.from_predictions(original_data, predictions).accuracy()
 
 def precision(predictions: pd.Series, original_data: pd.DataFrame) -> float:
     """Calculate the precision of predictions against actual data.
@@ -113,9 +106,7 @@ def precision(predictions: pd.Series, original_data: pd.DataFrame) -> float:
     float
         The precision of the predictions.
     """
-    true_positives = ((predictions == 1) & (original_data == 1)).sum()
-    predicted_positives = (predictions == 1).sum()
-    return true_positives / predicted_positives if predicted_positives else 0
+    return ConfusionMatrix.from_predictions(original_data, predictions).precision(1)
 
 def recall(predictions: pd.Series, original_data: pd.DataFrame) -> float:
     """Calculate the recall of predictions against actual data.
@@ -132,9 +123,7 @@ def recall(predictions: pd.Series, original_data: pd.DataFrame) -> float:
     float
         The recall of the predictions.
     """
-    true_positives = ((predictions == 1) & (original_data == 1)).sum()
-    actual_positives = (original_data == 1).sum()
-    return true_positives / actual_positives if actual_positives else 0
+    return ConfusionMatrix.from_predictions(original_data, predictions).recall(1)
 
 def f1(predictions: pd.Series, original_data: pd.DataFrame) -> float:
     """Calculate the F1 score of predictions against actual data.
@@ -151,9 +140,24 @@ def f1(predictions: pd.Series, original_data: pd.DataFrame) -> float:
     float
         The F1 score of the predictions.
     """
-    prec = precision(predictions, original_data)
-    rec = recall(predictions, original_data)
-    return 2 * (prec * rec) / (prec + rec) if (prec + rec) else 0
+    return ConfusionMatrix.from_predictions(original_data, predictions).f1(1)
+
+def scores(predictions: pd.Series, original_data: pd.DataFrame) -> dict:
+    """Calculate accuracy, precision, recall and F1 of predictions from a single confusion matrix.
+    
+    Parameters
+    ----------
+    predictions : pd.Series
+        The predictions made by the model.
+    original_data : pd.DataFrame
+        The original dataframe with actual target values.
+        
+    Returns
+    -------
+    dict
+        The scores, with the keys expected by `render_scores`.
+    """
+    return ConfusionMatrix.from_predictions(original_data, predictions).scores(1)
 
 def render_scores(tree_scores: dict, forest_scores: dict):
     """Displays the performance scores of the decision tree and random forest models.
@@ -167,6 +171,8 @@ def render_scores(tree_scores: dict, forest_scores: dict):
         A dictionary containing the scores of the random forest model.
         Should have keys: 'Accuracy', 'Precision', 'Recall', 'F1'.
     """
+    from IPython.display import HTML, display # only needed in notebooks
+
     html = """
     <style>
         .score-table {
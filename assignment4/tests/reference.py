@@ -0,0 +1,80 @@
+"""
+Straightforward pandas implementations of the split criteria and of ID3, used as references by the tests.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from assignment4.data_structures.node import Node
+
+DATA = os.path.join(os.path.dirname(__file__), os.pardir, "data")
+
+
+def load(name: str) -> pd.DataFrame:
+    """Load one of the datasets of the assignment (data.csv or data_test.csv)."""
+    return pd.read_csv(os.path.join(DATA, name))
+
+
+def random_dataset(n_rows: int, n_features: int, n_values: int, seed: int, n_classes: int = 2) -> pd.DataFrame:
+    """Random categorical dataset whose class depends on the first two features, with some noise."""
+    rng = np.random.default_rng(seed)
+    X = rng.integers(0, n_values, (n_rows, n_features))
+    y = (X[:, 0] + X[:, 1] + rng.integers(0, 2, n_rows)) % n_classes
+    data = pd.DataFrame(X, columns=[f"f{i}" for i in range(n_features)])
+    data["c"] = y
+    return data
+
+
+def entropy(data: pd.DataFrame, column: str) -> float:
+    probabilities = data[column].value_counts() / len(data)
+    return float(sum(probabilities * -np.log2(probabilities)))
+
+
+def information_gain(data: pd.DataFrame, split_attribute: str, target_attribute: str) -> float:
+    groups = [group for _, group in data.groupby(split_attribute)]
+    return entropy(data, target_attribute) - sum(len(group) / len(data) * entropy(group, target_attribute) for group in groups)
+
+
+def gini_index(data: pd.DataFrame, split_attribute: str, target_attribute: str) -> float:
+    total = 0.0
+    for _, group in data.groupby(split_attribute):
+        probabilities = group[target_attribute].value_counts() / len(group)
+        total += len(group) / len(data) * (1 - float((probabilities ** 2).sum()))
+    return total
+
+
+def build_tree(data: pd.DataFrame, features: list, target_attribute: str, use_gini: bool = False, parent_node=None):
+    """ID3 on DataFrame subsets, one branch per value, as the tree was originally built."""
+    classes, counts = np.unique(data[target_attribute], return_counts=True)
+    if len(classes) <= 1:
+        return int(classes[0]) if len(classes) else parent_node
+    if len(features) == 0:
+        return parent_node
+
+    parent_node = int(classes[np.argmax(counts)])
+    if use_gini:
+        indices = [gini_index(data, feature, target_attribute) for feature in features]
+        best = features[int(np.argmin(indices))]
+    else:
+        gains = [information_gain(data, feature, target_attribute) for feature in features]
+        best = features[int(np.argmax(gains))]
+
+    tree = Node(best)
+    remaining = [feature for feature in features if feature != best]
+    for value, subset in data.groupby(best):
+        tree.children[int(value)] = build_tree(subset, remaining, target_attribute, use_gini, parent_node)
+    return tree
+
+
+def traverse(node, row: dict):
+    """Class predicted by a tree for a row, the majority class of the node where its value has no branch."""
+    while isinstance(node, Node) and node.children:
+        value = row[node.attribute]
+        if node.threshold is not None and not pd.isna(value):
+            value = int(value > node.threshold)
+        if value not in node.children:
+            return node.majority
+        node = node.children[value]
+    return node
@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from assignment4.algorithms.decision_trees.id3 import ID3DecisionTree
+from assignment4.algorithms.decision_trees.random_forest import RandomForest
+from assignment4.algorithms.decision_trees.split_criteria import encode_columns, quantile_bins, bin_features
+from assignment4.data_structures.node import Node
+from tests import reference
+
+
+def continuous_dataset(n_rows: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    data = pd.DataFrame({"x": rng.normal(size=n_rows).round(2), "z": rng.exponential(size=n_rows).round(3), "k": rng.integers(0, 3, n_rows)})
+    data["c"] = ((data.x - data.z + 0.3 * data.k > 0) ^ (rng.random(n_rows) < 0.1)).astype(int)
+    return data
+
+
+class RecountingTree(ID3DecisionTree):
+    """Binned ID3 counting the histograms of every node from its rows instead of subtracting them."""
+    def _build(self, X, y, rows, feature_ids, parent_node, counts=None, depth=0):
+        return super()._build(X, y, rows, feature_ids, parent_node, None, depth)
+
+
+@pytest.mark.parametrize("max_bins", [1, 2, 7, 32])
+def test_quantile_bins(max_bins):
+    codes = np.random.default_rng(0).integers(-1, 50, 1000)
+    bins = quantile_bins(codes, 50, max_bins)
+    assert len(bins) == 50 and bins[0] == 0
+    assert set(np.diff(bins)) <= {0, 1} and bins[-1] < max_bins # consecutive, non-decreasing ids
+    sizes = np.bincount(bins[codes[codes >= 0]])
+    largest = np.bincount(codes[codes >= 0]).max()
+    assert sizes.max() <= len(codes[codes >= 0]) / max_bins + largest
+
+
+def test_bin_features_keeps_the_order_of_values():
+    data = continuous_dataset(400, 1)
+    data.loc[::7, "x"] = np.nan
+    codes, categories = encode_columns(data, ["x", "z", "k"])
+    binned, thresholds = bin_features(codes, categories, 8)
+    assert thresholds[2] is None and np.array_equal(binned[:, 2], codes[:, 2]) # few values: split by value
+    for f in (0, 1):
+        assert len(thresholds[f]) <= 8 and thresholds[f][-1] == categories[f][-1]
+        values = data.iloc[:, f].to_numpy()
+        assert np.array_equal(binned[:, f] < 0, np.isnan(values))
+        present = binned[:, f] >= 0
+        for b, threshold in enumerate(thresholds[f]):
+            assert np.array_equal(binned[present, f] <= b, values[present] <= threshold)
+
+
+def test_bin_features_copy():
+    codes, categories = encode_columns(continuous_dataset(100, 2), ["x", "z", "k"])
+    original = codes.copy()
+    binned, _ = bin_features(codes, categories, 4)
+    assert np.array_equal(codes, original) and not np.array_equal(binned, original)
+    unchanged, _ = bin_features(codes, categories, None)
+    assert unchanged is codes
+    in_place, _ = bin_features(codes, categories, 4, copy=False)
+    assert in_place is codes and np.array_equal(codes, binned)
+
+
+def test_bin_edges_come_from_the_given_rows():
+    codes, categories = encode_columns(continuous_dataset(200, 3), ["x"])
+    rows = np.flatnonzero(codes[:, 0] < 50)
+    _, thresholds = bin_features(codes, categories, 4, rows=rows)
+    assert np.array_equal(thresholds[0], bin_features(codes[rows], categories, 4)[1][0])
+
+
+def test_enough_bins_is_unbinned():
+    data = reference.random_dataset(300, 5, 6, seed=3)
+    binned, unbinned = ID3DecisionTree(max_bins=6), ID3DecisionTree()
+    binned.build_tree(data, list(data.columns[:-1]), "c")
+    unbinned.build_tree(data, list(data.columns[:-1]), "c")
+    assert binned.root == unbinned.root and all(t is None for t in binned.thresholds)
+
+
+@pytest.mark.parametrize("use_gini", [False, True])
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_histogram_subtraction_is_exact(use_gini, seed):
+    data = continuous_dataset(500, seed)
+    trees = [cls(use_gini=use_gini, max_bins=16) for cls in (ID3DecisionTree, RecountingTree)]
+    for tree in trees:
+        tree.build_tree(data, list(data.columns[:-1]), "c")
+    assert trees[0].root == trees[1].root
+
+
+@pytest.mark.parametrize("use_gini", [False, True])
+def test_root_is_the_best_threshold(use_gini):
+    data = continuous_dataset(400, 4)[["x", "z", "c"]]
+    tree = ID3DecisionTree(use_gini=use_gini, max_bins=10)
+    tree.build_tree(data, ["x", "z"], "c")
+
+    def score(feature, threshold):
+        sides = data.assign(side=(data[feature] > threshold).astype(int))
+        if use_gini:
+            return -reference.gini_index(sides, "side", "c")
+        return reference.information_gain(sides, "side", "c")
+
+    scores = {(f, t.item()): score(f, t) for f, thresholds in zip(["x", "z"], tree.thresholds) for t in thresholds[:-1]}
+    assert isinstance(tree.root, Node) and tree.root.threshold in tree.thresholds[["x", "z"].index(tree.root.attribute)]
+    assert scores[tree.root.attribute, tree.root.threshold] == pytest.approx(max(scores.values()))
+
+
+def test_binned_forest_pool_matches_serial():
+    data = continuous_dataset(300, 5)
+    forests = [RandomForest(n_trees=6, max_bins=8, random_state=0, n_jobs=n_jobs).fit(data, ["x", "z", "k"], "c") for n_jobs in (1, 2)]
+    assert [tree.root for tree in forests[0].trees] == [tree.root for tree in forests[1].trees]
+    assert forests[0].oob_score == forests[1].oob_score
@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from assignment4.algorithms.decision_trees.compiled_tree import CompiledTree
+from assignment4.algorithms.decision_trees.id3 import ID3DecisionTree
+from assignment4.data_structures.node import Node
+from tests import reference
+
+
+def outcomes(node, row: dict) -> set:
+    """Every class the tree can predict for a row, following all branches where its value has none."""
+    if not isinstance(node, Node) or not node.children:
+        return {node}
+    value = row[node.attribute]
+    if node.threshold is not None and not pd.isna(value):
+        value = int(value > node.threshold)
+    children = [node.children[value]] if value in node.children else list(node.children.values())
+    return set().union(*(outcomes(child, row) for child in children))
+
+
+def continuous_dataset(n_rows: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    data = pd.DataFrame({"x": rng.normal(size=n_rows).round(2), "k": rng.integers(0, 3, n_rows), "z": rng.normal(size=n_rows)})
+    data["c"] = ((data.x + data.k * 0.5 > 0.3) ^ (rng.random(n_rows) < 0.1)).astype(int)
+    return data
+
+
+@pytest.fixture(params=["categorical", "binned"])
+def trained(request):
+    if request.param == "binned":
+        data = continuous_dataset(500, 0)
+        tree = ID3DecisionTree(max_bins=16)
+    else:
+        data = reference.load("data.csv")
+        tree = ID3DecisionTree()
+    tree.build_tree(data, list(data.columns[:-1]), "c")
+    return tree, data
+
+
+def test_training_rows_match_traversal(trained):
+    tree, data = trained
+    expected = [reference.traverse(tree.root, row) for row in data.to_dict("records")]
+    assert tree.predict(data).tolist() == expected
+
+
+def test_unseen_values_get_the_majority_class(trained):
+    tree, data = trained
+    test = data.copy()
+    test.loc[::5, test.columns[0]] = 99 # a value without a branch (above every threshold for binned trees)
+    test.loc[1::5, test.columns[1]] = np.nan
+    expected = [reference.traverse(tree.root, row) for row in test.to_dict("records")]
+    assert tree.predict(test).tolist() == expected
+    assert tree.predict(test).tolist() == tree.predict(test).tolist()
+
+
+def test_nodes_without_majority_take_an_existing_branch():
+    data = reference.load("data.csv")
+    root = reference.build_tree(data, list(data.columns[:-1]), "c") # nodes without majority class
+    test = reference.load("data_test.csv")
+    test.loc[::5, "A"] = 99
+    test.loc[1::5, "B"] = np.nan
+    compiled = CompiledTree.from_tree(root)
+    predictions = compiled.predict(test, np.random.default_rng(0))
+    for row, prediction in zip(test.to_dict("records"), predictions):
+        assert prediction in outcomes(root, row)
+
+
+def test_round_trip_to_nodes(trained):
+    tree, _ = trained
+    compiled = CompiledTree.from_tree(tree.root)
+    assert compiled.n_nodes > 1
+    assert compiled.to_tree() == tree.root
+
+
+def test_single_leaf():
+    compiled = CompiledTree.from_tree(1)
+    assert compiled.predict(pd.DataFrame({"a": [0, 1, 2]})).tolist() == [1, 1, 1]
+    assert compiled.to_tree() == 1
+
+
+def test_compiled_tree_is_rebuilt_with_the_tree():
+    data = reference.load("data.csv")
+    tree = ID3DecisionTree(max_depth=1)
+    tree.build_tree(data, list(data.columns[:-1]), "c")
+    shallow = tree.compile()
+    tree.max_depth = None
+    tree.build_tree(data, list(data.columns[:-1]), "c")
+    assert tree.compile() is not shallow and tree.compile().n_nodes > shallow.n_nodes
+
+
+def test_predictions_are_repeatable_without_a_generator():
+    data = reference.load("data.csv")
+    compiled = CompiledTree.from_tree(reference.build_tree(data, list(data.columns[:-1]), "c"))
+    test = reference.load("data_test.csv")
+    test.loc[::3, "A"] = 99
+    assert compiled.predict(test).tolist() == compiled.predict(test).tolist()
+
+
+@pytest.mark.parametrize("data", [
+    pd.DataFrame({"a": [], "c": []}), # no rows
+    pd.DataFrame({"c": [0, 1, 1]}), # no features
+])
+def test_trees_without_a_class_are_rejected(data):
+    tree = ID3DecisionTree()
+    tree.build_tree(data, list(data.columns[:-1]), "c")
+    with pytest.raises(ValueError, match="without a class"):
+        tree.predict(data)
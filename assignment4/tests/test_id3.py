@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from assignment4.algorithms.decision_trees.id3 import ID3DecisionTree
+from assignment4.algorithms.decision_trees.split_criteria import encode_columns
+from tests import reference
+
+
+@pytest.mark.parametrize("use_gini", [False, True])
+@pytest.mark.parametrize("seed", [None, 0, 1, 2, 3])
+def test_tree_matches_reference(use_gini, seed):
+    data = reference.load("data.csv") if seed is None else reference.random_dataset(200, 5, 3, seed, n_classes=3)
+    features = list(data.columns[:-1])
+    tree = ID3DecisionTree(use_gini=use_gini)
+    tree.build_tree(data, features, "c")
+    assert tree.root == reference.build_tree(data, features, "c", use_gini)
+
+
+def test_bootstrap_rows_match_resampled_data():
+    data = reference.random_dataset(200, 5, 3, seed=4)
+    features = list(data.columns[:-1])
+    rows = np.random.default_rng(0).integers(0, len(data), len(data))
+    codes, categories = encode_columns(data, features + ["c"])
+    tree = ID3DecisionTree()
+    tree.build_encoded(codes[:, :-1], codes[:, -1], features, categories[:-1], categories[-1], rows=rows)
+    assert tree.root == reference.build_tree(data.iloc[rows], features, "c") # repeated rows weigh as much as copies
+
+
+def test_rows_without_target_are_ignored():
+    data = reference.random_dataset(200, 4, 3, seed=5).astype({"c": float})
+    data.loc[::7, "c"] = np.nan
+    features = list(data.columns[:-1])
+    tree = ID3DecisionTree()
+    tree.build_tree(data, features, "c")
+    assert tree.root == reference.build_tree(data.dropna(), features, "c")
+
+
+def test_training_rows_are_fitted():
+    data = reference.load("data.csv")
+    tree = ID3DecisionTree()
+    tree.build_tree(data, list(data.columns[:-1]), "c")
+    consistent = data.groupby(list(data.columns[:-1]))["c"].transform("nunique") == 1 # rows without a conflicting duplicate
+    assert (tree.predict(data)[consistent].to_numpy() == data["c"][consistent].to_numpy()).all()
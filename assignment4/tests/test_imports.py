@@ -0,0 +1,14 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+
+@pytest.mark.parametrize("module", ["assignment4.utils", "assignment4.algorithms.decision_trees.id3",
+                                    "assignment4.algorithms.decision_trees.random_forest"])
+def test_import_does_not_load_display_libraries(module):
+    code = f"import sys, {module}; print(sorted(m for m in ('IPython', 'anytree', 'matplotlib') if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], cwd=os.path.dirname(os.path.dirname(__file__)),
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from assignment4 import utils
+from assignment4.metrics import ConfusionMatrix
+
+
+def counts(y_true, y_pred, label):
+    true_positives = int(((y_pred == label) & (y_true == label)).sum())
+    return true_positives, int((y_pred == label).sum()), int((y_true == label).sum())
+
+
+def precision(y_true, y_pred, label):
+    true_positives, predicted, _ = counts(y_true, y_pred, label)
+    return true_positives / predicted if predicted else 0.0
+
+
+def recall(y_true, y_pred, label):
+    true_positives, _, actual = counts(y_true, y_pred, label)
+    return true_positives / actual if actual else 0.0
+
+
+def f1(y_true, y_pred, label):
+    p, r = precision(y_true, y_pred, label), recall(y_true, y_pred, label)
+    return 2 * p * r / (p + r) if p + r else 0.0
+
+
+def predictions(n_rows, n_classes, seed):
+    rng = np.random.default_rng(seed)
+    y_true = rng.integers(0, n_classes, n_rows)
+    y_pred = np.where(rng.random(n_rows) < 0.7, y_true, rng.integers(0, n_classes, n_rows))
+    return y_true, y_pred
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_binary_metrics_match_formulas(seed):
+    y_true, y_pred = predictions(200, 2, seed)
+    predicted, actual = pd.Series(y_pred), pd.Series(y_true)
+    assert utils.accuracy(predicted, actual) == pytest.approx(np.mean(y_true == y_pred))
+    assert utils.precision(predicted, actual) == pytest.approx(precision(y_true, y_pred, 1))
+    assert utils.recall(predicted, actual) == pytest.approx(recall(y_true, y_pred, 1))
+    assert utils.f1(predicted, actual) == pytest.approx(f1(y_true, y_pred, 1))
+    assert utils.scores(predicted, actual) == pytest.approx({
+        "Accuracy": utils.accuracy(predicted, actual), "Precision": utils.precision(predicted, actual),
+        "Recall": utils.recall(predicted, actual), "F1": utils.f1(predicted, actual),
+    })
+
+
+def test_positive_class_never_predicted():
+    confusion = ConfusionMatrix.from_predictions([0, 1, 1], [0, 0, 0])
+    assert confusion.precision(1) == 0.0 and confusion.recall(1) == 0.0 and confusion.f1(1) == 0.0
+    assert ConfusionMatrix.from_predictions([0, 0], [0, 0]).precision(1) == 0.0 # label never seen
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_multiclass_averages(seed):
+    y_true, y_pred = predictions(300, 4, seed)
+    confusion = ConfusionMatrix.from_predictions(y_true, y_pred)
+    assert confusion.to_frame().equals(pd.crosstab(pd.Series(y_true, name="true"), pd.Series(y_pred, name="predicted")))
+    for metric, reference in (("precision", precision), ("recall", recall), ("f1", f1)):
+        per_class = [reference(y_true, y_pred, label) for label in range(4)]
+        assert getattr(confusion, metric)(average=None) == pytest.approx(per_class)
+        assert getattr(confusion, metric)() == pytest.approx(np.mean(per_class))
+        assert getattr(confusion, metric)(average="micro") == pytest.approx(np.mean(y_true == y_pred))
+    assert confusion.support().tolist() == np.bincount(y_true, minlength=4).tolist()
+    with pytest.raises(ValueError):
+        confusion.precision(average="weighted")
+
+
+def test_chunks_and_sums_match_a_single_pass():
+    y_true, y_pred = predictions(500, 3, 0)
+    labels = np.array(["a", "b", "c"])
+    y_true, y_pred = labels[y_true], labels[y_pred]
+    # the first chunks only hold some of the labels, so the matrix grows as they arrive
+    bounds = [0, 5, 40, 41, 300, 500]
+    chunks = [(y_true[a:b], y_pred[a:b]) for a, b in zip(bounds, bounds[1:])]
+    chunks[0] = (np.array(["b"] * 5), np.array(["b"] * 5))
+    whole = ConfusionMatrix.from_predictions(np.concatenate([c[0] for c in chunks]), np.concatenate([c[1] for c in chunks]))
+    assert np.array_equal(ConfusionMatrix.from_chunks(chunks).matrix, whole.matrix)
+    summed = sum((ConfusionMatrix.from_predictions(*chunk) for chunk in chunks[1:]), ConfusionMatrix.from_predictions(*chunks[0]))
+    assert np.array_equal(summed.labels, whole.labels) and np.array_equal(summed.matrix, whole.matrix)
+
+
+def test_fixed_labels():
+    confusion = ConfusionMatrix.from_predictions([0, 0], [0, 0], labels=[0, 1, 2])
+    assert confusion.matrix.shape == (3, 3) and confusion.total == 2
+    with pytest.raises(ValueError):
+        confusion.update([3], [0])
+    with pytest.raises(ValueError):
+        ConfusionMatrix().update([0, 1], [0])
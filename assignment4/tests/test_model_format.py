@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from assignment4.algorithms.decision_trees.compiled_tree import CompiledTree
+from assignment4.algorithms.decision_trees.id3 import ID3DecisionTree
+from tests import reference
+
+
+def continuous_dataset(n_rows: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    data = pd.DataFrame({"x": rng.normal(size=n_rows).round(2), "k": rng.integers(0, 3, n_rows)})
+    data["c"] = ((data.x + 0.5 * data.k > 0.5) ^ (rng.random(n_rows) < 0.1)).astype(int)
+    return data
+
+
+@pytest.fixture(params=["categorical", "binned"])
+def trained(request):
+    if request.param == "binned":
+        data, test = continuous_dataset(400, 0), continuous_dataset(200, 1)
+        tree = ID3DecisionTree(use_gini=True, max_bins=12)
+    else:
+        data, test = reference.load("data.csv"), reference.load("data_test.csv")
+        tree = ID3DecisionTree()
+    tree.build_tree(data, list(data.columns[:-1]), "c")
+    return tree, data, test
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_round_trip_predicts_the_same(trained, tmp_path, mmap):
+    tree, data, test = trained
+    path = str(tmp_path / "tree.bin")
+    tree.save(path)
+    loaded = ID3DecisionTree.load(path, mmap=mmap)
+    assert loaded.root is None # inference does not need the nodes
+    assert loaded.features == tree.features and loaded.classes.tolist() == tree.classes.tolist()
+    assert loaded.use_gini == tree.use_gini and loaded.max_bins == tree.max_bins
+    assert loaded.predict(data).tolist() == tree.predict(data).tolist()
+    # unseen test values draw the same random branches from the same generator
+    expected = tree.compile().predict(test, np.random.default_rng(0))
+    assert loaded.compile().predict(test, np.random.default_rng(0)).tolist() == expected.tolist()
+
+
+def test_round_trip_rebuilds_the_nodes(trained, tmp_path):
+    tree, _, _ = trained
+    path = str(tmp_path / "tree.bin")
+    tree.save(path)
+    assert ID3DecisionTree.load(path, with_root=True).root == tree.root
+
+
+def test_arrays_and_metadata_round_trip(trained, tmp_path):
+    tree, _, _ = trained
+    compiled = tree.compile()
+    path = str(tmp_path / "tree.bin")
+    compiled.save(path, metadata={"note": "saved"})
+    loaded = CompiledTree.load(path)
+    assert loaded.metadata["note"] == "saved" and loaded.n_nodes == compiled.n_nodes
+    for name in CompiledTree.ARRAYS:
+        original, read = getattr(compiled, name), getattr(loaded, name)
+        assert read.dtype == original.dtype and np.array_equal(read, original)
+
+
+def test_single_leaf_round_trip(tmp_path):
+    path = str(tmp_path / "leaf.bin")
+    CompiledTree.from_tree(0).save(path)
+    assert CompiledTree.load(path, mmap=False).to_tree() == 0
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_bytes(b"A,B,c\n0,1,0\n")
+    with pytest.raises(ValueError):
+        CompiledTree.load(str(path))
@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from assignment4.algorithms.decision_trees.id3 import ID3DecisionTree
+from assignment4.data_structures.node import Node
+from tests import reference
+
+
+def nodes(node, data: pd.DataFrame, depth: int = 0):
+    """Every internal node of a categorical tree with the training rows reaching it and its depth."""
+    if not isinstance(node, Node) or not node.children:
+        return
+    yield node, data, depth
+    for value, child in node.children.items():
+        yield from nodes(child, data[data[node.attribute] == value], depth + 1)
+
+
+def depth(node) -> int:
+    if not isinstance(node, Node) or not node.children:
+        return 0
+    return 1 + max(depth(child) for child in node.children.values())
+
+
+def truncate(node, max_depth: int):
+    """The tree with the nodes at max_depth replaced by their majority class."""
+    if not isinstance(node, Node) or not node.children:
+        return node
+    if max_depth == 0:
+        return node.majority
+    truncated = Node(node.attribute)
+    truncated.children = {value: truncate(child, max_depth - 1) for value, child in node.children.items()}
+    return truncated
+
+
+def errors(node, data: pd.DataFrame) -> int:
+    return sum(reference.traverse(node, row) != row["c"] for row in data.to_dict("records"))
+
+
+def fit(data, **kwargs) -> ID3DecisionTree:
+    tree = ID3DecisionTree(**kwargs)
+    tree.build_tree(data, list(data.columns[:-1]), "c")
+    return tree
+
+
+@pytest.fixture(scope="module")
+def data():
+    return reference.random_dataset(400, 6, 3, seed=0, n_classes=3)
+
+
+@pytest.mark.parametrize("max_depth", [0, 1, 2, 3])
+def test_max_depth_truncates_the_full_tree(data, max_depth):
+    tree, full = fit(data, max_depth=max_depth), fit(data)
+    assert depth(tree.root) <= max_depth
+    assert tree.root == truncate(full.root, max_depth)
+
+
+@pytest.mark.parametrize("min_samples_split", [10, 40])
+def test_min_samples_split(data, min_samples_split):
+    tree = fit(data, min_samples_split=min_samples_split)
+    assert all(len(rows) >= min_samples_split for _, rows, _ in nodes(tree.root, data))
+    assert depth(tree.root) < depth(fit(data).root)
+
+
+@pytest.mark.parametrize("min_samples_leaf", [5, 20])
+def test_min_samples_leaf(data, min_samples_leaf):
+    tree = fit(data, min_samples_leaf=min_samples_leaf)
+    for node, rows, _ in nodes(tree.root, data):
+        for value, child in node.children.items():
+            if len(rows[rows[node.attribute] == value]) < min_samples_leaf:
+                assert child == node.majority
+
+
+@pytest.mark.parametrize("use_gini", [False, True])
+def test_min_gain(data, use_gini):
+    tree = fit(data, use_gini=use_gini, min_gain=0.05)
+    for node, rows, _ in nodes(tree.root, data):
+        if use_gini:
+            probabilities = rows.c.value_counts(normalize=True)
+            gain = 1 - (probabilities ** 2).sum() - reference.gini_index(rows, node.attribute, "c")
+        else:
+            gain = reference.information_gain(rows, node.attribute, "c")
+        assert gain >= 0.05 - 1e-12
+    assert depth(tree.root) < depth(fit(data, use_gini=use_gini).root)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_reduced_error_pruning(seed):
+    data = reference.random_dataset(600, 6, 3, seed=seed, n_classes=3)
+    train, validation = data.iloc[:400], data.iloc[400:]
+    tree = fit(train)
+    full = fit(train)
+    pruned = tree.prune(validation, "c")
+    assert errors(pruned, validation) <= errors(full.root, validation)
+    assert depth(pruned) <= depth(full.root)
+    # every node that was kept was worth keeping: cutting it anywhere adds validation errors
+    for node, rows, _ in nodes(tree.root, validation):
+        leaf = int((rows.c != node.majority).sum())
+        assert errors(node, rows) < leaf
+
+
+def test_pruning_on_the_training_set_keeps_the_fit(data):
+    tree = fit(data)
+    before = errors(tree.root, data)
+    tree.prune(data, "c")
+    assert errors(tree.root, data) == before
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_pruning_with_unseen_validation_values(seed):
+    data = reference.random_dataset(600, 6, 4, seed=seed, n_classes=3)
+    train, validation = data[data.f0 < 3], data[data.f0 == 3].copy() # f0 = 3 never seen in training
+    validation.loc[validation.index[::3], "f1"] = np.nan
+    tree = fit(train)
+    before = int((tree.predict(validation).to_numpy() != validation.c.to_numpy()).sum())
+    assert before == errors(tree.root, validation)
+    tree.prune(validation, "c")
+    assert int((tree.predict(validation).to_numpy() != validation.c.to_numpy()).sum()) <= before
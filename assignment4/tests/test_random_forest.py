@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from assignment4.algorithms.decision_trees.id3 import ID3DecisionTree
+from assignment4.algorithms.decision_trees.random_forest import RandomForest
+from tests import reference
+
+
+@pytest.fixture(scope="module")
+def data():
+    return reference.random_dataset(300, 6, 3, seed=0, n_classes=3)
+
+
+def fit(data, **kwargs):
+    return RandomForest(**{"n_trees": 8, "random_state": 0, **kwargs}).fit(data, list(data.columns[:-1]), "c")
+
+
+@pytest.mark.parametrize("use_gini", [False, True])
+def test_pool_matches_serial(data, use_gini):
+    serial, pooled = fit(data, use_gini=use_gini, n_jobs=1), fit(data, use_gini=use_gini, n_jobs=2)
+    assert [tree.root for tree in serial.trees] == [tree.root for tree in pooled.trees]
+    assert np.array_equal(serial.oob_votes, pooled.oob_votes)
+    assert serial.oob_score == pooled.oob_score
+
+
+def test_out_of_bag_score_matches_recomputation(data):
+    forest = fit(data, n_jobs=1)
+    seeds = np.random.SeedSequence(0).generate_state(len(forest)).tolist()
+    votes = np.zeros((len(data), len(forest.classes)), dtype=np.int64)
+    for seed, tree in zip(seeds, forest.trees):
+        rng = np.random.default_rng(seed)
+        in_bag = np.zeros(len(data), dtype=bool)
+        in_bag[rng.integers(0, len(data), len(data))] = True
+        oob = np.flatnonzero(~in_bag)
+        predictions = tree.compile().predict(data.iloc[oob], rng)
+        votes[oob, np.searchsorted(forest.classes, predictions)] += 1
+    assert np.array_equal(forest.oob_votes, votes)
+    voted = votes.sum(axis=1) > 0
+    assert forest.oob_score == pytest.approx(np.mean(forest.classes[votes[voted].argmax(axis=1)] == data.c[voted]))
+
+
+def test_votes_count_every_tree(data):
+    forest = fit(data, n_jobs=1)
+    test = reference.random_dataset(50, 6, 4, seed=1, n_classes=3) # value 3 was never seen
+    votes = forest.votes(test, batch_size=16, random_state=0)
+    assert votes.shape == (50, 3) and (votes.sum(axis=1) == len(forest)).all()
+    assert forest.predict(test, batch_size=16, random_state=0).tolist() == forest.classes[votes.argmax(axis=1)].tolist()
+
+
+def test_single_tree_without_sampling_is_id3(data):
+    forest = fit(data, n_trees=1, bootstrap=False, max_features=None)
+    tree = ID3DecisionTree()
+    tree.build_tree(data, list(data.columns[:-1]), "c")
+    assert forest.trees[0].root == tree.root
+    assert forest.oob_score is None
+    assert (forest.predict(data) == tree.predict(data)).all()
+
+
+@pytest.mark.parametrize("max_features, expected", [(None, None), ("sqrt", 2), ("log2", 2), (0.5, 3), (4, 4), (10, 6)])
+def test_max_features(max_features, expected):
+    assert RandomForest(max_features=max_features)._resolve_max_features(6) == expected
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from assignment4.algorithms.decision_trees.id3 import ID3DecisionTree
+from assignment4.algorithms.decision_trees.split_criteria import (encode_columns, contingency_tensor, information_gains,
+                                                                  gini_indices, threshold_tensor, best_split)
+from assignment4.utils import information_gain, gini_index
+from tests import reference
+
+
+@pytest.fixture(params=["data.csv", "random"])
+def data(request):
+    if request.param == "random":
+        return reference.random_dataset(300, 5, 4, seed=0, n_classes=3)
+    return reference.load(request.param)
+
+
+def test_criteria_match_reference(data):
+    features = list(data.columns[:-1])
+    for feature in features:
+        assert information_gain(data, feature, "c") == pytest.approx(reference.information_gain(data, feature, "c"))
+        assert gini_index(data, feature, "c") == pytest.approx(reference.gini_index(data, feature, "c"))
+
+
+def test_best_feature_matches_reference(data):
+    features = list(data.columns[:-1])
+    tree = ID3DecisionTree()
+    for use_gini, criterion, pick in ((False, reference.information_gain, max), (True, reference.gini_index, min)):
+        expected = pick(features, key=lambda feature: criterion(data, feature, "c"))
+        assert tree._find_best_feature(data, features, "c", use_gini=use_gini) == expected
+
+
+def test_contingency_tensor_matches_crosstab(data):
+    features = list(data.columns[:-1])
+    codes, categories = encode_columns(data, features + ["c"])
+    n_values = max(len(c) for c in categories[:-1])
+    counts = contingency_tensor(codes[:, :-1], codes[:, -1], n_values, len(categories[-1]))
+    for f, feature in enumerate(features):
+        table = pd.crosstab(data[feature], data["c"]).to_numpy()
+        assert np.array_equal(counts[f, :len(table)], table)
+        assert not counts[f, len(table):].any()
+    gains = information_gains(counts)
+    assert best_split(counts) == int(np.argmax(gains))
+    assert best_split(counts, use_gini=True) == int(np.argmin(gini_indices(counts)))
+
+
+def test_missing_values_are_not_counted():
+    data = pd.DataFrame({"a": [1, 2, np.nan, 2, 1], "c": [0, 1, 1, np.nan, 0]})
+    codes, categories = encode_columns(data, ["a", "c"])
+    assert codes.tolist() == [[0, 0], [1, 1], [-1, 1], [1, -1], [0, 0]]
+    assert [c.tolist() for c in categories] == [[1.0, 2.0], [0.0, 1.0]]
+    present = codes[:, 1] >= 0 # callers drop the rows without a target
+    counts = contingency_tensor(codes[present, :1], codes[present, 1], 2, 2)
+    assert counts.tolist() == [[[2, 0], [0, 1]]]
+    assert information_gain(data.dropna(), "a", "c") == pytest.approx(reference.information_gain(data.dropna(), "a", "c"))
+
+
+def test_threshold_tensor_matches_cumulative_counts():
+    counts = np.random.default_rng(0).integers(0, 5, (3, 6, 2))
+    sides = threshold_tensor(counts)
+    for f in range(3):
+        for b in range(5):
+            assert np.array_equal(sides[f, b, 0], counts[f, :b + 1].sum(axis=0))
+            assert np.array_equal(sides[f, b, 1], counts[f, b + 1:].sum(axis=0))
@@ -0,0 +1,318 @@
+import hashlib
+import inspect
+import itertools
+import os
+import time
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+# Dataset of a worker process, attached once to the shared memory blocks
+_shared = {}
+
+
+def accuracy(y_true: np.ndarray, y_pred: np.ndarray) -> float:
+    """ Fraction of correct predictions, the default score of the searches. """
+    return float(np.mean(np.asarray(y_true) == np.asarray(y_pred)))
+
+
+def kfold(n_samples: int, n_splits: int = 5, shuffle: bool = True, random_state: Optional[int] = None) -> np.ndarray:
+    """ Assign every row to one of `n_splits` folds of (almost) equal size.
+
+    Parameters
+    ----------
+    n_samples : int
+        Number of rows.
+    n_splits : int
+        Number of folds.
+    shuffle : bool
+        Whether rows are assigned at random instead of in contiguous blocks.
+    random_state : int, optional
+        Seed of the shuffling.
+
+    Returns
+    -------
+    np.ndarray
+        Fold of every row: fold k is tested on the rows equal to k and trained on the others.
+    """
+    if not 2 <= n_splits <= n_samples:
+        raise ValueError(f"n_splits must be between 2 and the number of rows, got {n_splits}")
+    folds = np.arange(n_samples) * n_splits // n_samples
+    if shuffle:
+        np.random.default_rng(random_state).shuffle(folds)
+    return folds
+
+
+def parameter_grid(grid: dict) -> list:
+    """ Every combination of the values of a grid, e.g. {'learning_rate': [0.1, 0.01], 'num_iters': [100, 1000]}. """
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+def log_uniform(low: float, high: float) -> Callable[[np.random.Generator], float]:
+    """ Distribution of a random search drawing values whose logarithm is uniform in [log(low), log(high)]. """
+    return lambda rng: float(np.exp(rng.uniform(np.log(low), np.log(high))))
+
+
+def parameter_samples(distributions: dict, n_iter: int, random_state: Optional[int] = None) -> list:
+    """ Random parameter settings.
+
+    Parameters
+    ----------
+    distributions : dict
+        For every parameter, a list of values drawn uniformly, a callable taking a `np.random.Generator`
+        (e.g. `log_uniform(1e-4, 1)`), an object with an `rvs(random_state=...)` method (scipy.stats
+        distributions) or a single value.
+    n_iter : int
+        Number of settings.
+    random_state : int, optional
+        Seed of the draws.
+
+    Returns
+    -------
+    list
+        `n_iter` parameter dictionaries.
+    """
+    rng = np.random.default_rng(random_state)
+
+    def draw(distribution):
+        if hasattr(distribution, 'rvs'):
+            return distribution.rvs(random_state=rng)
+        if callable(distribution):
+            return distribution(rng)
+        if isinstance(distribution, (list, tuple, np.ndarray)):
+            return distribution[rng.integers(len(distribution))]
+        return distribution
+
+    return [{name: draw(distribution) for name, distribution in distributions.items()} for _ in range(n_iter)]
+
+
+def fit_model(model: type, params: dict, X: np.ndarray, y: np.ndarray):
+    """ Build and train a classifier with a parameter setting.
+
+    Parameters accepted by the constructor (e.g. `var_smoothing`) are passed to it, the others
+    (e.g. `num_iters`, `learning_rate`) to `train` if the model has one, otherwise to `fit`.
+
+    Parameters
+    ----------
+    model : type
+        Classifier class, e.g. `LogisticRegressionClassifier` or `NaiveBayesClassifier`.
+    params : dict
+        Parameter setting.
+    X : np.ndarray
+        Training data.
+    y : np.ndarray
+        Training labels.
+
+    Returns
+    -------
+    object
+        The trained classifier.
+    """
+    accepted = inspect.signature(model.__init__).parameters
+    init = {name: value for name, value in params.items() if name in accepted}
+    options = {name: value for name, value in params.items() if name not in accepted}
+    classifier = model(**init)
+    (classifier.train if hasattr(classifier, 'train') else classifier.fit)(X, y, **options)
+    return classifier
+
+
+def _attach(blocks: dict, classes: np.ndarray, model: type, scoring: Callable):
+    """ Pool initializer: map the shared dataset into the worker without copying it. """
+    for name, (shm_name, shape, dtype) in blocks.items():
+        shm = SharedMemory(name=shm_name)
+        _shared[name + '_shm'] = shm # keep the mapping alive
+        _shared[name] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    _shared.update(classes=classes, model=model, scoring=scoring)
+
+
+def _evaluate(params: dict, fold: int) -> tuple:
+    """ Train on every fold but one of the shared dataset and score on the remaining one.
+
+    Returns
+    -------
+    tuple
+        The score, the training time and the scoring time (seconds).
+    """
+    X, codes, folds, classes = _shared['X'], _shared['y'], _shared['folds'], _shared['classes']
+    test = folds == fold
+    start = time.perf_counter()
+    classifier = fit_model(_shared['model'], params, X[~test], classes[codes[~test]])
+    fitted = time.perf_counter()
+    score = _shared['scoring'](classes[codes[test]], classifier.predict(X[test]))
+    return float(score), fitted - start, time.perf_counter() - fitted
+
+
+class SearchCV:
+    """ Grid or random search of classifier parameters by k-fold cross-validation.
+
+    Every (parameter setting, fold) pair is an independent task run on a process pool; the dataset
+    is placed in shared memory once instead of being pickled for every task. Results are cached by
+    (dataset, parameters, fold), so settings evaluated by an earlier search on the same data and
+    folds are not trained again.
+    """
+
+    def __init__(self, model: type, param_grid: Optional[dict] = None, param_distributions: Optional[dict] = None,
+                 n_iter: int = 10, n_splits: int = 5, scoring: Callable = accuracy, shuffle: bool = True,
+                 random_state: Optional[int] = None, n_jobs: Optional[int] = None, refit: bool = True,
+                 cache: Optional[dict] = None):
+        """
+        Parameters
+        ----------
+        model : type
+            Classifier class, e.g. `LogisticRegressionClassifier` or `NaiveBayesClassifier`.
+        param_grid : dict, optional
+            Values of every parameter (grid search over all their combinations).
+        param_distributions : dict, optional
+            Distributions of the parameters (random search, see `parameter_samples`).
+        n_iter : int
+            Number of settings drawn by a random search.
+        n_splits : int
+            Number of folds.
+        scoring : Callable
+            Score (higher is better) of the predictions of a fold, `scoring(y_true, y_pred)`. Must be a
+            module-level function so it can be sent to the worker processes.
+        shuffle : bool
+            Whether rows are assigned to folds at random.
+        random_state : int, optional
+            Seed of the folds and of the random search.
+        n_jobs : int, optional
+            Number of worker processes. Default is the number of CPUs, 1 runs in the current process.
+        refit : bool
+            Whether the best setting is trained again on the whole dataset (`best_model`).
+        cache : dict, optional
+            Results of earlier searches to reuse (e.g. the `cache` of another search), shared and updated.
+        """
+        if (param_grid is None) == (param_distributions is None):
+            raise ValueError("Exactly one of param_grid and param_distributions must be given")
+        self.model = model
+        self.param_grid = param_grid
+        self.param_distributions = param_distributions
+        self.n_iter = n_iter
+        self.n_splits = n_splits
+        self.scoring = scoring
+        self.shuffle = shuffle
+        self.random_state = random_state
+        self.n_jobs = n_jobs or os.cpu_count() or 1
+        self.refit = refit
+        self.cache = {} if cache is None else cache
+        self.results = None
+        self.best_params = None
+        self.best_score = None
+        self.best_model = None
+        self.timings = {}
+
+    def candidates(self) -> list:
+        """ The parameter settings evaluated by the search. """
+        if self.param_grid is not None:
+            return parameter_grid(self.param_grid)
+        return parameter_samples(self.param_distributions, self.n_iter, self.random_state)
+
+    def _key(self, dataset: str, params: dict, fold: int) -> tuple:
+        model = f"{self.model.__module__}.{self.model.__qualname__}"
+        return dataset, model, tuple(sorted((name, repr(value)) for name, value in params.items())), fold
+
+    def fit(self, X: np.ndarray, y: np.ndarray) -> 'SearchCV':
+        """ Cross-validate every parameter setting.
+
+        Parameters
+        ----------
+        X : np.ndarray
+            Data.
+        y : np.ndarray
+            Labels.
+
+        Returns
+        -------
+        SearchCV
+            The search (self), with `results`, `best_params`, `best_score`, `best_model` and `timings`.
+        """
+        start = time.perf_counter()
+        X = np.ascontiguousarray(X, dtype=np.float64)
+        classes, codes = np.unique(np.asarray(y), return_inverse=True)
+        arrays = {'X': X, 'y': codes.astype(np.int64),
+                  'folds': kfold(len(codes), self.n_splits, self.shuffle, self.random_state)}
+        digest = hashlib.blake2b(digest_size=16)
+        for array in arrays.values():
+            digest.update(array.data)
+        digest.update(repr((classes.tolist(), getattr(self.scoring, '__qualname__', repr(self.scoring)))).encode())
+        dataset = digest.hexdigest()
+
+        candidates = self.candidates()
+        tasks = [(params, fold) for params in candidates for fold in range(self.n_splits)]
+        pending = [task for task in tasks if self._key(dataset, *task) not in self.cache]
+
+        if self.n_jobs == 1 or len(pending) <= 1:
+            try:
+                _attach({}, classes, self.model, self.scoring)
+                _shared.update(arrays)
+                results = [_evaluate(*task) for task in pending]
+            finally:
+                _shared.clear()
+        else:
+            blocks, segments = {}, []
+            try:
+                for name, array in arrays.items():
+                    shm = SharedMemory(create=True, size=max(array.nbytes, 1))
+                    segments.append(shm)
+                    np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+                    blocks[name] = (shm.name, array.shape, array.dtype)
+                initargs = (blocks, classes, self.model, self.scoring)
+                with Pool(min(self.n_jobs, len(pending)), initializer=_attach, initargs=initargs) as pool:
+                    results = pool.starmap(_evaluate, pending, chunksize=1)
+            finally:
+                for shm in segments:
+                    shm.close()
+                    shm.unlink()
+        for task, result in zip(pending, results):
+            self.cache[self._key(dataset, *task)] = result
+        evaluated = time.perf_counter()
+
+        rows = []
+        for params in candidates:
+            scores, fit_times, score_times = np.array([self.cache[self._key(dataset, params, fold)]
+                                                       for fold in range(self.n_splits)]).T
+            row = {'params': params, **params, 'mean_score': scores.mean(), 'std_score': scores.std()}
+            row.update({f'split{fold}_score': score for fold, score in enumerate(scores)})
+            row.update(mean_fit_time=fit_times.mean(), mean_score_time=score_times.mean())
+            rows.append(row)
+        self.results = pd.DataFrame(rows)
+        self.results['rank'] = self.results['mean_score'].rank(ascending=False, method='min', na_option='bottom').astype(int)
+        best = int(np.nan_to_num(self.results['mean_score'].to_numpy(), nan=-np.inf).argmax()) # diverged runs last
+        self.best_params, self.best_score = candidates[best], float(self.results['mean_score'].iloc[best])
+
+        if self.refit:
+            self.best_model = fit_model(self.model, self.best_params, X, classes[codes])
+        finished = time.perf_counter()
+        self.timings = {
+            'tasks': len(tasks),
+            'cached': len(tasks) - len(pending),
+            'search': evaluated - start, # wall time of the cross-validation
+            'fit': float(sum(fit for _, fit, _ in results)), # training time summed over the workers
+            'score': float(sum(score for _, _, score in results)),
+            'refit': finished - evaluated,
+            'total': finished - start,
+        }
+        return self
+
+    def __str__(self) -> str:
+        """Return a summary of the search."""
+        output = [f"Search of {self.model.__name__} Summary:"]
+        output.append("-" * 50)
+        if self.results is None:
+            output.append("Not fitted")
+            return "\n".join(output)
+        output.append(f"Best parameters: {self.best_params}")
+        output.append(f"Best score: {self.best_score:.4f} ({self.n_splits}-fold cross-validation)")
+        t = self.timings
+        output.append(f"Tasks: {t['tasks']} ({t['cached']} cached), {self.n_jobs} worker(s)")
+        output.append(f"Time: {t['total']:.2f}s total, {t['search']:.2f}s search, {t['fit']:.2f}s training, "
+                      f"{t['score']:.2f}s scoring, {t['refit']:.2f}s refit")
+        return "\n".join(output)
+
+    def __repr__(self) -> str:
+        """Return a string representation of the search."""
+        return f"SearchCV(model={self.model.__name__}, n_splits={self.n_splits}, best_params={self.best_params})"
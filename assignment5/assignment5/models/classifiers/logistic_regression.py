@@ -1,40 +1,317 @@
 import numpy as np
+from collections.abc import Iterator
+
+from assignment5.streaming import iter_chunks, minibatches, learning_rate_schedule
+from assignment5.models.optimizers import Optimizer, SOLVERS
+
+try: # optional, for sparse inputs
+    from scipy import sparse
+except ImportError:
+    sparse = None
+
+
+def _as_matrix(X):
+    """ Sparse matrices are kept as CSR (never densified), anything else becomes a float array. """
+    if sparse is not None and sparse.issparse(X):
+        return X.tocsr()
+    return np.asarray(X, dtype=np.float64)
+
+
+def _scale_rows(X, weights):
+    """ Rows of X multiplied by weights, for dense arrays and sparse matrices. """
+    if sparse is not None and sparse.issparse(X):
+        return X.multiply(weights[:, None]).tocsr()
+    return X * weights[:, None]
+
 
 class LogisticRegressionClassifier:
-    def __init__(self):
+    def __init__(self, multi_class: str = 'auto'):
+        """
+        Parameters
+        ----------
+        multi_class : str
+            'binary' (labels 0/1, weight vector and scalar bias), 'multinomial' (softmax over any number of
+            classes, weight matrix and bias vector) or 'auto' (binary for 0/1 labels, multinomial otherwise).
+        """
+        if multi_class not in ('auto', 'binary', 'multinomial'):
+            raise ValueError(f"Unknown multi_class: {multi_class}")
+        self.multi_class = multi_class
         self.weights = None
         self.bias = None
+        self.classes = np.array([0, 1])
+        self.n_iter = 0 # iterations run by the last call to train
+        self.converged = False
+
+    @property
+    def multinomial(self) -> bool:
+        """ Whether the trained model is a softmax model (weights of shape (n_features, n_classes)). """
+        return self.weights is not None and np.ndim(self.weights) == 2
 
     def sigmoid(self, z):
-        """ Sigmoid function implementation. """
-        return 1 / (1 + np.exp(-z))
+        """ Sigmoid function implementation, exp(-log(1 + exp(-z))) so that it does not overflow for large |z|. """
+        return np.exp(-np.logaddexp(0, -z))
 
-    def train(self, X, y, num_iters, learning_rate):
-        """ Train the Logistic Regression model using gradient descent. """
+    def train(self, X, y, num_iters, learning_rate, solver='gd', tol: float = 0.0, **options) -> int:
+        """ Train the Logistic Regression model on the full dataset.
+
+        Parameters
+        ----------
+        X : np.ndarray or sparse matrix
+            Training data. scipy sparse matrices are used in CSR form without being densified.
+        y : np.ndarray
+            Training labels (0 or 1 for a binary model, any labels for a multinomial one).
+        num_iters : int
+            Maximum number of iterations.
+        learning_rate : float
+            Step size of the first-order solvers ('gd', 'nesterov', 'adam').
+        solver : str or Optimizer
+            'gd' (fixed-step gradient descent), 'nesterov', 'adam', 'newton' (IRLS, for small feature
+            counts, binary only), 'lbfgs', or an `assignment5.models.optimizers.Optimizer` instance.
+        tol : float
+            Stop when the largest gradient component or the relative decrease of the loss falls below tol.
+            0 always runs num_iters iterations.
+        **options
+            Other parameters of the solver (e.g. momentum, memory).
+
+        Returns
+        -------
+        int
+            Number of iterations run (also stored in `n_iter`).
+        """
+        X = _as_matrix(X)
+        y = np.asarray(y)
+        if isinstance(solver, Optimizer):
+            optimizer = solver
+        elif solver in SOLVERS:
+            if solver in ('gd', 'nesterov', 'adam'):
+                options['learning_rate'] = learning_rate
+            optimizer = SOLVERS[solver](tol=tol, max_iter=num_iters, **options)
+        else:
+            raise ValueError(f"Unknown solver: {solver}")
+
+        classes, codes = np.unique(y, return_inverse=True)
+        binary = self.multi_class == 'binary' or (self.multi_class == 'auto' and np.isin(classes, [0, 1]).all())
+        n_features = X.shape[1]
+
+        # Parameters are optimised as one vector [weights, bias]
+        if binary:
+            y = y.astype(np.float64)
+            result = optimizer.minimize(lambda theta: self._loss_grad(theta, X, y), np.zeros(n_features + 1),
+                                        hess=lambda theta: self._hessian(theta, X))
+            self.classes = np.array([0, 1])
+            self.weights, self.bias = result.x[:-1], float(result.x[-1])
+        else:
+            k = len(classes)
+            result = optimizer.minimize(lambda theta: self._softmax_loss_grad(theta, X, codes, k),
+                                        np.zeros((n_features + 1) * k))
+            self.classes = classes
+            self.weights = result.x[:n_features * k].reshape(n_features, k)
+            self.bias = result.x[n_features * k:]
+        self.n_iter, self.converged = result.n_iter, result.converged
+        return self.n_iter
+
+    def _softmax_loss_grad(self, theta, X, codes, n_classes):
+        """ Mean cross-entropy of the softmax model and its gradient with respect to [weights, bias] (flattened). """
         n_samples, n_features = X.shape
-        self.weights = np.zeros(n_features)
-        self.bias = 0
+        W = theta[:n_features * n_classes].reshape(n_features, n_classes)
+        logits = X @ W + theta[n_features * n_classes:] # one matrix product for all classes
+        log_norm = self._log_sum_exp(logits)
+        rows = np.arange(n_samples)
+        loss = np.mean(log_norm - logits[rows, codes])
+
+        error = np.exp(logits - log_norm[:, None]) # probabilities minus one-hot targets
+        error[rows, codes] -= 1
+        grad = np.empty_like(theta)
+        grad[:n_features * n_classes] = np.asarray(X.T @ error).ravel() / n_samples
+        grad[n_features * n_classes:] = error.mean(axis=0)
+        return loss, grad
+
+    @staticmethod
+    def _log_sum_exp(logits):
+        """ log(sum(exp(logits))) of every row, shifted by the row maximum to avoid overflow. """
+        top = logits.max(axis=1)
+        return top + np.log(np.exp(logits - top[:, None]).sum(axis=1))
+
+    def _loss_grad(self, theta, X, y):
+        """ Mean log-loss and its gradient with respect to [weights, bias]. """
+        z = X @ theta[:-1] + theta[-1]
+        loss = np.mean(np.logaddexp(0, z) - y * z)
+        error = self.sigmoid(z) - y
+        grad = np.empty_like(theta)
+        grad[:-1] = X.T @ error / len(y)
+        grad[-1] = np.mean(error)
+        return loss, grad
+
+    def _hessian(self, theta, X):
+        """ Hessian of the mean log-loss with respect to [weights, bias]. """
+        p = self.sigmoid(X @ theta[:-1] + theta[-1])
+        weights = p * (1 - p)
+        H = np.empty((len(theta), len(theta)))
+        block = X.T @ _scale_rows(X, weights)
+        H[:-1, :-1] = block.toarray() if hasattr(block, 'toarray') else block
+        H[:-1, -1] = H[-1, :-1] = X.T @ weights
+        H[-1, -1] = weights.sum()
+        return H / len(weights)
+
+    def train_stream(self, source, y=None, num_epochs: int = 1, batch_size: int = 256, learning_rate: float = 0.01,
+                     schedule='constant', decay: float = 1e-3, shuffle_buffer: int = 0, chunk_size: int = 65536,
+                     target=-1, seed=None, warm_start: bool = False) -> int:
+        """ Train a binary model with mini-batch SGD over a dataset read chunk by chunk.
+
+        Only one chunk and the shuffling buffer are held in memory, so the dataset can be larger than RAM.
+
+        Parameters
+        ----------
+        source : str, np.ndarray, callable or iterable
+            Training data, see `assignment5.streaming.iter_chunks`: a `.npy` or CSV path, a (memory-mapped)
+            array, a callable returning (X, y) chunks (called once per epoch) or an iterable of chunks
+            (single epoch only).
+        y : str or np.ndarray, optional
+            Labels of an array or `.npy` source. By default the `target` column of the source.
+        num_epochs : int
+            Number of passes over the data.
+        batch_size : int
+            Number of rows per gradient step.
+        learning_rate : float
+            Initial learning rate.
+        schedule : str or callable
+            Learning rate schedule, see `assignment5.streaming.learning_rate_schedule`.
+        decay : float
+            Decay rate of the schedule.
+        shuffle_buffer : int
+            Number of rows shuffled together before being split into mini-batches (0 keeps the source order).
+        chunk_size : int
+            Number of rows read at a time from files and arrays.
+        target : int or str
+            Label column when `y` is not given.
+        seed : int, optional
+            Seed of the shuffling.
+        warm_start : bool
+            Whether to continue from the current weights instead of zeros.
+
+        Returns
+        -------
+        int
+            Number of gradient steps taken.
+
+        Raises
+        ------
+        ValueError
+            If the model is multinomial (by `multi_class` or, with warm_start, by its trained weights) or a
+            batch holds labels other than 0 and 1: streaming training only updates binary models.
+        """
+        if self.multi_class == 'multinomial' or (warm_start and self.multinomial):
+            raise ValueError("train_stream only trains binary models, use train for a multinomial model")
+        if num_epochs > 1 and isinstance(source, Iterator):
+            raise ValueError("An iterator can only be read once, pass a callable returning the chunks for several epochs")
+        rng = np.random.default_rng(seed)
+        rate = learning_rate_schedule(schedule, learning_rate, decay)
+        if not warm_start:
+            self.weights = None
+        step = 0
+
+        for _ in range(num_epochs):
+            chunks = iter_chunks(source, y=y, target=target, chunk_size=chunk_size)
+            for X_batch, y_batch in minibatches(chunks, batch_size, shuffle_buffer, rng):
+                if self.weights is None:
+                    self.weights = np.zeros(X_batch.shape[1])
+                    self.bias = 0
+                    self.classes = np.array([0, 1])
+                if not np.isin(y_batch, (0, 1)).all():
+                    raise ValueError("train_stream only trains binary models, labels must be 0 or 1")
+                error = self.sigmoid(np.dot(X_batch, self.weights) + self.bias) - y_batch
+                lr = rate(step)
+                self.weights -= lr * np.dot(X_batch.T, error) / len(y_batch)
+                self.bias -= lr * np.mean(error)
+                step += 1
+        return step
+
+    def decision_function(self, X, chunk_size: int = 65536):
+        """ Logits (X @ weights + bias) of the samples in X, computed chunk by chunk.
+
+        Parameters
+        ----------
+        X : np.ndarray or sparse matrix
+            Samples.
+        chunk_size : int
+            Number of rows processed at a time, bounding the temporary memory.
+
+        Returns
+        -------
+        np.ndarray
+            Logit of every sample, or (n_samples x n_classes) logits for a multinomial model.
+        """
+        X = _as_matrix(X)
+        logits = np.empty((X.shape[0],) + np.shape(self.bias))
+        for start in range(0, X.shape[0], chunk_size):
+            out = logits[start:start + chunk_size]
+            out[:] = X[start:start + chunk_size] @ self.weights
+            out += self.bias
+        return logits
+
+    def predict(self, X, chunk_size: int = 65536):
+        """ Predict class labels for samples in X.
+
+        sigmoid(z) > 0.5 exactly when z > 0, so binary logits are thresholded without computing any
+        exponential; a multinomial model takes the class of the largest logit.
+        """
+        X = _as_matrix(X)
+        if self.multinomial:
+            predictions = np.empty(X.shape[0], dtype=self.classes.dtype)
+            for start in range(0, X.shape[0], chunk_size):
+                logits = self.decision_function(X[start:start + chunk_size], chunk_size)
+                predictions[start:start + chunk_size] = self.classes[np.argmax(logits, axis=1)]
+            return predictions
+
+        predictions = np.empty(X.shape[0], dtype=np.int64)
+        for start in range(0, X.shape[0], chunk_size):
+            logits = self.decision_function(X[start:start + chunk_size], chunk_size)
+            np.greater(logits, 0, out=logits)
+            predictions[start:start + chunk_size] = logits
+        return predictions
+
+    def predict_proba(self, X, chunk_size: int = 65536):
+        """ Class probabilities of the samples in X, columns in the order of `classes`.
 
-        # Gradient descent
-        for _ in range(num_iters):
-            model = self.sigmoid(np.dot(X, self.weights) + self.bias)
-            dw = (1 / n_samples) * np.dot(X.T, (model - y))
-            db = (1 / n_samples) * np.sum(model - y)
+        Computed in log space with log-sum-exp (log P(y=1) = -log(1 + exp(-z)) for a binary model,
+        logits minus their log-sum-exp for a multinomial one), so probabilities close to 0 or 1
+        neither overflow nor round to exactly 0.
 
-            self.weights -= learning_rate * dw
-            self.bias -= learning_rate * db
+        Parameters
+        ----------
+        X : np.ndarray or sparse matrix
+            Samples.
+        chunk_size : int
+            Number of rows processed at a time.
 
-    def predict(self, X):
-        """ Predict class labels for samples in X. """
-        linear_model = np.dot(X, self.weights) + self.bias
-        y_predicted = self.sigmoid(linear_model)
-        y_predicted_cls = [1 if i > 0.5 else 0 for i in y_predicted]
-        return np.array(y_predicted_cls)
+        Returns
+        -------
+        np.ndarray
+            (n_samples x n_classes) probabilities.
+        """
+        X = _as_matrix(X)
+        probabilities = np.empty((X.shape[0], len(self.classes)))
+        for start in range(0, X.shape[0], chunk_size):
+            logits = self.decision_function(X[start:start + chunk_size], chunk_size)
+            out = probabilities[start:start + chunk_size]
+            if self.multinomial:
+                out[:] = logits - self._log_sum_exp(logits)[:, None]
+            else:
+                np.logaddexp(0, logits, out=out[:, 0])
+                np.logaddexp(0, -logits, out=out[:, 1])
+                np.negative(out, out=out)
+            np.exp(out, out=out)
+        return probabilities
 
     def __str__(self) -> str:
         """Return a string representation of the Logistic Regression Classifier."""
         output = ["Logistic Regression Classifier Summary:"]
         output.append("-" * 50)
+        if self.multinomial:
+            for c, w, b in zip(self.classes, self.weights.T, self.bias):
+                weights_str = ', '.join(f"{v:.4f}" for v in w)
+                output.append(f"Class {c}: Weights: [{weights_str}] Bias: {b:.4f}")
+            return "\n".join(output)
         weights_str = ', '.join(f"{w:.4f}" for w in self.weights)
         output.append(f"Weights: [{weights_str}]")
         output.append(f"Bias: {self.bias:.4f}")
@@ -1,8 +1,23 @@
 import numpy as np
 
+from assignment5.streaming import iter_chunks
+
 class NaiveBayesClassifier:
-    def __init__(self):
+    def __init__(self, var_smoothing: float = 1e-9):
+        """
+        Parameters
+        ----------
+        var_smoothing : float
+            Fraction of the largest feature variance added to every variance, so that constant
+            features do not give zero variances.
+        """
         self.params = {}
+        self.var_smoothing = var_smoothing
+        self.classes = np.array([])
+        # Sufficient statistics of every class: row count, mean and sum of squared deviations (M2)
+        self.class_count = np.zeros(0)
+        self._mean = None
+        self._m2 = None
 
     def fit(self, X: np.ndarray, y: np.ndarray) -> None:
         """ Fit the Naive Bayes model to the training data. 
@@ -14,17 +29,145 @@ class NaiveBayesClassifier:
         y : np.ndarray
             Training labels.
         """
-        self.classes = np.unique(y)
-        self.features = X.shape[1]
+        self.classes = np.array([])
+        self.class_count = np.zeros(0)
+        self._mean = self._m2 = None
+        self.partial_fit(X, y)
+
+    def partial_fit(self, X: np.ndarray, y: np.ndarray) -> 'NaiveBayesClassifier':
+        """ Update the model with a batch of training data.
+
+        The statistics of the batch are computed per class with bincounts, one feature at a time, and
+        combined with the current ones (Chan et al. parallel update of means and M2 sums), so fitting chunk
+        by chunk gives the same model as fitting all the data at once. Besides the batch, the update only
+        needs O(classes x features) memory and a few columns of temporaries.
+
+        Parameters
+        ----------
+        X : np.ndarray
+            Training data of the batch.
+        y : np.ndarray
+            Training labels of the batch (new classes may appear in any batch).
+
+        Returns
+        -------
+        NaiveBayesClassifier
+            The updated model (self).
+        """
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y)
+        if len(y) == 0:
+            return self
+        batch_classes, codes = np.unique(y, return_inverse=True)
+        n_classes = len(batch_classes)
+
+        count = np.bincount(codes, minlength=n_classes).astype(np.float64)
+        mean = np.empty((n_classes, X.shape[1]))
+        m2 = np.empty((n_classes, X.shape[1]))
+        for j in range(X.shape[1]):
+            column = X[:, j]
+            mean[:, j] = np.bincount(codes, weights=column, minlength=n_classes) / count
+            # squared deviations from the class mean, not sum(x^2) - n mean^2 which cancels far from zero
+            m2[:, j] = np.bincount(codes, weights=(column - mean[codes, j]) ** 2, minlength=n_classes)
+
+        self._merge_statistics(batch_classes, count, mean, m2)
+        return self
+
+    def fit_stream(self, source, y=None, target=-1, chunk_size: int = 65536) -> 'NaiveBayesClassifier':
+        """ Fit the model on a dataset read chunk by chunk (see `assignment5.streaming.iter_chunks`).
+
+        Parameters
+        ----------
+        source : str, np.ndarray, callable or iterable
+            Training data: a `.npy` or CSV path, a (memory-mapped) array or (X, y) chunks.
+        y : str or np.ndarray, optional
+            Labels of an array or `.npy` source. By default the `target` column of the source.
+        target : int or str
+            Label column when `y` is not given.
+        chunk_size : int
+            Number of rows read at a time.
+
+        Returns
+        -------
+        NaiveBayesClassifier
+            The fitted model (self).
+        """
+        for X_chunk, y_chunk in iter_chunks(source, y=y, target=target, chunk_size=chunk_size):
+            self.partial_fit(X_chunk, y_chunk)
+        return self
+
+    def merge(self, other: 'NaiveBayesClassifier') -> 'NaiveBayesClassifier':
+        """ Add the statistics of a model fitted on other data (e.g. by another worker).
+
+        The result is exactly the model fitted on both datasets.
+
+        Parameters
+        ----------
+        other : NaiveBayesClassifier
+            The other model.
+
+        Returns
+        -------
+        NaiveBayesClassifier
+            The merged model (self).
+        """
+        if other._mean is not None:
+            self._merge_statistics(other.classes, other.class_count, other._mean, other._m2)
+        return self
+
+    def _merge_statistics(self, classes: np.ndarray, count: np.ndarray, mean: np.ndarray, m2: np.ndarray) -> None:
+        """ Combine per-class (count, mean, M2) statistics with the current ones and refresh the parameters. """
+        if self._mean is None:
+            self.classes, self.class_count, self._mean, self._m2 = classes, count.copy(), mean.copy(), m2.copy()
+        else:
+            all_classes = np.union1d(self.classes, classes)
+            if len(all_classes) > len(self.classes): # classes seen for the first time
+                position = np.searchsorted(all_classes, self.classes)
+                grown = [np.zeros((len(all_classes),) + a.shape[1:]) for a in (self.class_count, self._mean, self._m2)]
+                for target, source in zip(grown, (self.class_count, self._mean, self._m2)):
+                    target[position] = source
+                self.classes, (self.class_count, self._mean, self._m2) = all_classes, grown
+
+            i = np.searchsorted(self.classes, classes)
+            n_a, n_b = self.class_count[i][:, None], count[:, None]
+            n = n_a + n_b
+            delta = mean - self._mean[i]
+            self._mean[i] += delta * n_b / n
+            self._m2[i] += m2 + delta ** 2 * n_a * n_b / n
+            self.class_count[i] = n[:, 0]
+        self.features = self._mean.shape[1]
+        self._update_params()
+
+    def _update_params(self) -> None:
+        """ Derive the priors and smoothed variances of every class from the sufficient statistics. """
+        total = self.class_count.sum()
+        overall_mean = np.dot(self.class_count, self._mean) / total
+        overall_m2 = self._m2.sum(axis=0) + np.dot(self.class_count, (self._mean - overall_mean) ** 2)
+        epsilon = self.var_smoothing * (overall_m2 / total).max()
 
         # Calculate parameters for each class
-        for c in self.classes:
-            X_c = X[y == c]
+        self.params = {}
+        for i, c in enumerate(self.classes):
             self.params[c] = {
-                'mean': X_c.mean(axis=0),
-                'var': X_c.var(axis=0),
-                'prior': X_c.shape[0] / X.shape[0]
+                'mean': self._mean[i],
+                'var': self._m2[i] / self.class_count[i] + epsilon,
+                'prior': self.class_count[i] / total
             }
+        self._precompute()
+
+    def _precompute(self) -> None:
+        """ Stack the parameters of the classes into the arrays used by the vectorised predictions.
+
+        The log-density of x for class c is -(x - mean_c)^2 . precision_c + constant_c, with precision = 1 / (2 var)
+        and constant_c = log(prior_c) - sum_j(log(2 pi var_cj)) / 2. The squared deviations are computed directly
+        rather than expanded into x^2 and x . mean terms, which cancel catastrophically for features far from zero.
+        """
+        self._means = np.array([self.params[c]['mean'] for c in self.classes]) # (classes x features)
+        variances = np.array([self.params[c]['var'] for c in self.classes])
+        priors = np.array([self.params[c]['prior'] for c in self.classes])
+        with np.errstate(divide='ignore'):
+            self._precision = 1 / (2 * variances)
+            self._constant = np.log(priors) - 0.5 * np.log(2 * np.pi * variances).sum(axis=1)
 
     def gaussian_density(self, class_idx: int, x: np.ndarray) -> np.ndarray:
         """ Calculate Gaussian density function for a given class and data point. 
@@ -47,34 +190,70 @@ class NaiveBayesClassifier:
         denominator = np.sqrt(2 * np.pi * var)
         return numerator / denominator
 
-    def predict(self, X: np.ndarray) -> np.ndarray:
+    def joint_log_likelihood(self, X: np.ndarray, chunk_size: int = 65536) -> np.ndarray:
+        """ Log of prior times likelihood of every data point for every class.
+
+        Parameters
+        ----------
+        X : np.ndarray
+            Data points.
+        chunk_size : int
+            Number of rows processed at a time, bounding the temporary memory.
+
+        Returns
+        -------
+        np.ndarray
+            (n_samples x n_classes) matrix of log-posteriors up to a constant per sample.
+        """
+        X = np.asarray(X, dtype=np.float64)
+        scores = np.empty((X.shape[0], len(self.classes)))
+        for start in range(0, X.shape[0], chunk_size):
+            chunk = X[start:start + chunk_size]
+            out = scores[start:start + chunk_size]
+            for k in range(len(self.classes)): # one (chunk x features) temporary at a time
+                out[:, k] = self._constant[k] - np.dot((chunk - self._means[k]) ** 2, self._precision[k])
+        return scores
+
+    def predict(self, X: np.ndarray, chunk_size: int = 65536) -> np.ndarray:
         """ Predict the class labels for the given data points. 
         
         Parameters
         ----------
         X : np.ndarray
             Data points for which to predict the class labels.
+        chunk_size : int
+            Number of rows processed at a time.
             
         Returns
         -------
         np.ndarray
             Predicted class labels for the given data points.
         """
-        preds = []
-        for x in X:
-            posteriors = []
+        # Select the class with the highest posterior probability
+        return self.classes[np.argmax(self.joint_log_likelihood(X, chunk_size), axis=1)]
 
-            # Calculate posterior probability for each class
-            for c in self.classes:
-                prior = np.log(self.params[c]['prior'])
-                class_conditional = np.sum(np.log(self.gaussian_density(c, x)))
-                posterior = prior + class_conditional
-                posteriors.append(posterior)
+    def predict_proba(self, X: np.ndarray, chunk_size: int = 65536) -> np.ndarray:
+        """ Posterior probability of every class, normalised with log-sum-exp.
 
-            # Select the class with the highest posterior probability
-            preds.append(np.argmax(posteriors))
+        Parameters
+        ----------
+        X : np.ndarray
+            Data points.
+        chunk_size : int
+            Number of rows processed at a time.
 
-        return np.array(preds)
+        Returns
+        -------
+        np.ndarray
+            (n_samples x n_classes) probabilities, columns in the order of `classes`.
+        """
+        scores = self.joint_log_likelihood(X, chunk_size)
+        for start in range(0, scores.shape[0], chunk_size):
+            out = scores[start:start + chunk_size]
+            out -= out.max(axis=1, keepdims=True)
+            out -= np.log(np.exp(out).sum(axis=1, keepdims=True))
+            np.exp(out, out=out)
+        return scores
     
     def __str__(self) -> str:
         """Return a string representation of the Naive Bayes classifier."""
@@ -0,0 +1,212 @@
+from collections import deque
+from typing import Callable, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+Objective = Callable[[np.ndarray], Tuple[float, np.ndarray]]
+Hessian = Callable[[np.ndarray], np.ndarray]
+
+
+class OptimizeResult(NamedTuple):
+    """ Outcome of a minimisation. """
+    x: np.ndarray
+    loss: float
+    n_iter: int
+    converged: bool
+
+
+class Optimizer:
+    """ Base class of the optimisers: minimise a differentiable objective from a starting point.
+
+    Every optimiser stops after `max_iter` iterations, or earlier once the largest gradient component
+    or the relative decrease of the loss falls below `tol` (tol=0 always runs `max_iter` iterations).
+    """
+
+    def __init__(self, tol: float = 1e-6, max_iter: int = 1000):
+        self.tol = tol
+        self.max_iter = max_iter
+
+    def _converged(self, grad: np.ndarray, loss: float, previous: float) -> bool:
+        if self.tol <= 0:
+            return False
+        return np.max(np.abs(grad)) <= self.tol or abs(previous - loss) <= self.tol * max(1.0, abs(loss))
+
+    def minimize(self, fun: Objective, x0: np.ndarray, hess: Optional[Hessian] = None) -> OptimizeResult:
+        """ Minimise an objective.
+
+        Parameters
+        ----------
+        fun : Objective
+            Function returning the loss and its gradient at a point.
+        x0 : np.ndarray
+            Starting point.
+        hess : Hessian, optional
+            Function returning the Hessian at a point (second-order methods only).
+
+        Returns
+        -------
+        OptimizeResult
+            The minimiser, its loss, the number of iterations and whether the tolerance was reached.
+        """
+        raise NotImplementedError
+
+
+class GradientDescent(Optimizer):
+    """ Fixed-step gradient descent. """
+
+    def __init__(self, learning_rate: float = 0.01, tol: float = 1e-6, max_iter: int = 1000):
+        super().__init__(tol, max_iter)
+        self.learning_rate = learning_rate
+
+    def minimize(self, fun: Objective, x0: np.ndarray, hess: Optional[Hessian] = None) -> OptimizeResult:
+        x = np.array(x0, dtype=np.float64)
+        loss, grad = fun(x)
+        for i in range(1, self.max_iter + 1):
+            x -= self.learning_rate * grad
+            previous, (loss, grad) = loss, fun(x)
+            if self._converged(grad, loss, previous):
+                return OptimizeResult(x, loss, i, True)
+        return OptimizeResult(x, loss, self.max_iter, False)
+
+
+class Nesterov(Optimizer):
+    """ Gradient descent with Nesterov momentum (gradient taken at the look-ahead point).
+
+    The iterate is the look-ahead point x + momentum * velocity itself, so the objective is evaluated once
+    per iteration; it coincides with x once the velocity vanishes, and is the point returned.
+    """
+
+    def __init__(self, learning_rate: float = 0.01, momentum: float = 0.9, tol: float = 1e-6, max_iter: int = 1000):
+        super().__init__(tol, max_iter)
+        self.learning_rate = learning_rate
+        self.momentum = momentum
+
+    def minimize(self, fun: Objective, x0: np.ndarray, hess: Optional[Hessian] = None) -> OptimizeResult:
+        x = np.array(x0, dtype=np.float64)
+        velocity = np.zeros_like(x)
+        loss, grad = fun(x)
+        for i in range(1, self.max_iter + 1):
+            previous_velocity = velocity
+            velocity = self.momentum * velocity - self.learning_rate * grad
+            x += (1 + self.momentum) * velocity - self.momentum * previous_velocity # next look-ahead point
+            previous, (loss, grad) = loss, fun(x)
+            if self._converged(grad, loss, previous):
+                return OptimizeResult(x, loss, i, True)
+        return OptimizeResult(x, loss, self.max_iter, False)
+
+
+class Adam(Optimizer):
+    """ Adam: per-coordinate steps from bias-corrected moment estimates of the gradient. """
+
+    def __init__(self, learning_rate: float = 0.001, beta1: float = 0.9, beta2: float = 0.999, epsilon: float = 1e-8,
+                 tol: float = 1e-6, max_iter: int = 1000):
+        super().__init__(tol, max_iter)
+        self.learning_rate = learning_rate
+        self.beta1 = beta1
+        self.beta2 = beta2
+        self.epsilon = epsilon
+
+    def minimize(self, fun: Objective, x0: np.ndarray, hess: Optional[Hessian] = None) -> OptimizeResult:
+        x = np.array(x0, dtype=np.float64)
+        m, v = np.zeros_like(x), np.zeros_like(x)
+        loss, grad = fun(x)
+        for i in range(1, self.max_iter + 1):
+            m = self.beta1 * m + (1 - self.beta1) * grad
+            v = self.beta2 * v + (1 - self.beta2) * grad ** 2
+            m_hat = m / (1 - self.beta1 ** i)
+            v_hat = v / (1 - self.beta2 ** i)
+            x -= self.learning_rate * m_hat / (np.sqrt(v_hat) + self.epsilon)
+            previous, (loss, grad) = loss, fun(x)
+            if self._converged(grad, loss, previous):
+                return OptimizeResult(x, loss, i, True)
+        return OptimizeResult(x, loss, self.max_iter, False)
+
+
+def _backtrack(fun: Objective, x: np.ndarray, loss: float, grad: np.ndarray, direction: np.ndarray,
+               step: float = 1.0, shrink: float = 0.5, c: float = 1e-4, max_halvings: int = 50):
+    """ Armijo backtracking line search along a descent direction.
+
+    Returns the new point, its loss and gradient, and whether a sufficient decrease was found
+    (otherwise the point is left unchanged).
+    """
+    slope = float(np.dot(grad, direction))
+    if slope < 0:
+        for _ in range(max_halvings):
+            candidate = x + step * direction
+            new_loss, new_grad = fun(candidate)
+            if new_loss <= loss + c * step * slope:
+                return candidate, new_loss, new_grad, True
+            step *= shrink
+    return x, loss, grad, False
+
+
+class Newton(Optimizer):
+    """ Newton's method (IRLS for logistic regression), with a line search. For small feature counts:
+    each iteration solves a (n_features x n_features) system but few iterations are needed. """
+
+    def __init__(self, tol: float = 1e-8, max_iter: int = 100, ridge: float = 1e-10):
+        super().__init__(tol, max_iter)
+        self.ridge = ridge # keeps the Hessian invertible on separable data
+
+    def minimize(self, fun: Objective, x0: np.ndarray, hess: Optional[Hessian] = None) -> OptimizeResult:
+        if hess is None:
+            raise ValueError("Newton's method needs the Hessian of the objective")
+        x = np.array(x0, dtype=np.float64)
+        loss, grad = fun(x)
+        for i in range(1, self.max_iter + 1):
+            H = hess(x)
+            H[np.diag_indices_from(H)] += self.ridge * max(1.0, np.trace(H) / len(x))
+            direction = -np.linalg.solve(H, grad)
+            previous = loss
+            x, loss, grad, moved = _backtrack(fun, x, loss, grad, direction)
+            if not moved: # no decrease along the Newton direction: stationary up to rounding
+                return OptimizeResult(x, loss, i, bool(np.max(np.abs(grad)) <= max(self.tol, 1e-12)))
+            if self._converged(grad, loss, previous):
+                return OptimizeResult(x, loss, i, True)
+        return OptimizeResult(x, loss, self.max_iter, False)
+
+
+class LBFGS(Optimizer):
+    """ Limited-memory BFGS: quasi-Newton directions from the last `memory` gradient differences. """
+
+    def __init__(self, memory: int = 10, tol: float = 1e-6, max_iter: int = 500):
+        super().__init__(tol, max_iter)
+        self.memory = memory
+
+    def minimize(self, fun: Objective, x0: np.ndarray, hess: Optional[Hessian] = None) -> OptimizeResult:
+        x = np.array(x0, dtype=np.float64)
+        loss, grad = fun(x)
+        history = deque(maxlen=self.memory) # (s, y, 1 / y.s)
+        for i in range(1, self.max_iter + 1):
+            # Two-loop recursion
+            q = grad.copy()
+            alphas = []
+            for s, y, rho in reversed(history):
+                alpha = rho * np.dot(s, q)
+                q -= alpha * y
+                alphas.append(alpha)
+            if history:
+                s, y, _ = history[-1]
+                q *= np.dot(s, y) / np.dot(y, y)
+            else:
+                q /= max(1.0, np.linalg.norm(grad)) # first step: scaled steepest descent
+            for (s, y, rho), alpha in zip(history, reversed(alphas)):
+                q += (alpha - rho * np.dot(y, q)) * s
+            direction = -q
+
+            previous, previous_x, previous_grad = loss, x, grad
+            x, loss, grad, moved = _backtrack(fun, x, loss, grad, direction)
+            if not moved:
+                if not history: # not even steepest descent decreases the loss
+                    return OptimizeResult(x, loss, i, False)
+                history.clear() # restart from steepest descent
+                continue
+            s, y = x - previous_x, grad - previous_grad
+            if np.dot(s, y) > 1e-12: # curvature condition, otherwise the pair is skipped
+                history.append((s, y, 1.0 / np.dot(s, y)))
+            if self._converged(grad, loss, previous):
+                return OptimizeResult(x, loss, i, True)
+        return OptimizeResult(x, loss, self.max_iter, False)
+
+
+SOLVERS = {'gd': GradientDescent, 'nesterov': Nesterov, 'adam': Adam, 'newton': Newton, 'lbfgs': LBFGS}
@@ -0,0 +1,137 @@
+import os
+from typing import Callable, Iterable, Iterator, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+Chunk = Tuple[np.ndarray, np.ndarray]
+
+
+def iter_chunks(source, y=None, target: Union[int, str] = -1, chunk_size: int = 65536) -> Iterator[Chunk]:
+    """ Read a dataset chunk by chunk, without loading it in memory.
+
+    Parameters
+    ----------
+    source : str, np.ndarray, callable or iterable
+        Path of a `.npy` file (memory-mapped) or of a CSV file (read with `chunksize`), an array
+        (e.g. a `np.memmap`), a callable returning an iterable of (X, y) chunks, or such an iterable.
+    y : str or np.ndarray, optional
+        Labels of an array or `.npy` source (an array or the path of a `.npy` file). If not given,
+        the labels are the `target` column of the source.
+    target : int or str
+        Column holding the labels when `y` is not given (a column name for CSV files).
+    chunk_size : int
+        Number of rows per chunk for files and arrays.
+
+    Returns
+    -------
+    Iterator[Chunk]
+        Chunks (X, y), X as float64.
+    """
+    if callable(source):
+        yield from source()
+        return
+
+    if isinstance(source, (str, os.PathLike)) and str(source).endswith('.csv'):
+        for frame in pd.read_csv(source, chunksize=chunk_size):
+            labels = frame.pop(target if isinstance(target, str) else frame.columns[target])
+            yield frame.to_numpy(dtype=np.float64), labels.to_numpy()
+        return
+
+    if isinstance(source, (str, os.PathLike)):
+        source = np.load(source, mmap_mode='r')
+    if isinstance(y, (str, os.PathLike)):
+        y = np.load(y, mmap_mode='r')
+
+    if isinstance(source, np.ndarray):
+        features = np.arange(source.shape[1])
+        if y is None:
+            features = np.delete(features, target)
+        for start in range(0, source.shape[0], chunk_size):
+            block = np.asarray(source[start:start + chunk_size])
+            labels = block[:, target] if y is None else np.asarray(y[start:start + chunk_size])
+            yield block[:, features].astype(np.float64, copy=False), labels
+        return
+
+    for X_chunk, y_chunk in source:
+        yield np.asarray(X_chunk, dtype=np.float64), np.asarray(y_chunk)
+
+
+def minibatches(chunks: Iterable[Chunk], batch_size: int, buffer_size: int = 0,
+                rng: Optional[np.random.Generator] = None) -> Iterator[Chunk]:
+    """ Regroup chunks into mini-batches, optionally shuffled through a bounded buffer.
+
+    Parameters
+    ----------
+    chunks : Iterable[Chunk]
+        Chunks (X, y) of any size.
+    batch_size : int
+        Number of rows per mini-batch (the last one may be smaller).
+    buffer_size : int
+        If positive, rows are collected until the buffer holds this many, then shuffled before being
+        emitted, so rows of different chunks are mixed while at most about buffer_size rows are in memory.
+    rng : np.random.Generator, optional
+        Random generator of the shuffling.
+
+    Returns
+    -------
+    Iterator[Chunk]
+        Mini-batches (X, y).
+    """
+    rng = rng or np.random.default_rng()
+    threshold = max(buffer_size, batch_size)
+    pending_X, pending_y, size = [], [], 0
+
+    def flush(final: bool):
+        X_buffer, y_buffer = np.concatenate(pending_X), np.concatenate(pending_y)
+        if buffer_size > 0:
+            order = rng.permutation(len(y_buffer))
+            X_buffer, y_buffer = X_buffer[order], y_buffer[order]
+        stop = len(y_buffer) if final else len(y_buffer) - len(y_buffer) % batch_size
+        for start in range(0, stop, batch_size):
+            yield X_buffer[start:start + batch_size], y_buffer[start:start + batch_size]
+        pending_X[:], pending_y[:] = [X_buffer[stop:]], [y_buffer[stop:]]
+
+    for X_chunk, y_chunk in chunks:
+        pending_X.append(X_chunk)
+        pending_y.append(y_chunk)
+        size += len(y_chunk)
+        if size >= threshold:
+            yield from flush(final=False)
+            size = len(pending_y[0])
+
+    if size > 0:
+        yield from flush(final=True)
+
+
+def learning_rate_schedule(schedule: Union[str, Callable[[int], float]], learning_rate: float,
+                           decay: float = 1e-3) -> Callable[[int], float]:
+    """ Learning rate as a function of the update step.
+
+    Parameters
+    ----------
+    schedule : str or callable
+        'constant', 'inverse' (learning_rate / (1 + decay * t)), 'inverse_sqrt'
+        (learning_rate / sqrt(1 + decay * t)), 'exponential' (learning_rate * exp(-decay * t)),
+        or a callable returning the learning rate of step t.
+    learning_rate : float
+        Initial learning rate.
+    decay : float
+        Decay rate of the schedule.
+
+    Returns
+    -------
+    Callable[[int], float]
+        The schedule.
+    """
+    if callable(schedule):
+        return schedule
+    schedules = {
+        'constant': lambda t: learning_rate,
+        'inverse': lambda t: learning_rate / (1 + decay * t),
+        'inverse_sqrt': lambda t: learning_rate / np.sqrt(1 + decay * t),
+        'exponential': lambda t: learning_rate * np.exp(-decay * t),
+    }
+    if schedule not in schedules:
+        raise ValueError(f"Unknown learning rate schedule: {schedule}")
+    return schedules[schedule]
@@ -0,0 +1,41 @@
+"""
+Synthetic datasets and straightforward implementations of the models, used as references by the tests.
+"""
+
+import numpy as np
+
+
+def dataset(n_samples: int, n_features: int, seed: int, n_classes: int = 2, offset: float = 0.0):
+    """ Gaussian blobs, one per class, shifted by `offset` (labels 0 .. n_classes - 1). """
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(scale=2.0, size=(n_classes, n_features))
+    y = rng.integers(0, n_classes, n_samples)
+    X = centers[y] + rng.normal(size=(n_samples, n_features)) + offset
+    return X, y
+
+
+def gradient_descent(X: np.ndarray, y: np.ndarray, learning_rate: float, n_steps: int):
+    """ Full-batch gradient descent on the mean log-loss of a binary logistic regression, from zeros. """
+    weights, bias = np.zeros(X.shape[1]), 0.0
+    for _ in range(n_steps):
+        error = 1 / (1 + np.exp(-(X @ weights + bias))) - y
+        weights = weights - learning_rate * X.T @ error / len(y)
+        bias = bias - learning_rate * np.mean(error)
+    return weights, bias
+
+
+def gaussian_log_likelihood(X: np.ndarray, means: np.ndarray, variances: np.ndarray, priors: np.ndarray) -> np.ndarray:
+    """ log(prior) + sum of the log Gaussian densities of the features, class by class and row by row. """
+    scores = np.empty((len(X), len(priors)))
+    for i, x in enumerate(X):
+        for k in range(len(priors)):
+            densities = -0.5 * np.log(2 * np.pi * variances[k]) - (x - means[k]) ** 2 / (2 * variances[k])
+            scores[i, k] = np.log(priors[k]) + densities.sum()
+    return scores
+
+
+def sigmoid(z: np.ndarray) -> np.ndarray:
+    """ 1 / (1 + exp(-z)), written with exp of non-positive numbers only. """
+    z = np.asarray(z, dtype=np.float64)
+    small = np.exp(-np.abs(z))
+    return np.where(z >= 0, 1 / (1 + small), small / (1 + small))
@@ -0,0 +1,101 @@
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from assignment5.models.classifiers.naive_bayes import NaiveBayesClassifier
+from tests import reference
+
+
+def assert_same_model(model: NaiveBayesClassifier, other: NaiveBayesClassifier):
+    assert np.array_equal(model.classes, other.classes)
+    assert np.array_equal(model.class_count, other.class_count)
+    for c in model.classes:
+        for name in ('mean', 'var', 'prior'):
+            assert np.allclose(model.params[c][name], other.params[c][name], rtol=1e-10)
+
+
+@pytest.fixture
+def data():
+    X, y = reference.dataset(600, 4, seed=0, n_classes=3)
+    order = np.argsort(y, kind='stable') # classes arrive one after the other
+    return X[order], y[order]
+
+
+def test_fit_matches_class_statistics(data):
+    X, y = data
+    model = NaiveBayesClassifier(var_smoothing=1e-3)
+    model.fit(X, y)
+    epsilon = 1e-3 * X.var(axis=0).max()
+    for c in np.unique(y):
+        assert np.allclose(model.params[c]['mean'], X[y == c].mean(axis=0))
+        assert np.allclose(model.params[c]['var'], X[y == c].var(axis=0) + epsilon)
+        assert model.params[c]['prior'] == pytest.approx(np.mean(y == c))
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 100, 599])
+def test_partial_fit_matches_fit(data, chunk_size):
+    X, y = data
+    full, incremental = NaiveBayesClassifier(), NaiveBayesClassifier()
+    full.fit(X, y)
+    for start in range(0, len(y), chunk_size):
+        incremental.partial_fit(X[start:start + chunk_size], y[start:start + chunk_size])
+    incremental.partial_fit(X[:0], y[:0]) # empty batches are ignored
+    assert_same_model(incremental, full)
+    assert np.array_equal(incremental.predict(X), full.predict(X))
+
+
+@pytest.mark.parametrize('n_parts', [2, 5])
+def test_merged_models_match_the_concatenated_fit(data, n_parts):
+    X, y = data
+    parts = np.array_split(np.random.default_rng(0).permutation(len(y)), n_parts)
+    models = [NaiveBayesClassifier() for _ in parts]
+    for model, rows in zip(models, parts):
+        model.fit(X[rows], y[rows])
+    merged = NaiveBayesClassifier()
+    for model in models:
+        merged.merge(model)
+    merged.merge(NaiveBayesClassifier()) # an unfitted model adds nothing
+    full = NaiveBayesClassifier()
+    full.fit(X, y)
+    assert_same_model(merged, full)
+
+
+def test_merge_adds_classes(data):
+    X, y = data
+    first, second = NaiveBayesClassifier(), NaiveBayesClassifier()
+    first.fit(X[y == 2], y[y == 2])
+    second.fit(X[y < 2], y[y < 2])
+    first.merge(second)
+    full = NaiveBayesClassifier()
+    full.fit(X, y)
+    assert_same_model(first, full)
+
+
+def test_fit_starts_over(data):
+    X, y = data
+    model = NaiveBayesClassifier()
+    model.partial_fit(X[:100] + 5, y[:100])
+    model.fit(X, y)
+    full = NaiveBayesClassifier()
+    full.fit(X, y)
+    assert_same_model(model, full)
+
+
+def test_fit_stream_matches_fit(data, tmp_path):
+    X, y = data
+    np.save(tmp_path / 'data.npy', np.column_stack((X, y)))
+    streamed = NaiveBayesClassifier().fit_stream(str(tmp_path / 'data.npy'), chunk_size=64)
+    full = NaiveBayesClassifier()
+    full.fit(X, y)
+    assert_same_model(streamed, full)
+
+
+def test_partial_fit_memory_does_not_grow_with_classes():
+    X, y = reference.dataset(20000, 4, seed=1, n_classes=50)
+    model = NaiveBayesClassifier()
+    tracemalloc.start()
+    model.partial_fit(X, y)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert peak < 50 * len(y) * 8 / 4 # a (classes x rows) indicator alone would take 8 MB
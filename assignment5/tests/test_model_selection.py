@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from assignment5 import model_selection
+from assignment5.model_selection import SearchCV, accuracy, fit_model, kfold, log_uniform, parameter_grid, parameter_samples
+from assignment5.models.classifiers.logistic_regression import LogisticRegressionClassifier
+from assignment5.models.classifiers.naive_bayes import NaiveBayesClassifier
+from tests import reference
+
+GRID = {'num_iters': [5, 50], 'learning_rate': [0.01, 0.5]}
+
+
+@pytest.fixture(scope='module')
+def data():
+    X, y = reference.dataset(240, 3, seed=0)
+    X += np.random.default_rng(1).normal(scale=2.0, size=X.shape)
+    return X, y
+
+
+def cross_validate(model, params, X, y, folds):
+    """ Mean accuracy of a setting over the folds, one fit per fold. """
+    scores = []
+    for fold in np.unique(folds):
+        test = folds == fold
+        classifier = fit_model(model, params, X[~test], y[~test])
+        scores.append(accuracy(y[test], classifier.predict(X[test])))
+    return np.mean(scores)
+
+
+@pytest.mark.parametrize('n_samples, n_splits', [(10, 2), (11, 3), (100, 7)])
+def test_kfold(n_samples, n_splits):
+    folds = kfold(n_samples, n_splits, random_state=0)
+    sizes = np.bincount(folds)
+    assert len(sizes) == n_splits and sizes.max() - sizes.min() <= 1
+    assert np.array_equal(folds, kfold(n_samples, n_splits, random_state=0))
+    assert np.array_equal(kfold(n_samples, n_splits, shuffle=False), np.sort(folds))
+    with pytest.raises(ValueError):
+        kfold(n_samples, n_samples + 1)
+
+
+def test_parameter_settings():
+    assert parameter_grid(GRID) == [{'num_iters': n, 'learning_rate': lr} for n in (5, 50) for lr in (0.01, 0.5)]
+
+    class Constant:
+        def rvs(self, random_state=None):
+            return 3
+
+    distributions = {'a': [1, 2], 'b': log_uniform(1e-3, 1e-1), 'c': Constant(), 'd': 'fixed'}
+    samples = parameter_samples(distributions, 20, random_state=0)
+    assert samples == parameter_samples(distributions, 20, random_state=0)
+    assert {s['a'] for s in samples} == {1, 2} and all(1e-3 <= s['b'] <= 1e-1 for s in samples)
+    assert all(s['c'] == 3 and s['d'] == 'fixed' for s in samples)
+
+
+def test_fit_model_routes_parameters(data):
+    X, y = data
+    bayes = fit_model(NaiveBayesClassifier, {'var_smoothing': 0.5}, X, y)
+    assert bayes.var_smoothing == 0.5
+    logistic = fit_model(LogisticRegressionClassifier, {'multi_class': 'binary', 'num_iters': 7, 'learning_rate': 0.1}, X, y)
+    assert logistic.multi_class == 'binary' and logistic.n_iter == 7
+
+
+@pytest.mark.parametrize('model, grid', [(LogisticRegressionClassifier, GRID),
+                                         (NaiveBayesClassifier, {'var_smoothing': [1e-9, 1e-1, 10.0]})])
+def test_scores_match_manual_cross_validation(data, model, grid):
+    X, y = data
+    search = SearchCV(model, param_grid=grid, n_splits=4, random_state=0, n_jobs=1).fit(X, y)
+    folds = kfold(len(y), 4, random_state=0)
+    expected = [cross_validate(model, params, X, y, folds) for params in parameter_grid(grid)]
+    assert np.allclose(search.results['mean_score'], expected)
+    assert search.best_params == parameter_grid(grid)[int(np.argmax(expected))]
+    assert search.best_score == pytest.approx(max(expected))
+    assert search.results.loc[int(np.argmax(expected)), 'rank'] == 1
+    refit = fit_model(model, search.best_params, X, y)
+    assert np.array_equal(search.best_model.predict(X), refit.predict(X))
+
+
+def test_pool_matches_serial(data):
+    X, y = data
+    searches = [SearchCV(LogisticRegressionClassifier, param_distributions={'num_iters': [10, 40], 'learning_rate': log_uniform(1e-3, 1)},
+                         n_iter=4, n_splits=3, random_state=1, n_jobs=n_jobs).fit(X, y) for n_jobs in (1, 2)]
+    columns = ['num_iters', 'learning_rate', 'mean_score', 'std_score', 'split0_score', 'split1_score', 'split2_score', 'rank']
+    pd.testing.assert_frame_equal(searches[0].results[columns], searches[1].results[columns])
+    assert searches[0].best_params == searches[1].best_params
+    assert searches[1].timings['tasks'] == 12 and searches[1].timings['cached'] == 0
+
+
+def test_cached_results_are_not_trained_again(data, monkeypatch):
+    X, y = data
+    first = SearchCV(LogisticRegressionClassifier, param_grid=GRID, n_splits=3, random_state=0, n_jobs=1, refit=False).fit(X, y)
+
+    def fail(*args):
+        raise AssertionError("cached settings should not be evaluated")
+    monkeypatch.setattr(model_selection, '_evaluate', fail)
+    again = SearchCV(LogisticRegressionClassifier, param_grid=GRID, n_splits=3, random_state=0, n_jobs=1, refit=False,
+                     cache=first.cache).fit(X, y)
+    assert again.timings['cached'] == again.timings['tasks'] == 12
+    pd.testing.assert_frame_equal(again.results, first.results)
+
+    monkeypatch.undo()
+    wider = SearchCV(LogisticRegressionClassifier, param_grid={**GRID, 'num_iters': [5, 50, 100]}, n_splits=3,
+                     random_state=0, n_jobs=1, refit=False, cache=first.cache).fit(X, y)
+    assert wider.timings['cached'] == 12 and wider.timings['tasks'] == 18
+    other_folds = SearchCV(LogisticRegressionClassifier, param_grid=GRID, n_splits=3, random_state=1, n_jobs=1,
+                           refit=False, cache=first.cache).fit(X, y)
+    assert other_folds.timings['cached'] == 0
+
+
+def test_exactly_one_search_space():
+    with pytest.raises(ValueError):
+        SearchCV(NaiveBayesClassifier)
+    with pytest.raises(ValueError):
+        SearchCV(NaiveBayesClassifier, param_grid={}, param_distributions={})
@@ -0,0 +1,120 @@
+import numpy as np
+import pytest
+
+from assignment5.models.classifiers.logistic_regression import LogisticRegressionClassifier
+from assignment5.models.optimizers import GradientDescent, Nesterov, Adam, Newton, LBFGS
+from tests import reference
+
+
+class Counted:
+    """ Objective that counts its evaluations. """
+
+    def __init__(self, fun):
+        self.fun = fun
+        self.calls = 0
+
+    def __call__(self, x):
+        self.calls += 1
+        return self.fun(x)
+
+
+@pytest.fixture
+def least_squares():
+    """ Mean squared error of a random linear system, its Hessian and its exact minimiser. """
+    rng = np.random.default_rng(0)
+    A, b = rng.normal(size=(200, 5)), rng.normal(size=200)
+
+    def fun(x):
+        residual = A @ x - b
+        return 0.5 * np.mean(residual ** 2), A.T @ residual / len(b)
+
+    return fun, lambda x: A.T @ A / len(b), np.linalg.lstsq(A, b, rcond=None)[0]
+
+
+@pytest.mark.parametrize('optimizer', [
+    GradientDescent(learning_rate=0.5, tol=1e-12, max_iter=5000),
+    Nesterov(learning_rate=0.2, tol=1e-12, max_iter=5000),
+    Adam(learning_rate=0.05, tol=1e-12, max_iter=20000),
+    Newton(),
+    LBFGS(tol=1e-12),
+], ids=lambda optimizer: type(optimizer).__name__)
+def test_least_squares_minimiser(least_squares, optimizer):
+    fun, hess, solution = least_squares
+    result = optimizer.minimize(fun, np.zeros(5), hess=hess)
+    assert result.converged and result.n_iter < optimizer.max_iter
+    assert np.allclose(result.x, solution, atol=1e-5)
+    assert result.loss == pytest.approx(fun(solution)[0])
+
+
+def test_gradient_descent_steps(least_squares):
+    fun, _, _ = least_squares
+    x = np.zeros(5)
+    for _ in range(10):
+        x = x - 0.3 * fun(x)[1]
+    result = GradientDescent(learning_rate=0.3, tol=0, max_iter=10).minimize(fun, np.zeros(5))
+    assert np.allclose(result.x, x) and result.n_iter == 10 and not result.converged
+
+
+@pytest.mark.parametrize('n_iter', [1, 2, 10, 50])
+def test_nesterov_returns_the_look_ahead_point(least_squares, n_iter):
+    fun, _, _ = least_squares
+    # Textbook form: gradient at x + momentum * velocity, then x moves by the new velocity
+    x, velocity = np.zeros(5), np.zeros(5)
+    for _ in range(n_iter):
+        velocity = 0.9 * velocity - 0.1 * fun(x + 0.9 * velocity)[1]
+        x = x + velocity
+    counted = Counted(fun)
+    result = Nesterov(learning_rate=0.1, momentum=0.9, tol=0, max_iter=n_iter).minimize(counted, np.zeros(5))
+    assert np.allclose(result.x, x + 0.9 * velocity)
+    assert counted.calls == n_iter + 1 # one evaluation per iteration, plus the starting point
+
+
+def test_newton_needs_the_hessian(least_squares):
+    fun, _, _ = least_squares
+    with pytest.raises(ValueError):
+        Newton().minimize(fun, np.zeros(5))
+
+
+@pytest.fixture(scope='module')
+def binary():
+    X, y = reference.dataset(400, 4, seed=3)
+    X += np.random.default_rng(1).normal(scale=2.0, size=X.shape) # overlapping classes, finite optimum
+    return X, y
+
+
+@pytest.fixture(scope='module')
+def optimum(binary):
+    X, y = binary
+    model = LogisticRegressionClassifier()
+    model.train(X, y, num_iters=100, learning_rate=None, solver='newton', tol=1e-12)
+    return np.append(model.weights, model.bias)
+
+
+@pytest.mark.parametrize('solver, learning_rate, num_iters', [
+    ('gd', 0.5, 20000), ('nesterov', 0.1, 5000), ('adam', 0.05, 20000), ('lbfgs', None, 500),
+])
+def test_solvers_reach_the_same_model(binary, optimum, solver, learning_rate, num_iters):
+    X, y = binary
+    model = LogisticRegressionClassifier()
+    n_iter = model.train(X, y, num_iters=num_iters, learning_rate=learning_rate, solver=solver, tol=1e-10)
+    assert model.converged and n_iter == model.n_iter < num_iters
+    # first-order solvers stop on a flat loss, a little short of the minimiser
+    theta = np.append(model.weights, model.bias)
+    loss = model._loss_grad(theta, X, y.astype(float))[0]
+    assert loss == pytest.approx(model._loss_grad(optimum, X, y.astype(float))[0], rel=1e-6)
+    assert np.allclose(theta, optimum, atol=1e-2)
+
+
+def test_optimizer_instance_and_unknown_solver(binary, optimum):
+    X, y = binary
+    model = LogisticRegressionClassifier()
+    model.train(X, y, num_iters=0, learning_rate=None, solver=LBFGS(memory=3, tol=1e-10))
+    assert np.allclose(np.append(model.weights, model.bias), optimum, atol=1e-3)
+    with pytest.raises(ValueError):
+        model.train(X, y, num_iters=10, learning_rate=0.1, solver='sgd')
+
+
+def test_zero_tolerance_runs_every_iteration(binary):
+    X, y = binary
+    model = LogisticRegressionClassifier()
+    assert model.train(X, y, num_iters=25, learning_rate=0.1, solver='adam') == 25 and not model.converged
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from assignment5.models.classifiers.logistic_regression import LogisticRegressionClassifier
+from assignment5.models.classifiers.naive_bayes import NaiveBayesClassifier
+from tests import reference
+
+
+def parameters(model: NaiveBayesClassifier):
+    return [np.array([model.params[c][name] for c in model.classes]) for name in ('mean', 'var', 'prior')]
+
+
+@pytest.mark.parametrize('n_classes', [2, 4])
+def test_naive_bayes_scores_match_densities(n_classes):
+    X, y = reference.dataset(300, 3, seed=n_classes, n_classes=n_classes)
+    model = NaiveBayesClassifier()
+    model.fit(X, y)
+    expected = reference.gaussian_log_likelihood(X, *parameters(model))
+    assert np.allclose(model.joint_log_likelihood(X, chunk_size=64), expected)
+    assert np.array_equal(model.predict(X, chunk_size=64), model.classes[expected.argmax(axis=1)])
+    probabilities = model.predict_proba(X, chunk_size=64)
+    assert np.allclose(probabilities, np.exp(expected) / np.exp(expected).sum(axis=1, keepdims=True))
+
+
+@pytest.mark.parametrize('offset', [1e3, 1e6, 1e9])
+def test_naive_bayes_is_stable_far_from_zero(offset):
+    X, y = reference.dataset(500, 3, seed=0, n_classes=3)
+    near, far = NaiveBayesClassifier(), NaiveBayesClassifier()
+    near.fit(X, y)
+    far.fit(X + offset, y)
+    assert np.allclose(parameters(far)[1], parameters(near)[1], rtol=1e-4)
+    test = reference.dataset(200, 3, seed=1, n_classes=3)[0]
+    assert np.array_equal(far.predict(test + offset), near.predict(test))
+    assert np.allclose(far.predict_proba(test + offset), near.predict_proba(test), atol=1e-4)
+
+
+def test_naive_bayes_probabilities_far_from_every_class():
+    X, y = reference.dataset(200, 2, seed=0)
+    model = NaiveBayesClassifier()
+    model.fit(X, y)
+    outliers = np.array([[1e4, -1e4], [-1e5, 3.0], [1e150, 1e150]])
+    probabilities = model.predict_proba(outliers)
+    assert np.isfinite(probabilities).all() and np.allclose(probabilities.sum(axis=1), 1)
+
+
+@pytest.fixture
+def logistic():
+    X, y = reference.dataset(300, 3, seed=2)
+    model = LogisticRegressionClassifier()
+    model.train(X, y, num_iters=200, learning_rate=0.5)
+    return model, X
+
+
+@pytest.mark.parametrize('scale', [1, 1e3, 1e6])
+def test_logistic_probabilities_match_the_sigmoid(logistic, scale):
+    model, X = logistic
+    model.weights, model.bias = model.weights * scale, model.bias * scale # logits up to about 1e7
+    z = X @ model.weights + model.bias
+    with np.errstate(over='raise', under='ignore'):
+        probabilities = model.predict_proba(X, chunk_size=50)
+    assert np.allclose(probabilities[:, 1], reference.sigmoid(z), rtol=1e-12, atol=0)
+    assert np.allclose(probabilities[:, 0], reference.sigmoid(-z), rtol=1e-12, atol=0)
+    assert np.array_equal(model.predict(X, chunk_size=50), (reference.sigmoid(z) > 0.5).astype(int))
+
+
+def test_logistic_sigmoid_does_not_overflow():
+    z = np.array([-1000.0, -40.0, 0.0, 40.0, 1000.0])
+    with np.errstate(over='raise', under='ignore'):
+        assert np.allclose(LogisticRegressionClassifier().sigmoid(z), reference.sigmoid(z), rtol=1e-12, atol=0)
@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+from assignment5.models.classifiers.logistic_regression import LogisticRegressionClassifier
+from tests import reference
+
+
+@pytest.fixture(scope='module')
+def data():
+    X, y = reference.dataset(500, 4, seed=1, n_classes=3)
+    X += np.random.default_rng(2).normal(scale=2.0, size=X.shape) # overlapping classes, finite optimum
+    return X, np.array(['cat', 'dog', 'emu'])[y]
+
+
+def softmax(logits: np.ndarray) -> np.ndarray:
+    exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+    return exp / exp.sum(axis=1, keepdims=True)
+
+
+def test_softmax_gradient_matches_finite_differences(data):
+    X, y = data
+    codes = np.unique(y, return_inverse=True)[1]
+    theta = np.random.default_rng(0).normal(scale=0.5, size=(4 + 1) * 3)
+    model = LogisticRegressionClassifier()
+    loss, grad = model._softmax_loss_grad(theta, X, codes, 3)
+    W, b = theta[:12].reshape(4, 3), theta[12:]
+    assert loss == pytest.approx(-np.mean(np.log(softmax(X @ W + b)[np.arange(len(y)), codes])))
+    steps = np.eye(len(theta)) * 1e-6
+    numerical = [(model._softmax_loss_grad(theta + h, X, codes, 3)[0] - model._softmax_loss_grad(theta - h, X, codes, 3)[0]) / 2e-6
+                 for h in steps]
+    assert np.allclose(grad, numerical, atol=1e-7)
+
+
+def test_multinomial_model(data):
+    X, y = data
+    model = LogisticRegressionClassifier()
+    model.train(X, y, num_iters=500, learning_rate=None, solver='lbfgs', tol=1e-10)
+    assert model.multinomial and model.converged
+    assert model.weights.shape == (4, 3) and model.bias.shape == (3,)
+    assert model.classes.tolist() == ['cat', 'dog', 'emu']
+    codes = np.unique(y, return_inverse=True)[1]
+    theta = np.append(model.weights.ravel(), model.bias)
+    assert np.abs(model._softmax_loss_grad(theta, X, codes, 3)[1]).max() < 1e-4 # a stationary point
+
+    probabilities = model.predict_proba(X, chunk_size=64)
+    assert np.allclose(probabilities, softmax(X @ model.weights + model.bias))
+    assert np.array_equal(model.predict(X, chunk_size=64), model.classes[probabilities.argmax(axis=1)])
+    assert np.mean(model.predict(X) == y) > 0.5
+    assert str(model).count('\nClass ') == 3
+
+
+def test_two_class_softmax_matches_binary(data):
+    X, y = data
+    two = np.isin(y, ['cat', 'dog'])
+    X, y = X[two], (y[two] == 'dog').astype(int)
+    binary, multinomial = LogisticRegressionClassifier(), LogisticRegressionClassifier('multinomial')
+    binary.train(X, y, num_iters=100, learning_rate=None, solver='newton', tol=1e-12)
+    multinomial.train(X, y, num_iters=1000, learning_rate=None, solver='lbfgs', tol=1e-12)
+    assert not binary.multinomial and multinomial.multinomial
+    # the softmax is over-parameterised, but the difference of its two logits is the binary logit
+    assert np.allclose(multinomial.predict_proba(X), binary.predict_proba(X), atol=1e-5)
+    assert np.array_equal(multinomial.predict(X), binary.predict(X))
+
+
+def test_large_logits(data):
+    X, y = data
+    model = LogisticRegressionClassifier()
+    model.train(X, y, num_iters=50, learning_rate=None, solver='lbfgs')
+    model.weights, model.bias = model.weights * 1e4, model.bias * 1e4
+    with np.errstate(over='raise', under='ignore'):
+        probabilities = model.predict_proba(X)
+    assert np.isfinite(probabilities).all() and np.allclose(probabilities.sum(axis=1), 1)
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        LogisticRegressionClassifier('ovr')
+
+
+@pytest.mark.parametrize('labels', ['binary', 'multinomial'])
+def test_sparse_input_matches_dense(data, labels):
+    sparse = pytest.importorskip('scipy.sparse')
+    X, y = data
+    if labels == 'binary':
+        y = (y == 'dog').astype(int)
+    X = np.where(np.abs(X) < 1.5, 0.0, X) # mostly zeros
+    dense, compressed = LogisticRegressionClassifier(), LogisticRegressionClassifier()
+    dense.train(X, y, num_iters=100, learning_rate=None, solver='lbfgs', tol=1e-10)
+    compressed.train(sparse.csr_matrix(X), y, num_iters=100, learning_rate=None, solver='lbfgs', tol=1e-10)
+    assert np.allclose(compressed.weights, dense.weights) and np.allclose(compressed.bias, dense.bias)
+    assert np.allclose(compressed.predict_proba(sparse.csr_matrix(X)), dense.predict_proba(X))
@@ -0,0 +1,136 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from assignment5.models.classifiers.logistic_regression import LogisticRegressionClassifier
+from assignment5.streaming import iter_chunks, minibatches, learning_rate_schedule
+from tests import reference
+
+
+@pytest.fixture
+def data():
+    return reference.dataset(1000, 3, seed=0)
+
+
+@pytest.fixture
+def sources(data, tmp_path):
+    """ The same dataset as an array with the labels last, a .npy file, a CSV file and a callable. """
+    X, y = data
+    table = np.column_stack((X, y))
+    np.save(tmp_path / 'data.npy', table)
+    pd.DataFrame(table, columns=['a', 'b', 'c', 'label']).astype({'label': int}).to_csv(tmp_path / 'data.csv', index=False)
+    return {
+        'array': table,
+        'memmap': np.load(tmp_path / 'data.npy', mmap_mode='r'),
+        'npy': str(tmp_path / 'data.npy'),
+        'csv': str(tmp_path / 'data.csv'),
+        'callable': lambda: ((X[i:i + 300], y[i:i + 300]) for i in range(0, len(y), 300)),
+    }
+
+
+@pytest.mark.parametrize('kind', ['array', 'memmap', 'npy', 'csv', 'callable'])
+def test_chunks_cover_the_dataset(data, sources, kind):
+    X, y = data
+    chunks = list(iter_chunks(sources[kind], chunk_size=128))
+    assert all(len(X_chunk) <= (300 if kind == 'callable' else 128) for X_chunk, _ in chunks)
+    assert np.allclose(np.concatenate([X_chunk for X_chunk, _ in chunks]), X)
+    assert np.array_equal(np.concatenate([y_chunk for _, y_chunk in chunks]), y)
+
+
+def test_separate_labels_and_target_column(data, tmp_path):
+    X, y = data
+    np.save(tmp_path / 'labels.npy', y)
+    [(X_read, y_read)] = iter_chunks(X, y=str(tmp_path / 'labels.npy'), chunk_size=len(y))
+    assert np.array_equal(X_read, X) and np.array_equal(y_read, y)
+    [(X_read, y_read)] = iter_chunks(np.column_stack((y, X)), target=0, chunk_size=len(y))
+    assert np.array_equal(X_read, X) and np.array_equal(y_read, y)
+
+
+@pytest.mark.parametrize('batch_size, chunk_size', [(32, 100), (100, 32), (7, 1000)])
+def test_minibatches_keep_the_order_without_buffer(data, batch_size, chunk_size):
+    X, y = data
+    batches = list(minibatches(iter_chunks(X, y=y, chunk_size=chunk_size), batch_size))
+    assert [len(y_batch) for _, y_batch in batches[:-1]] == [batch_size] * (len(batches) - 1)
+    assert np.array_equal(np.concatenate([X_batch for X_batch, _ in batches]), X)
+    assert np.array_equal(np.concatenate([y_batch for _, y_batch in batches]), y)
+
+
+def test_shuffled_minibatches_are_a_permutation(data):
+    X, y = data
+    rows = np.arange(len(y), dtype=np.float64)[:, None] # the row index as only feature
+    batches = list(minibatches(iter_chunks(rows, y=y, chunk_size=100), 64, buffer_size=250, rng=np.random.default_rng(0)))
+    order = np.concatenate([X_batch[:, 0] for X_batch, _ in batches]).astype(int)
+    assert sorted(order) == list(range(len(y))) and not np.array_equal(order, np.arange(len(y)))
+    assert np.array_equal(np.concatenate([y_batch for _, y_batch in batches]), y[order]) # rows keep their label
+    assert order[:64].max() < 300 # a batch only mixes rows of the buffer
+
+
+def test_learning_rate_schedules():
+    assert learning_rate_schedule('constant', 0.5)(100) == 0.5
+    assert learning_rate_schedule('inverse', 0.5, 0.1)(10) == pytest.approx(0.25)
+    assert learning_rate_schedule('inverse_sqrt', 0.5, 0.3)(10) == pytest.approx(0.25)
+    assert learning_rate_schedule('exponential', 0.5, 0.1)(10) == pytest.approx(0.5 / np.e)
+    assert learning_rate_schedule(lambda t: 1 / (t + 1), 0.5)(3) == 0.25
+    with pytest.raises(ValueError):
+        learning_rate_schedule('cosine', 0.5)
+
+
+@pytest.mark.parametrize('kind', ['array', 'npy', 'csv', 'callable'])
+def test_full_batches_are_gradient_descent(data, sources, kind):
+    X, y = data
+    model = LogisticRegressionClassifier()
+    steps = model.train_stream(sources[kind], num_epochs=20, batch_size=len(y), learning_rate=0.5, chunk_size=128)
+    weights, bias = reference.gradient_descent(X, y, 0.5, 20)
+    assert steps == 20
+    assert np.allclose(model.weights, weights) and model.bias == pytest.approx(bias)
+
+
+def test_warm_start_continues_training(data):
+    X, y = data
+    once = LogisticRegressionClassifier()
+    once.train_stream(X, y=y, num_epochs=4, batch_size=64, learning_rate=0.1)
+    twice = LogisticRegressionClassifier()
+    twice.train_stream(X, y=y, num_epochs=2, batch_size=64, learning_rate=0.1)
+    twice.train_stream(X, y=y, num_epochs=2, batch_size=64, learning_rate=0.1, warm_start=True)
+    assert np.allclose(once.weights, twice.weights) and once.bias == pytest.approx(twice.bias)
+
+
+def test_shuffled_training_is_reproducible(data):
+    X, y = data
+    models = [LogisticRegressionClassifier() for _ in range(3)]
+    for model, seed in zip(models, [0, 0, 1]):
+        model.train_stream(X, y=y, num_epochs=2, batch_size=32, shuffle_buffer=500, seed=seed, schedule='inverse')
+    assert np.array_equal(models[0].weights, models[1].weights)
+    assert not np.array_equal(models[0].weights, models[2].weights)
+
+
+def test_an_iterator_is_read_once(data):
+    X, y = data
+    with pytest.raises(ValueError):
+        LogisticRegressionClassifier().train_stream(iter([(X, y)]), num_epochs=2)
+
+
+def test_chunked_decision_function(data):
+    X, y = data
+    model = LogisticRegressionClassifier()
+    model.train_stream(X, y=y, batch_size=64)
+    assert np.allclose(model.decision_function(X, chunk_size=77), X @ model.weights + model.bias)
+    assert np.array_equal(model.predict(X, chunk_size=77), (X @ model.weights + model.bias > 0).astype(int))
+
+
+def test_streaming_is_binary_only(data):
+    X, y = data
+    multinomial = LogisticRegressionClassifier()
+    multinomial.train(X, y + 1, num_iters=5, learning_rate=0.1) # labels 1 and 2
+    weights = multinomial.weights.copy()
+    with pytest.raises(ValueError, match='binary'):
+        multinomial.train_stream(X, y=y, warm_start=True)
+    assert np.array_equal(multinomial.weights, weights)
+    with pytest.raises(ValueError, match='binary'):
+        LogisticRegressionClassifier('multinomial').train_stream(X, y=y)
+    with pytest.raises(ValueError, match='binary'):
+        LogisticRegressionClassifier().train_stream(X, y=y * 2)
+    fresh = LogisticRegressionClassifier()
+    fresh.train(X, y + 1, num_iters=5, learning_rate=0.1)
+    fresh.train_stream(X, y=y) # without warm_start the softmax weights are discarded
+    assert not fresh.multinomial
@@ -0,0 +1,78 @@
+"""
+Description: Import-time budget of the assignment packages
+
+Every module below is imported in fresh interpreters (`python -X importtime`) from the
+directory of its package. The script reports the best cumulative import time, fails if it
+exceeds the budget of the module or if a display/visualisation dependency was loaded at
+import time (they must only be imported by the functions that draw or render).
+
+Usage: python scripts/import_budget.py [--repeat N]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (package directory, module, budget in milliseconds)
+BUDGETS = [
+    ("assignment1", "src.trees.bfs", 100),
+    ("assignment2", "assignment2.visualisations.visualise", 100),
+    ("assignment2", "assignment2.algorithms.informed_search", 100),
+    ("assignment4", "assignment4.utils", 600),
+    ("assignment4", "assignment4.algorithms.decision_trees.id3", 600),
+]
+
+# Modules that must not be loaded by importing any of the above
+LAZY = ("matplotlib", "networkx", "IPython", "anytree")
+
+
+def measure(directory: str, module: str) -> tuple:
+    """Import a module in a fresh interpreter.
+
+    Parameters
+    ----------
+    directory : str
+        Directory of the package, used as working directory and import path.
+    module : str
+        The module to import.
+
+    Returns
+    -------
+    tuple
+        The cumulative import time in milliseconds and the lazy dependencies that were loaded.
+    """
+    code = f"import sys, {module}; print(','.join(m for m in {LAZY!r} if m in sys.modules))"
+    env = dict(os.environ, PYTHONPATH=directory)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=directory, env=env,
+                            capture_output=True, text=True, check=True)
+    cumulative = 0
+    for line in result.stderr.splitlines():
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].strip() == module:
+            cumulative = int(fields[1])
+    loaded = [m for m in result.stdout.strip().split(",") if m]
+    return cumulative / 1000, loaded
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="imports per module, the best time is kept")
+    args = parser.parse_args()
+
+    failures = 0
+    for package, module, budget in BUDGETS:
+        runs = [measure(os.path.join(ROOT, package), module) for _ in range(args.repeat)]
+        best = min(time for time, _ in runs)
+        loaded = runs[0][1]
+        ok = best <= budget and not loaded
+        failures += not ok
+        note = f" loaded {', '.join(loaded)}" if loaded else ""
+        print(f"{'ok  ' if ok else 'FAIL'} {module:<45} {best:8.1f} ms / {budget} ms{note}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())